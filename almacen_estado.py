@@ -0,0 +1,164 @@
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+from metricas import METRICAS
+
+# Backends para guardar el estado de cada simulación en el servidor.
+# La cookie de sesión de Flask solo lleva el id de la simulación; el estado
+# completo (colas de procesos, recursos, banderas) vive aquí. Cada backend
+# anota cuándo se usó por última vez cada simulación, para que la aplicación
+# pueda descartar las de sesiones abandonadas (expirar).
+
+# Número de candados entre los que se reparten las simulaciones
+CANDADOS = 64
+
+
+class CandadosSimulacion:
+    """
+    Candados para que las peticiones de una misma simulación se atiendan de a
+    una (leer el estado, modificarlo y guardarlo). Hay un número fijo de
+    candados y cada simulación usa el que le toca según su id, de modo que no
+    se acumulan candados de sesiones viejas; dos simulaciones que comparten
+    candado solo se esperan entre sí. Solo sincronizan los hilos de un mismo
+    proceso.
+    """
+
+    def __init__(self):
+        self.candados = [threading.RLock() for _ in range(CANDADOS)]
+
+    def candado(self, simulacion_id):
+        return self.candados[hash(simulacion_id) % CANDADOS]
+
+
+class AlmacenMemoria(CandadosSimulacion):
+    """Guarda los estados en un dict del propio proceso (backend por defecto)."""
+
+    # Cada proceso de trabajo tiene sus propios estados
+    compartido = False
+
+    def __init__(self):
+        super().__init__()
+        self.estados = {}
+        self.accesos = {}  # id -> time.time() del último uso
+
+    def obtener(self, simulacion_id):
+        estado_simulacion = self.estados.get(simulacion_id)
+        if estado_simulacion is not None:
+            self.accesos[simulacion_id] = time.time()
+        return estado_simulacion
+
+    def guardar(self, simulacion_id, estado_simulacion):
+        self.estados[simulacion_id] = estado_simulacion
+        self.accesos[simulacion_id] = time.time()
+
+    def eliminar(self, simulacion_id):
+        self.estados.pop(simulacion_id, None)
+        self.accesos.pop(simulacion_id, None)
+
+    def existe(self, simulacion_id):
+        return simulacion_id in self.estados
+
+    def inactivas(self, antes):
+        """Ids de las simulaciones que no se usan desde antes de `antes`."""
+        return [simulacion_id for simulacion_id, acceso in list(self.accesos.items()) if acceso < antes]
+
+    def expirar(self, simulacion_id, antes):
+        """Elimina la simulación si sigue sin usarse desde antes de `antes`; True si la eliminó."""
+        if self.accesos.get(simulacion_id, antes) >= antes:
+            return False
+        self.eliminar(simulacion_id)
+        return True
+
+
+class AlmacenSQLite(CandadosSimulacion):
+    """
+    Guarda los estados serializados con pickle en un archivo SQLite, de modo
+    que sobreviven a reinicios del servidor y se pueden compartir entre varios
+    procesos de trabajo.
+    """
+
+    compartido = True
+
+    def __init__(self, ruta):
+        super().__init__()
+        self.ruta = ruta
+        self.local = threading.local()
+        with self._conexion() as conexion:
+            conexion.execute(
+                'CREATE TABLE IF NOT EXISTS estados (id TEXT PRIMARY KEY, datos BLOB NOT NULL, acceso REAL)'
+            )
+            columnas = [fila[1] for fila in conexion.execute('PRAGMA table_info(estados)')]
+            if 'acceso' not in columnas:
+                # Archivo creado antes de que se registrara el último uso
+                conexion.execute('ALTER TABLE estados ADD COLUMN acceso REAL')
+
+    def _conexion(self):
+        # sqlite3 no permite compartir conexiones entre hilos
+        conexion = getattr(self.local, 'conexion', None)
+        if conexion is None:
+            conexion = sqlite3.connect(self.ruta)
+            self.local.conexion = conexion
+        return conexion
+
+    def obtener(self, simulacion_id):
+        fila = self._conexion().execute(
+            'SELECT datos FROM estados WHERE id = ?', (simulacion_id,)
+        ).fetchone()
+        if not fila:
+            return None
+        with self._conexion() as conexion:
+            conexion.execute('UPDATE estados SET acceso = ? WHERE id = ?', (time.time(), simulacion_id))
+        if METRICAS.activo:
+            METRICAS.contar('bytes_serializados', len(fila[0]), 'operacion="obtener"')
+        return pickle.loads(fila[0])
+
+    def guardar(self, simulacion_id, estado_simulacion):
+        datos = pickle.dumps(estado_simulacion, protocol=pickle.HIGHEST_PROTOCOL)
+        if METRICAS.activo:
+            METRICAS.contar('bytes_serializados', len(datos), 'operacion="guardar"')
+        with self._conexion() as conexion:
+            conexion.execute(
+                'INSERT OR REPLACE INTO estados (id, datos, acceso) VALUES (?, ?, ?)',
+                (simulacion_id, datos, time.time())
+            )
+
+    def eliminar(self, simulacion_id):
+        with self._conexion() as conexion:
+            conexion.execute('DELETE FROM estados WHERE id = ?', (simulacion_id,))
+
+    def existe(self, simulacion_id):
+        return self._conexion().execute(
+            'SELECT 1 FROM estados WHERE id = ?', (simulacion_id,)
+        ).fetchone() is not None
+
+    def inactivas(self, antes):
+        """Ids de las simulaciones que no se usan desde antes de `antes`."""
+        filas = self._conexion().execute(
+            'SELECT id FROM estados WHERE acceso IS NULL OR acceso < ?', (antes,)
+        ).fetchall()
+        return [fila[0] for fila in filas]
+
+    def expirar(self, simulacion_id, antes):
+        """Elimina la simulación si sigue sin usarse desde antes de `antes`; True si la eliminó."""
+        with self._conexion() as conexion:
+            cursor = conexion.execute(
+                'DELETE FROM estados WHERE id = ? AND (acceso IS NULL OR acceso < ?)', (simulacion_id, antes)
+            )
+        return cursor.rowcount > 0
+
+
+def crear_almacen(configuracion=None):
+    """
+    Crea el backend indicado por `configuracion` (o por la variable de entorno
+    SIMULADOR_ALMACEN): 'memoria' (por defecto) o 'sqlite:<ruta del archivo>'.
+    """
+    if configuracion is None:
+        configuracion = os.environ.get('SIMULADOR_ALMACEN', 'memoria')
+    if configuracion == 'memoria':
+        return AlmacenMemoria()
+    if configuracion.startswith('sqlite:'):
+        return AlmacenSQLite(configuracion[len('sqlite:'):])
+    raise ValueError(f'Backend de estado desconocido: {configuracion}')
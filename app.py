@@ -1,104 +1,255 @@
-from flask import Flask, render_template, request, redirect, url_for, session, jsonify
-from memory_manager import MAX_PROCESS_SIZE
-import memory_manager
-import random
+from flask import Flask, Response, abort, g, render_template, request, redirect, url_for, session, jsonify
+from memory_manager import MAX_PROCESS_SIZE, MemoryManager
+from almacen_estado import crear_almacen
+from archivo_terminados import ArchivoTerminados, eliminar_archivo
+from metricas import METRICAS
+from motor_simulacion import ESTADOS, RECURSOS_DISPONIBLES, Proceso, MotorSimulacion
+from reemplazo_paginas import Paginador
+from trazas import iterar_traza, linea_traza
+import functools
+import io
+import json
 import math
+import os
+import queue
+import random
+import tempfile
+import threading
+import time
+import uuid
 
 app = Flask(__name__)
 app.secret_key = 'clave_secreta_para_sesiones'
 
-# Estados posibles para un proceso
-ESTADOS = ['Nuevo', 'Listo', 'Ejecutando', 'Bloqueado', 'Terminado']
-
-# Lista de recursos disponibles
-RECURSOS_DISPONIBLES = ['Recurso1', 'Recurso2', 'Recurso3', 'Recurso4', 'Recurso5', 'Recurso6']
-
-class Proceso:
-    def __init__(self, id_proceso, tamaño, recursos_requeridos, preeminencia=False):
-        self.id = id_proceso
-        self.tamaño = int(tamaño)
-        self.tamaño_inicial = int(tamaño)  # Nuevo atributo
-        self.recursos_requeridos = recursos_requeridos  # Lista de recursos
-        self.estado = 'Nuevo'
-        self.preeminencia=preeminencia
-        self.recursos_obtenidos = []
-        self.unidades_ejecutadas = 0  # Contador de unidades ejecutadas en este ciclo
-        self.recursos_faltantes = []  # Recursos faltantes si está bloqueado
-        self.veces_ejecutando = 0
-
-    def __str__(self):
-        return f"ID: {self.id}, Tamaño: {self.tamaño_inicial}, Restante: {self.tamaño}, Estado: {self.estado}, Preeminencia: {self.preeminencia}"
-
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'tamaño': self.tamaño,
-            'tamaño_inicial': self.tamaño_inicial,
-            'recursos_requeridos': self.recursos_requeridos,
-            'estado': self.estado,
-            'preeminencia': self.preeminencia,
-            'recursos_obtenidos': self.recursos_obtenidos,
-            'unidades_ejecutadas': self.unidades_ejecutadas,
-            'recursos_faltantes': self.recursos_faltantes,
-            'veces_ejecutando': self.veces_ejecutando,
-        }
-
-    @staticmethod
-    def from_dict(data):
-        proceso = Proceso(data['id'], data['tamaño_inicial'], data['recursos_requeridos'],preeminencia=data.get('preeminencia', False))
-        proceso.tamaño = data['tamaño']
-        proceso.estado = data['estado']
-        proceso.recursos_obtenidos = data['recursos_obtenidos']
-        proceso.unidades_ejecutadas = data['unidades_ejecutadas']
-        proceso.recursos_faltantes = data.get('recursos_faltantes', [])
-        proceso.veces_ejecutando = data.get('veces_ejecutando', 0)
-        return proceso
+# El estado de cada simulación se guarda en el servidor; la cookie de sesión
+# solo lleva el id de la simulación
+almacen_estado = crear_almacen()
+
+# Máximo de pasos que /avanzar_simulacion ejecuta en una sola petición
+MAX_TICKS_POR_PETICION = 10000
+
+# Segundos entre pasos en /stream_simulacion, y cada cuánto se envía un
+# comentario para mantener viva la conexión mientras la simulación está pausada
+INTERVALO_STREAM = 1.0
+INTERVALO_LATIDO = 15.0
+
+# Límites de procesos por simulación (0 para no limitar) y de su tamaño en kb
+MAX_PROCESOS = int(os.environ.get('SIMULADOR_MAX_PROCESOS', 6))
+MAX_TAMANO = int(os.environ.get('SIMULADOR_MAX_TAMANO', MAX_PROCESS_SIZE))
+
+# Núcleos de CPU de cada simulación nueva
+NUM_CPUS = int(os.environ.get('SIMULADOR_CPUS', 1))
+
+# Política de reemplazo de páginas (fifo, lru, clock u optimo) para simular
+# paginación por demanda; vacío para no simularla
+POLITICA_PAGINACION = os.environ.get('SIMULADOR_PAGINACION', '')
+
+# Adquisición de recursos ('total' o 'parcial') y manejo de interbloqueos
+# ('detectar', 'evitar' o vacío para ninguno)
+ADQUISICION = os.environ.get('SIMULADOR_ADQUISICION', 'total')
+INTERBLOQUEOS = os.environ.get('SIMULADOR_INTERBLOQUEOS') or None
+
+# Semilla de las simulaciones nuevas. Si no se indica, cada simulación recibe
+# una semilla al azar; en ambos casos se muestra en el reporte para poder
+# reproducir la ejecución.
+SEMILLA = os.environ.get('SIMULADOR_SEMILLA')
+
+# Directorio donde se archivan los procesos terminados de cada simulación
+# (ver archivo_terminados.py); vacío para dejarlos en la cola 'terminado'
+DIRECTORIO_TERMINADOS = os.environ.get(
+    'SIMULADOR_TERMINADOS', os.path.join(tempfile.gettempdir(), 'simulador_terminados')
+)
+
+# Procesos terminados por página del reporte
+TERMINADOS_POR_PAGINA = 50
+
+# Segundos sin usarse tras los que una simulación se descarta, junto con su
+# archivo de terminados (0 para no descartarlas nunca), y cada cuánto se
+# buscan las que vencieron
+EXPIRACION_SIMULACIONES = float(os.environ.get('SIMULADOR_EXPIRACION', 24 * 3600))
+INTERVALO_EXPIRACION = 600.0
+
+# Si se permiten las rutas que activan, desactivan o perfilan las métricas
+# (también se permiten con el servidor en modo debug). /metrics siempre se
+# puede leer.
+METRICAS_ADMIN = os.environ.get('SIMULADOR_METRICAS_ADMIN', '') not in ('', '0')
+
+# Archivo donde /metricas/perfil guarda el perfil de cProfile
+RUTA_PERFIL = os.environ.get('SIMULADOR_PERFIL', 'perfil_simulacion.prof')
+
+def get_simulacion_id():
+    if 'simulacion_id' not in session:
+        session['simulacion_id'] = uuid.uuid4().hex
+    return session['simulacion_id']
+
+def sincronizado(vista):
+    # Atiende la petición con el candado de la simulación de la sesión
+    # tomado, para que dos peticiones no avancen ni modifiquen a la vez el
+    # mismo motor (ni una guarde encima de lo que guardó la otra)
+    @functools.wraps(vista)
+    def envoltura(*args, **kwargs):
+        with almacen_estado.candado(get_simulacion_id()):
+            return vista(*args, **kwargs)
+    return envoltura
 
 def get_estado_simulacion():
-    if 'estado_simulacion' not in session:
-        # Inicializar el estado de la simulación
-        session['estado_simulacion'] = {
-            'recursos_disponibles_dict': {recurso: True for recurso in RECURSOS_DISPONIBLES},
-            'nuevo': [],
-            'listo': [],
-            'ejecutando': [],
-            'bloqueado': [],
-            'terminado': [],
-            'simulacion_en_curso': False,
-            'simulacion_pausada':False,
-        }
-    return session['estado_simulacion']
-
-def guardar_estado_simulacion(estado_simulacion):
-    session['estado_simulacion'] = estado_simulacion
+    # Se llama con el candado de la simulación tomado (ver sincronizado)
+    simulacion_id = get_simulacion_id()
+    with METRICAS.medir('almacen_obtener'):
+        estado_simulacion = almacen_estado.obtener(simulacion_id)
+    if estado_simulacion is None:
+        # Inicializar el estado de la simulación, con su propia memoria
+        # y su propio generador aleatorio
+        semilla = int(SEMILLA) if SEMILLA else random.randrange(2**32)
+        paginacion = Paginador(POLITICA_PAGINACION, semilla=semilla) if POLITICA_PAGINACION else None
+        archivo = None
+        if DIRECTORIO_TERMINADOS:
+            archivo = ArchivoTerminados(ruta_terminados(simulacion_id))
+        estado_simulacion = MotorSimulacion(memoria=MemoryManager(semilla=semilla), n_cpus=NUM_CPUS,
+                                            paginacion=paginacion, semilla=semilla,
+                                            adquisicion=ADQUISICION, interbloqueos=INTERBLOQUEOS,
+                                            archivo=archivo)
+        almacen_estado.guardar(simulacion_id, estado_simulacion)
+    return estado_simulacion
+
+def ruta_terminados(simulacion_id):
+    return os.path.join(DIRECTORIO_TERMINADOS, f'{simulacion_id}.jsonl')
+
+def eliminar_terminados(simulacion_id):
+    eliminar_archivo(ruta_terminados(simulacion_id))
+
+# Hilo que busca simulaciones vencidas (uno por proceso de trabajo)
+hilo_expiracion = None
+candado_expiracion = threading.Lock()
+
+def expirar_simulaciones():
+    """
+    Descarta las simulaciones que no se usan desde hace más de
+    EXPIRACION_SIMULACIONES segundos y borra sus archivos de terminados.
+    Devuelve cuántas simulaciones descartó.
+
+    Con un almacén compartido (SQLite) también borra los archivos que
+    quedaron sin simulación (por ejemplo, de una simulación reiniciada en otro
+    momento). Con el almacén en memoria no: cada proceso de trabajo solo ve
+    sus propias simulaciones y el archivo podría ser de otro.
+    """
+    antes = time.time() - EXPIRACION_SIMULACIONES
+    vencidas = 0
+    for simulacion_id in almacen_estado.inactivas(antes):
+        with almacen_estado.candado(simulacion_id):
+            # Se vuelve a comprobar con el candado: pudo usarse mientras tanto
+            if almacen_estado.expirar(simulacion_id, antes):
+                eliminar_terminados(simulacion_id)
+                vencidas += 1
+    if almacen_estado.compartido and DIRECTORIO_TERMINADOS and os.path.isdir(DIRECTORIO_TERMINADOS):
+        for entrada in os.scandir(DIRECTORIO_TERMINADOS):
+            simulacion_id, extension = os.path.splitext(entrada.name)
+            if extension != '.jsonl':
+                continue
+            with almacen_estado.candado(simulacion_id):
+                try:
+                    huerfano = entrada.stat().st_mtime < antes and not almacen_estado.existe(simulacion_id)
+                except FileNotFoundError:
+                    continue
+                if huerfano:
+                    eliminar_terminados(simulacion_id)
+    return vencidas
+
+def expirar_periodicamente():
+    while True:
+        time.sleep(INTERVALO_EXPIRACION)
+        try:
+            expirar_simulaciones()
+        except Exception:
+            app.logger.exception('Error al expirar simulaciones')
+
+@app.before_request
+def iniciar_expiracion():
+    # El hilo se inicia con la primera petición de cada proceso de trabajo
+    # (un hilo iniciado al importar no sobrevive a un fork)
+    global hilo_expiracion
+    if EXPIRACION_SIMULACIONES <= 0 or hilo_expiracion is not None and hilo_expiracion.is_alive():
+        return
+    with candado_expiracion:
+        if hilo_expiracion is None or not hilo_expiracion.is_alive():
+            hilo_expiracion = threading.Thread(target=expirar_periodicamente, daemon=True)
+            hilo_expiracion.start()
+
+def guardar_estado_simulacion(estado_simulacion, simulacion_id=None):
+    # simulacion_id se pasa cuando se guarda fuera del contexto de la
+    # petición (por ejemplo desde un stream)
+    with METRICAS.medir('almacen_guardar'):
+        almacen_estado.guardar(simulacion_id or get_simulacion_id(), estado_simulacion)
+
+@app.before_request
+def iniciar_medicion():
+    if METRICAS.activo:
+        g.inicio_peticion = time.perf_counter()
+
+@app.after_request
+def registrar_peticion(respuesta):
+    # Tiempo total y bytes de cada petición, por ruta (la regla, no la URL,
+    # para no crear una serie por cada id). Los streams no tienen largo.
+    inicio = g.pop('inicio_peticion', None)
+    if inicio is not None and METRICAS.activo:
+        ruta = f'ruta="{request.url_rule.rule if request.url_rule else "desconocida"}"'
+        METRICAS.sumar_tiempo('peticion', time.perf_counter() - inicio, ruta)
+        if not respuesta.is_streamed:
+            METRICAS.contar('bytes_respuesta', respuesta.calculate_content_length() or 0, ruta)
+    return respuesta
+
+@app.route('/metrics')
+def metrics():
+    return Response(METRICAS.prometheus(), mimetype='text/plain; version=0.0.4')
+
+def administracion_metricas(vista):
+    """Solo atiende la ruta si METRICAS_ADMIN está activo o en modo debug."""
+    @functools.wraps(vista)
+    def envoltura(*args, **kwargs):
+        if not (METRICAS_ADMIN or app.debug):
+            abort(404)
+        return vista(*args, **kwargs)
+    return envoltura
+
+@app.route('/metricas/activar', methods=['POST'])
+@administracion_metricas
+def activar_metricas():
+    METRICAS.activar()
+    return '', 204
+
+@app.route('/metricas/desactivar', methods=['POST'])
+@administracion_metricas
+def desactivar_metricas():
+    METRICAS.desactivar()
+    return '', 204
+
+@app.route('/metricas/perfil', methods=['POST'])
+@administracion_metricas
+def perfil_metricas():
+    # Ejecuta bajo cProfile los siguientes `ticks` pasos (campo del
+    # formulario) de cualquier simulación y guarda el perfil en el servidor
+    ticks = max(1, request.form.get('ticks', 100, type=int))
+    ruta = METRICAS.perfilar(ticks, RUTA_PERFIL)
+    return jsonify({'ticks': ticks, 'ruta': ruta})
 
 @app.route('/')
+@sincronizado
 def index():
     estado_simulacion = get_estado_simulacion()
-    procesos_por_estado = {}
-    for estado in ESTADOS:
-        procesos_por_estado[estado] = [Proceso.from_dict(p) for p in estado_simulacion[estado.lower()]]
-    simulacion_en_curso = estado_simulacion.get('simulacion_en_curso', False)
-    simulacion_pausada = estado_simulacion.get('simulacion_pausada', False)
-    return render_template('index.html', estados=ESTADOS, procesos=procesos_por_estado, simulacion_en_curso=simulacion_en_curso, simulacion_pausada=simulacion_pausada)
+    procesos_por_estado = estado_simulacion.procesos_por_estado()
+    simulacion_en_curso = estado_simulacion.simulacion_en_curso
+    simulacion_pausada = estado_simulacion.simulacion_pausada
+    return render_template('index.html', estados=ESTADOS, procesos=procesos_por_estado, simulacion_en_curso=simulacion_en_curso, simulacion_pausada=simulacion_pausada,
+                           terminados=estado_simulacion.contar_terminados())
 
 @app.route('/agregar_proceso', methods=['GET', 'POST'])
+@sincronizado
 def agregar_proceso():
     estado_simulacion = get_estado_simulacion()
-    
-    # Contar procesos únicos
-    procesos_existentes = set()
-    for estado in ESTADOS:
-        for proceso in estado_simulacion[estado.lower()]:
-            procesos_existentes.add(proceso.get('id', ''))
-    
-    numero_procesos = len(procesos_existentes)
-    MAX_PROCESOS = 6  # Límite de procesos
-    MAX_TAMANO = 65
 
     if request.method == 'POST':
 
-        if numero_procesos >= MAX_PROCESOS:
+        if limite_alcanzado(estado_simulacion):
             error = f"Has alcanzado el límite máximo de {MAX_PROCESOS} procesos."
             return render_template('agregar_proceso.html', error=error, recursos=RECURSOS_DISPONIBLES)
 
@@ -118,7 +269,7 @@ def agregar_proceso():
             return render_template('agregar_proceso.html', error=error, recursos=RECURSOS_DISPONIBLES)
 
         if tamaño_int < 1:
-            error = "El tamaño dígitado para el proceso no se encuentra dentro del rango permitido (1 a 65 kb)."
+            error = f"El tamaño dígitado para el proceso no se encuentra dentro del rango permitido (1 a {MAX_TAMANO} kb)."
             return render_template('agregar_proceso.html', error=error, recursos=RECURSOS_DISPONIBLES)
 
         estado_simulacion = get_estado_simulacion()
@@ -128,23 +279,16 @@ def agregar_proceso():
             error = f"Ya existe un proceso con el ID '{id_proceso}'. Por favor, elija otro ID."
             return render_template('agregar_proceso.html', error=error, recursos=RECURSOS_DISPONIBLES)
 
-        # Crear el proceso en la simulación del sistema operativo
+        # Crear el proceso en la simulación del sistema operativo y asignarle memoria
         nuevo_proceso = Proceso(id_proceso, tamaño, recursos_requeridos, preeminencia=preeminencia)
-        nuevo_proceso.estado = 'Nuevo'
-        estado_simulacion['nuevo'].append(nuevo_proceso.to_dict())
-        guardar_estado_simulacion(estado_simulacion)
-
-        # Asignar memoria al proceso en la simulación de memoria
-        success, msg = memory_manager.create_process_memory(id_proceso, float(tamaño))
+        success, msg = estado_simulacion.agregar_proceso(nuevo_proceso)
         if not success:
-            # Si no se pudo asignar memoria, eliminar el proceso del estado actual
-            estado_simulacion['nuevo'].pop()
-            guardar_estado_simulacion(estado_simulacion)
             error = f"No se pudo asignar memoria al proceso: {msg}"
             return render_template('agregar_proceso.html', error=error, recursos=RECURSOS_DISPONIBLES)
+        guardar_estado_simulacion(estado_simulacion)
         return redirect(url_for('index'))
     else:
-        if numero_procesos >= MAX_PROCESOS:
+        if limite_alcanzado(estado_simulacion):
             mensaje = f"Has alcanzado el límite máximo de {MAX_PROCESOS} procesos."
             return render_template('agregar_proceso.html', mensaje=mensaje, recursos=RECURSOS_DISPONIBLES, limite_alcanzado=True)
         else:
@@ -152,45 +296,21 @@ def agregar_proceso():
     
 
 def id_ya_existe(id_proceso, estado_simulacion):
-    for estado in ESTADOS:
-        procesos = [Proceso.from_dict(p) for p in estado_simulacion[estado.lower()]]
-        for proceso in procesos:
-            if proceso.id == id_proceso:
-                return True
-    return False
+    return estado_simulacion.existe_id(id_proceso)
+
+def limite_alcanzado(estado_simulacion):
+    # Cuentan los procesos en todos los estados, incluidos los terminados
+    return MAX_PROCESOS > 0 and estado_simulacion.contar_procesos() >= MAX_PROCESOS
 
 @app.route('/iniciar_simulacion')
+@sincronizado
 def iniciar_simulacion():
     estado_simulacion = get_estado_simulacion()
-    
-    if not estado_simulacion.get('simulacion_en_curso', False):
-        # Guardar los procesos nuevos que se hayan agregado después de que la simulación anterior terminó
-        nuevos_procesos = estado_simulacion.get('nuevo', [])
-        # Preservar los procesos terminados
-        procesos_terminados = estado_simulacion.get('terminado', [])
-        # Reiniciar el estado de la simulación, excepto 'terminado'
-        estado_simulacion = {
-            'recursos_disponibles_dict': {recurso: True for recurso in RECURSOS_DISPONIBLES},
-            'nuevo': nuevos_procesos,
-            'listo': [],
-            'ejecutando': [],
-            'bloqueado': [],
-            'terminado': procesos_terminados,  # Preservamos los procesos terminados
-            'simulacion_en_curso': True,
-            'simulacion_pausada': False,
-        }
-    else:
-        # Si la simulación está en curso, simplemente asegurarse de que no esté pausada
-        estado_simulacion['simulacion_pausada'] = False
-        estado_simulacion['simulacion_en_curso'] = True
-
-    # Mover procesos de 'Nuevo' a 'Listo'
-    while estado_simulacion['nuevo']:
-        proceso_dict = estado_simulacion['nuevo'].pop(0)
-        proceso = Proceso.from_dict(proceso_dict)
-        proceso.estado = 'Listo'
-        estado_simulacion['listo'].append(proceso.to_dict())
-    
+
+    # Si la simulación anterior terminó se reinician las colas conservando los
+    # procesos nuevos y los terminados; si está en curso solo se reanuda
+    estado_simulacion.iniciar()
+
     guardar_estado_simulacion(estado_simulacion)
     return redirect(url_for('simulacion'))
 
@@ -199,267 +319,225 @@ def simulacion():
     return render_template('simulacion.html')
 
 @app.route('/pausar_simulacion')
+@sincronizado
 def pausar_simulacion():
     estado_simulacion = get_estado_simulacion()
-    estado_simulacion['simulacion_pausada'] = True
+    estado_simulacion.simulacion_pausada = True
     guardar_estado_simulacion(estado_simulacion)
     return '', 204  # Respuesta vacía con código de estado 204 No Content
 
 @app.route('/reanudar_simulacion')
+@sincronizado
 def reanudar_simulacion():
     estado_simulacion = get_estado_simulacion()
-    estado_simulacion['simulacion_pausada'] = False
+    estado_simulacion.simulacion_pausada = False
     guardar_estado_simulacion(estado_simulacion)
     return redirect(url_for('simulacion'))
 
 @app.route('/obtener_estado')
+@sincronizado
 def obtener_estado():
     estado_simulacion = get_estado_simulacion()
-    procesos_por_estado = {}
-    for estado in ESTADOS:
-        procesos_por_estado[estado] = [p for p in estado_simulacion[estado.lower()]]
-    simulacion_en_curso = estado_simulacion.get('simulacion_en_curso', False)
-    simulacion_pausada = estado_simulacion.get('simulacion_pausada', False)
+    procesos_por_estado = estado_simulacion.procesos_por_estado_dict()
+    simulacion_en_curso = estado_simulacion.simulacion_en_curso
+    simulacion_pausada = estado_simulacion.simulacion_pausada
     return jsonify({
         'estados': ESTADOS,
         'procesos': procesos_por_estado,
+        'terminados': estado_simulacion.contar_terminados(),
         'simulacion_en_curso': simulacion_en_curso,
         'simulacion_pausada': simulacion_pausada
     })
 
 
 @app.route('/avanzar_simulacion')
+@sincronizado
 def avanzar_simulacion():
     estado_simulacion = get_estado_simulacion()
-    if not estado_simulacion.get('simulacion_en_curso', False):
+    if not estado_simulacion.simulacion_en_curso:
         return jsonify({'simulacion_en_curso': False})
     
-    if estado_simulacion.get('simulacion_pausada', False):
+    if estado_simulacion.simulacion_pausada:
         # No avanzar la simulación, solo devolver el estado actual
-        procesos_por_estado = {}
-        for estado in ESTADOS:
-            procesos_por_estado[estado] = [p for p in estado_simulacion[estado.lower()]]
+        procesos_por_estado = estado_simulacion.procesos_por_estado_dict()
         return jsonify({
             'estados': ESTADOS,
             'procesos': procesos_por_estado,
+            'terminados': estado_simulacion.contar_terminados(),
             'simulacion_en_curso': True,
             'simulacion_pausada': True
         })
     
-    # Realizar un paso de simulación
-    desbloquear_procesos(estado_simulacion)
-    asignar_procesos(estado_simulacion)
-    ejecutar_procesos(estado_simulacion)
+    # Con ?ticks=N se ejecutan N pasos en la misma petición. Con
+    # &formato=cambios se devuelve solo la lista de cambios de cada paso
+    # (tick, id, estado anterior, estado nuevo, tamaño restante) en lugar
+    # del estado completo de las colas.
+    ticks = request.args.get('ticks', 1, type=int)
+    ticks = max(1, min(ticks, MAX_TICKS_POR_PETICION))
+    formato = request.args.get('formato', 'estado')
+
+    if formato == 'cambios':
+        tick_inicial = estado_simulacion.tick
+        ejecutados, cambios = estado_simulacion.run_con_cambios(ticks)
+        guardar_estado_simulacion(estado_simulacion)
+        return jsonify({
+            'tick_inicial': tick_inicial,
+            'ticks': ejecutados,
+            'cambios': cambios,
+            'terminados': estado_simulacion.contar_terminados(),
+            'simulacion_en_curso': estado_simulacion.simulacion_en_curso,
+            'simulacion_pausada': estado_simulacion.simulacion_pausada
+        })
 
-    # Verificar si la simulación ha terminado
-    if not estado_simulacion['listo'] and not estado_simulacion['bloqueado'] and not estado_simulacion['ejecutando']:
-        estado_simulacion['simulacion_en_curso'] = False
+    # Realizar los pasos de simulación
+    estado_simulacion.run(ticks)
 
     guardar_estado_simulacion(estado_simulacion)
 
-    procesos_por_estado = {}
-    for estado in ESTADOS:
-        procesos_por_estado[estado] = [p for p in estado_simulacion[estado.lower()]]
+    procesos_por_estado = estado_simulacion.procesos_por_estado_dict()
 
     return jsonify({
         'estados': ESTADOS,
         'procesos': procesos_por_estado,
-        'simulacion_en_curso': estado_simulacion['simulacion_en_curso'],
-        'simulacion_pausada': estado_simulacion.get('simulacion_pausada', False)
+        'terminados': estado_simulacion.contar_terminados(),
+        'simulacion_en_curso': estado_simulacion.simulacion_en_curso,
+        'simulacion_pausada': estado_simulacion.simulacion_pausada
     })
 
 
 
+def evento_sse(evento, datos):
+    return f"event: {evento}\ndata: {json.dumps(datos)}\n\n"
+
+EVENTO_FIN = evento_sse('fin', {})
+
+class TransmisionSimulacion:
+    """
+    Hilo que avanza una simulación un paso cada `intervalo` segundos y reparte
+    los eventos a todas las conexiones de /stream_simulacion de esa
+    simulación, que solo los leen y los envían. Hay a lo más una por
+    simulación (en cada proceso del servidor), así que la simulación avanza
+    al mismo ritmo con una o con varias pestañas abiertas. El hilo termina
+    cuando se cierra la última conexión o cuando la simulación termina.
+    """
+
+    def __init__(self, simulacion_id, intervalo):
+        self.simulacion_id = simulacion_id
+        self.intervalo = intervalo
+        self.suscriptores = []  # una queue.Queue de eventos por conexión
+
+    def desuscribir(self, cola):
+        with candado_transmisiones:
+            if cola in self.suscriptores:
+                self.suscriptores.remove(cola)
+
+    def ejecutar(self):
+        candado = almacen_estado.candado(self.simulacion_id)
+        while True:
+            with candado_transmisiones:
+                if not self.suscriptores:
+                    del transmisiones[self.simulacion_id]
+                    return
+            # Se vuelve a leer del almacén en cada paso para ver las pausas y
+            # los reinicios hechos desde otras peticiones
+            with candado:
+                estado_simulacion = almacen_estado.obtener(self.simulacion_id)
+                if estado_simulacion is None or not estado_simulacion.simulacion_en_curso:
+                    with candado_transmisiones:
+                        del transmisiones[self.simulacion_id]
+                        for cola in self.suscriptores:
+                            cola.put(EVENTO_FIN)
+                    return
+                evento = None
+                if not estado_simulacion.simulacion_pausada:
+                    _, cambiados = estado_simulacion.run_procesos_cambiados(1)
+                    guardar_estado_simulacion(estado_simulacion, self.simulacion_id)
+                    if cambiados:
+                        evento = evento_sse('cambios', {
+                            'tick': estado_simulacion.tick,
+                            'procesos': [p.to_dict() for p in cambiados],
+                            'terminados': estado_simulacion.contar_terminados()
+                        })
+            if evento is not None:
+                with candado_transmisiones:
+                    for cola in self.suscriptores:
+                        cola.put(evento)
+            time.sleep(self.intervalo)
+
+
+# Transmisión en curso de cada simulación, por id
+transmisiones = {}
+candado_transmisiones = threading.Lock()
+
+def suscribir_transmision(simulacion_id, intervalo):
+    """Devuelve la transmisión de la simulación (creándola si no hay) y una cola para sus eventos."""
+    cola = queue.Queue()
+    with candado_transmisiones:
+        transmision = transmisiones.get(simulacion_id)
+        nueva = transmision is None
+        if nueva:
+            transmision = transmisiones[simulacion_id] = TransmisionSimulacion(simulacion_id, intervalo)
+        transmision.suscriptores.append(cola)
+    if nueva:
+        threading.Thread(target=transmision.ejecutar, daemon=True).start()
+    return transmision, cola
+
+@app.route('/stream_simulacion')
+def stream_simulacion():
+    # Envía el estado completo y luego los procesos que cambiaron en cada
+    # paso. Los pasos los da la TransmisionSimulacion de la simulación, con el
+    # intervalo que pidió la primera conexión; mientras está pausada no se
+    # envía nada (salvo un latido).
+    simulacion_id = get_simulacion_id()
+    intervalo = max(0.05, request.args.get('intervalo', INTERVALO_STREAM, type=float))
+
+    def eventos():
+        # Suscribirse antes de leer el estado para no perder ningún paso; un
+        # cambio ya incluido en el estado solo se vuelve a aplicar
+        transmision, cola = suscribir_transmision(simulacion_id, intervalo)
+        try:
+            with almacen_estado.candado(simulacion_id):
+                estado_simulacion = almacen_estado.obtener(simulacion_id)
+                if estado_simulacion is None:
+                    evento = EVENTO_FIN
+                else:
+                    evento = evento_sse('estado', {
+                        'estados': ESTADOS,
+                        'procesos': estado_simulacion.procesos_por_estado_dict(),
+                        'terminados': estado_simulacion.contar_terminados(),
+                        'simulacion_en_curso': estado_simulacion.simulacion_en_curso,
+                        'simulacion_pausada': estado_simulacion.simulacion_pausada
+                    })
+            while True:
+                yield evento
+                if evento is EVENTO_FIN:
+                    return
+                try:
+                    evento = cola.get(timeout=INTERVALO_LATIDO)
+                except queue.Empty:
+                    evento = ': latido\n\n'
+        finally:
+            transmision.desuscribir(cola)
+
+    return Response(eventos(), mimetype='text/event-stream', headers={'Cache-Control': 'no-cache'})
+
 @app.route('/siguiente_paso')
+@sincronizado
 def siguiente_paso():
     estado_simulacion = get_estado_simulacion()
-    if not estado_simulacion.get('simulacion_en_curso', False):
+    if not estado_simulacion.simulacion_en_curso:
         return redirect(url_for('index'))
 
     # Realizar un paso de simulación
-    desbloquear_procesos(estado_simulacion)
-    asignar_procesos(estado_simulacion)
-    ejecutar_procesos(estado_simulacion)
-
-    # Verificar si la simulación ha terminado
-    if not estado_simulacion['listo'] and not estado_simulacion['bloqueado'] and not estado_simulacion['ejecutando']:
-        estado_simulacion['simulacion_en_curso'] = False
+    estado_simulacion.paso()
 
     guardar_estado_simulacion(estado_simulacion)
     return redirect(url_for('index'))
 
-def desbloquear_procesos(estado_simulacion):
-    bloqueado = [Proceso.from_dict(p) for p in estado_simulacion['bloqueado']]
-    recursos_disponibles_dict = estado_simulacion['recursos_disponibles_dict']
-
-    # Separar procesos con y sin preeminencia
-    procesos_preeminentes = [p for p in bloqueado if p.preeminencia]
-    procesos_no_preeminentes = [p for p in bloqueado if not p.preeminencia]
-
-    # Intentar desbloquear procesos preeminentes primero
-    for proceso in procesos_preeminentes:
-        if recursos_disponibles(proceso, recursos_disponibles_dict):
-            asignar_recursos(proceso, recursos_disponibles_dict)
-            proceso.recursos_obtenidos = proceso.recursos_requeridos[:]
-            bloqueado.remove(proceso)
-            proceso.estado = 'Listo'
-            proceso.recursos_faltantes = []
-            estado_simulacion['listo'].append(proceso.to_dict())
-        else:
-            proceso.recursos_faltantes = obtener_recursos_faltantes(proceso, recursos_disponibles_dict)
-
-    # Luego intentar desbloquear procesos sin preeminencia
-    for proceso in procesos_no_preeminentes:
-        if recursos_disponibles(proceso, recursos_disponibles_dict):
-            asignar_recursos(proceso, recursos_disponibles_dict)
-            proceso.recursos_obtenidos = proceso.recursos_requeridos[:]
-            bloqueado.remove(proceso)
-            proceso.estado = 'Listo'
-            proceso.recursos_faltantes = []
-            estado_simulacion['listo'].append(proceso.to_dict())
-        else:
-            proceso.recursos_faltantes = obtener_recursos_faltantes(proceso, recursos_disponibles_dict)
-
-    estado_simulacion['bloqueado'] = [p.to_dict() for p in bloqueado]
-
-
-def asignar_procesos(estado_simulacion):
-    listo = [Proceso.from_dict(p) for p in estado_simulacion['listo']]
-    ejecutando = [Proceso.from_dict(p) for p in estado_simulacion['ejecutando']]
-    recursos_disponibles_dict = estado_simulacion['recursos_disponibles_dict']
-
-    # Separar procesos con y sin preeminencia
-    procesos_preeminentes = [p for p in listo if p.preeminencia]
-    procesos_no_preeminentes = [p for p in listo if not p.preeminencia]
-
-    # Asignar procesos preeminentes primero
-    for proceso in procesos_preeminentes:
-        if len(ejecutando) < 1:
-            if proceso.recursos_obtenidos == proceso.recursos_requeridos:
-                listo.remove(proceso)
-                proceso.estado = 'Ejecutando'
-                proceso.veces_ejecutando += 1
-                ejecutando.append(proceso)
-            elif recursos_disponibles(proceso, recursos_disponibles_dict):
-                asignar_recursos(proceso, recursos_disponibles_dict)
-                proceso.recursos_obtenidos = proceso.recursos_requeridos[:]
-                listo.remove(proceso)
-                proceso.estado = 'Ejecutando'
-                proceso.veces_ejecutando += 1
-                ejecutando.append(proceso)
-            else:
-                proceso.estado = 'Bloqueado'
-                proceso.recursos_faltantes = obtener_recursos_faltantes(proceso, recursos_disponibles_dict)
-                listo.remove(proceso)
-                estado_simulacion['bloqueado'].append(proceso.to_dict())
-
-    # Si no hay procesos preeminentes o la CPU está libre, asignar los demás
-    if len(ejecutando) < 1:
-        for proceso in procesos_no_preeminentes:
-            if len(ejecutando) < 1:
-                if proceso.recursos_obtenidos == proceso.recursos_requeridos:
-                    listo.remove(proceso)
-                    proceso.estado = 'Ejecutando'
-                    proceso.veces_ejecutando += 1
-                    ejecutando.append(proceso)
-                elif recursos_disponibles(proceso, recursos_disponibles_dict):
-                    asignar_recursos(proceso, recursos_disponibles_dict)
-                    proceso.recursos_obtenidos = proceso.recursos_requeridos[:]
-                    listo.remove(proceso)
-                    proceso.estado = 'Ejecutando'
-                    proceso.veces_ejecutando += 1
-                    ejecutando.append(proceso)
-                else:
-                    proceso.estado = 'Bloqueado'
-                    proceso.recursos_faltantes = obtener_recursos_faltantes(proceso, recursos_disponibles_dict)
-                    listo.remove(proceso)
-                    estado_simulacion['bloqueado'].append(proceso.to_dict())
-
-    estado_simulacion['listo'] = [p.to_dict() for p in listo]
-    estado_simulacion['ejecutando'] = [p.to_dict() for p in ejecutando]
-
-
-def ejecutar_procesos(estado_simulacion):
-    ejecutando = [Proceso.from_dict(p) for p in estado_simulacion['ejecutando']]
-    terminado = [Proceso.from_dict(p) for p in estado_simulacion['terminado']]
-    listo = [Proceso.from_dict(p) for p in estado_simulacion['listo']]
-    recursos_disponibles_dict = estado_simulacion['recursos_disponibles_dict']
-
-    procesos_a_listo = []
-    procesos_terminados = []
-    for proceso in ejecutando:
-         # Almacenar el tamaño anterior
-        tamaño_anterior = proceso.tamaño
-        # Reducir tamaño en 1 unidad por ciclo
-        proceso.tamaño -= 1
-        proceso.unidades_ejecutadas += 1
-
-        # Calcular la cantidad reducida
-        cantidad_reducida = tamaño_anterior - proceso.tamaño
-        # Actualizar la asignación de memoria
-        success, msg = memory_manager.reduce_process_size(proceso.id, cantidad_reducida)
-        if not success:
-            print(f"Error al reducir el tamaño del proceso en memoria: {msg}")
-
-        if proceso.tamaño <= 0:
-            proceso.estado = 'Terminado'
-            procesos_terminados.append(proceso)
-            # Eliminar el proceso de la memoria
-            memory_manager.delete_process_memory(proceso.id)
-        elif proceso.unidades_ejecutadas >= 5:
-            # Ha ejecutado 5 unidades, debe ser interrumpido
-            proceso.estado = 'Listo'
-            procesos_a_listo.append(proceso)
-        else:
-            # Continúa ejecutando
-            proceso.estado = 'Ejecutando'
-
-    # Remover procesos de 'Ejecutando' y actualizar estados
-    for proceso in procesos_terminados:
-        ejecutando.remove(proceso)
-        liberar_recursos(proceso, recursos_disponibles_dict)
-        terminado.append(proceso)
-        proceso.recursos_obtenidos.clear()
-
-    for proceso in procesos_a_listo:
-        ejecutando.remove(proceso)
-        if not proceso.preeminencia:
-            # Solo los procesos sin preeminencia tienen probabilidad de liberar recursos
-            if random.random() < 0.2:
-                liberar_recursos(proceso, recursos_disponibles_dict)
-                proceso.recursos_obtenidos.clear()
-        # Los procesos con preeminencia retienen sus recursos
-        listo.append(proceso)
-        proceso.unidades_ejecutadas = 0  # Reiniciar contador de unidades ejecutadas
-
-
-    estado_simulacion['ejecutando'] = [p.to_dict() for p in ejecutando if p not in procesos_terminados and p not in procesos_a_listo]
-    estado_simulacion['terminado'].extend([p.to_dict() for p in procesos_terminados])
-    estado_simulacion['listo'].extend([p.to_dict() for p in procesos_a_listo])
-    estado_simulacion['recursos_disponibles_dict'] = recursos_disponibles_dict
-
-
-def recursos_disponibles(proceso, recursos_disponibles_dict):
-    for recurso in proceso.recursos_requeridos:
-        if not recursos_disponibles_dict.get(recurso, True):
-            return False
-    return True
-
-def obtener_recursos_faltantes(proceso, recursos_disponibles_dict):
-    faltantes = []
-    for recurso in proceso.recursos_requeridos:
-        if not recursos_disponibles_dict.get(recurso, True):
-            faltantes.append(recurso)
-    return faltantes
-
-
-def asignar_recursos(proceso, recursos_disponibles_dict):
-    for recurso in proceso.recursos_requeridos:
-        recursos_disponibles_dict[recurso] = False
-
-def liberar_recursos(proceso, recursos_disponibles_dict):
-    for recurso in proceso.recursos_requeridos:
-        recursos_disponibles_dict[recurso] = True
+@app.context_processor
+def limites():
+    # Límites configurables que muestran las plantillas
+    return {'max_tamano': MAX_TAMANO, 'max_procesos': MAX_PROCESOS}
 
 # Crear el filtro personalizado
 @app.template_filter('ceil')
@@ -467,45 +545,134 @@ def ceil_filter(value):
     return math.ceil(value)
 
 @app.route('/generar_reporte')
+@sincronizado
 def generar_reporte():
     estado_simulacion = get_estado_simulacion()
     reporte_datos = []
 
-    for estado in ESTADOS:
-        procesos = [Proceso.from_dict(p) for p in estado_simulacion[estado.lower()]]
-        for proceso in procesos:
-            proceso_info = {
-                'id': proceso.id,
-                'tamaño_inicial': proceso.tamaño_inicial,
-                'tamaño_restante': proceso.tamaño,
-                'estado': proceso.estado,
-                'preeminencia': proceso.preeminencia,
-                'recursos_obtenidos': ', '.join(proceso.recursos_obtenidos) if proceso.recursos_obtenidos else 'Ninguno',
-                'recursos_faltantes': ', '.join(proceso.recursos_faltantes) if proceso.recursos_faltantes else '',
-                'veces_ejecutando': proceso.veces_ejecutando,
-            }
-            reporte_datos.append(proceso_info)
-
-    return render_template('reporte.html', reporte_datos=reporte_datos)
+    # Los procesos vivos se muestran todos; los terminados, por páginas
+    terminados = estado_simulacion.contar_terminados()
+    paginas = max(1, math.ceil(terminados / TERMINADOS_POR_PAGINA))
+    pagina = min(max(1, request.args.get('pagina', 1, type=int)), paginas)
+    procesos = [proceso for estado in ESTADOS if estado != 'Terminado' for proceso in estado_simulacion.cola(estado)]
+    procesos += estado_simulacion.leer_terminados((pagina - 1) * TERMINADOS_POR_PAGINA, TERMINADOS_POR_PAGINA)
+
+    for proceso in procesos:
+        proceso_info = {
+            'id': proceso.id,
+            'tamaño_inicial': proceso.tamaño_inicial,
+            'tamaño_restante': proceso.tamaño,
+            'estado': proceso.estado,
+            'preeminencia': proceso.preeminencia,
+            'recursos_obtenidos': ', '.join(proceso.recursos_obtenidos) if proceso.recursos_obtenidos else 'Ninguno',
+            'recursos_faltantes': ', '.join(proceso.recursos_faltantes) if proceso.recursos_faltantes else '',
+            'veces_ejecutando': proceso.veces_ejecutando,
+            'tick_llegada': proceso.tick_llegada,
+            'tick_primera_ejecucion': proceso.tick_primera_ejecucion,
+            'tick_fin': proceso.tick_fin,
+            'ticks_bloqueado': proceso.ticks_bloqueado,
+        }
+        reporte_datos.append(proceso_info)
+
+    paginacion = estado_simulacion.paginacion
+    return render_template(
+        'reporte.html', reporte_datos=reporte_datos, nucleos=estado_simulacion.utilizacion_nucleos(),
+        paginacion=paginacion.politica if paginacion else None,
+        estadisticas_paginacion=paginacion.estadisticas.como_dict() if paginacion else None,
+        semilla=estado_simulacion.semilla,
+        terminados=terminados, pagina=pagina, paginas=paginas, por_pagina=TERMINADOS_POR_PAGINA,
+        resumen=estado_simulacion.resumen(),
+        interbloqueos=estado_simulacion.interbloqueos,
+        estadisticas_interbloqueos=estado_simulacion.estadisticas_interbloqueos.como_dict(),
+        periodo_deteccion=estado_simulacion.periodo_deteccion,
+    )
+
+@app.route('/exportar_traza')
+@sincronizado
+def exportar_traza():
+    # Descarga los procesos de la simulación como traza JSON Lines, con el
+    # paso en que llegaron a la cola de listos (los nuevos, el paso actual)
+    estado_simulacion = get_estado_simulacion()
+    procesos = [proceso for estado in ESTADOS if estado != 'Terminado' for proceso in estado_simulacion.cola(estado)]
+    procesos.extend(estado_simulacion.iterar_terminados())
+    registros = [
+        (estado_simulacion.tick if proceso.tick_llegada is None else proceso.tick_llegada, proceso)
+        for proceso in procesos
+    ]
+    registros.sort(key=lambda registro: registro[0])
+    contenido = ''.join(linea_traza(llegada, proceso) + '\n' for llegada, proceso in registros)
+    return Response(contenido, mimetype='application/x-ndjson',
+                    headers={'Content-Disposition': 'attachment; filename=traza.jsonl'})
+
+@app.route('/cargar_traza', methods=['POST'])
+@sincronizado
+def cargar_traza():
+    # Agrega como nuevos los procesos de una traza JSON Lines, leyéndola línea
+    # a línea, con los mismos límites que el formulario de agregar_proceso
+    estado_simulacion = get_estado_simulacion()
+    archivo = request.files.get('traza')
+    if archivo is None:
+        return redirect(url_for('index'))
+    agregados, errores = 0, []
+    try:
+        for _, proceso in iterar_traza(io.TextIOWrapper(archivo.stream, encoding='utf-8')):
+            if limite_alcanzado(estado_simulacion):
+                errores.append(f"Se alcanzó el límite máximo de {MAX_PROCESOS} procesos.")
+                break
+            if id_ya_existe(proceso.id, estado_simulacion):
+                errores.append(f"Ya existe un proceso con el ID '{proceso.id}'.")
+                continue
+            if not 1 <= proceso.tamaño_inicial <= MAX_TAMANO:
+                errores.append(f"El tamaño del proceso '{proceso.id}' no está entre 1 y {MAX_TAMANO}.")
+                continue
+            success, msg = estado_simulacion.agregar_proceso(proceso)
+            if not success:
+                errores.append(f"No se pudo asignar memoria al proceso '{proceso.id}': {msg}")
+                continue
+            agregados += 1
+    except (ValueError, UnicodeDecodeError) as error:
+        errores.append(str(error))
+    guardar_estado_simulacion(estado_simulacion)
+    return render_template('index.html', estados=ESTADOS, procesos=estado_simulacion.procesos_por_estado(),
+                           simulacion_en_curso=estado_simulacion.simulacion_en_curso,
+                           simulacion_pausada=estado_simulacion.simulacion_pausada,
+                           terminados=estado_simulacion.contar_terminados(),
+                           mensaje=f"Procesos cargados de la traza: {agregados}.", errores=errores)
 
 @app.route('/memoria')
+@sincronizado
 def memoria():
     message = request.args.get('message', '')
-    return render_template('memoria.html', ram=memory_manager.ram, rom=memory_manager.rom, processes=memory_manager.processes, message=message)
+    gestor_memoria = get_estado_simulacion().memoria
+    # Se dibuja con el candado tomado para no mostrar una operación a medias
+    with gestor_memoria.lock:
+        return render_template('memoria.html', ram=gestor_memoria.vista_ram(), rom=gestor_memoria.vista_rom(), processes=gestor_memoria.processes.values(), message=message,
+                               n_ram=gestor_memoria.n_ram, version=gestor_memoria.version,
+                               instancia=gestor_memoria.instancia)
+
+@app.route('/memoria/delta')
+@sincronizado
+def memoria_delta():
+    # Marcos y procesos que cambiaron desde la versión `since` de la memoria
+    # `instancia` (las que devolvió la consulta anterior o las que trae la
+    # página). Sin ellas, si la versión es demasiado vieja o si la memoria es
+    # otra (por ejemplo después de reiniciar), se devuelve la memoria completa.
+    since = request.args.get('since', -1, type=int)
+    instancia = request.args.get('instancia')
+    return jsonify(get_estado_simulacion().memoria.cambios_desde(since, instancia))
 
 @app.route('/reiniciar_simulacion')
+@sincronizado
 def reiniciar_simulacion():
-    # Reinicia el estado de la simulación de procesos
-    session.pop('estado_simulacion', None)
-    
-    # Reinicia el estado de la memoria
-    memory_manager.init_memory()  # Esta es la llamada para limpiar la memoria
+    # Reinicia el estado de la simulación de procesos; la memoria es parte de
+    # ella, así que la próxima petición empieza con una memoria vacía
+    simulacion_id = get_simulacion_id()
+    almacen_estado.eliminar(simulacion_id)
+    if DIRECTORIO_TERMINADOS:
+        eliminar_terminados(simulacion_id)
 
     return redirect(url_for('index'))
 
-# Inicializar la memoria una vez al inicio
-memory_manager.init_memory()
-
 
 if __name__ == '__main__':
     app.run(debug=True)
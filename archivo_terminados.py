@@ -0,0 +1,170 @@
+"""
+Archivo en disco de los procesos terminados de una simulación.
+
+Los terminados ya no cambian, así que en lugar de guardarlos en la cola
+'terminado' (que se serializa completa en cada petición) se agregan a un
+archivo JSON Lines de solo agregado, una línea por proceso con su to_dict().
+El estado de la simulación solo guarda la ruta, el número de registros y la
+posición en bytes del comienzo de cada bloque de REGISTROS_POR_BLOQUE
+registros, de modo que leer una página no recorre el archivo desde el
+principio.
+
+Para saber si un id ya se usó sin guardar los ids en memoria hay un índice
+en disco junto al archivo (<ruta>.ids): una tabla hash de direccionamiento
+abierto con casillas de 16 bytes (resumen de 64 bits del id, número de
+registro + 1; 0 es casilla vacía). Una consulta lee unas pocas casillas y
+confirma el id leyendo su registro, así que no depende del tamaño del
+archivo. La tabla duplica su capacidad cuando se llena hasta la mitad.
+"""
+import hashlib
+import json
+import os
+import struct
+from array import array
+
+REGISTROS_POR_BLOQUE = 256
+
+# Casillas iniciales del índice de ids (potencia de 2)
+CAPACIDAD_INDICE = 1024
+
+_casilla = struct.Struct('<QQ')
+
+_codificar = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+
+
+class ArchivoTerminados:
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self.total = 0
+        self.bytes = 0
+        self.bloques = array('q')
+        self.capacidad = CAPACIDAD_INDICE
+        directorio = os.path.dirname(ruta)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        # Un archivo que ya existía (por ejemplo de una simulación anterior
+        # con el mismo id) se descarta
+        open(ruta, 'wb').close()
+        self._crear_indice(self.capacidad)
+
+    @property
+    def ruta_indice(self):
+        return self.ruta + '.ids'
+
+    def __len__(self):
+        return self.total
+
+    @staticmethod
+    def _resumen(id_proceso):
+        return int.from_bytes(hashlib.blake2b(str(id_proceso).encode('utf-8'), digest_size=8).digest(), 'little')
+
+    def _crear_indice(self, capacidad):
+        with open(self.ruta_indice, 'wb') as indice:
+            indice.truncate(capacidad * _casilla.size)
+
+    def _insertar(self, indice, resumen, registro):
+        # Sondeo lineal hasta una casilla vacía o que apunta a un registro
+        # que ya no existe (se escribió pero el estado no llegó a guardarse)
+        mascara = self.capacidad - 1
+        posicion = resumen & mascara
+        while True:
+            indice.seek(posicion * _casilla.size)
+            numero = _casilla.unpack(indice.read(_casilla.size))[1]
+            if numero == 0 or numero > registro:
+                indice.seek(posicion * _casilla.size)
+                indice.write(_casilla.pack(resumen, registro + 1))
+                return
+            posicion = (posicion + 1) & mascara
+
+    def _reconstruir_indice(self, capacidad):
+        """Rehace el índice con la capacidad dada a partir del anterior."""
+        with open(self.ruta_indice, 'rb') as indice:
+            casillas = [(resumen, numero - 1) for resumen, numero in _casilla.iter_unpack(indice.read())
+                        if 0 < numero <= self.total]
+        self.capacidad = capacidad
+        self._crear_indice(capacidad)
+        with open(self.ruta_indice, 'r+b') as indice:
+            for resumen, registro in casillas:
+                self._insertar(indice, resumen, registro)
+
+    def _id_registro(self, archivo, registro):
+        bloque, saltar = divmod(registro, REGISTROS_POR_BLOQUE)
+        archivo.seek(self.bloques[bloque])
+        for _ in range(saltar):
+            archivo.readline()
+        return json.loads(archivo.readline())['id']
+
+    def contiene(self, id_proceso):
+        """True si hay un registro con ese id."""
+        resumen = self._resumen(id_proceso)
+        mascara = self.capacidad - 1
+        posicion = resumen & mascara
+        with open(self.ruta_indice, 'rb') as indice:
+            while True:
+                indice.seek(posicion * _casilla.size)
+                otro, numero = _casilla.unpack(indice.read(_casilla.size))
+                if numero == 0:
+                    return False
+                if otro == resumen and numero <= self.total:
+                    # Dos ids con el mismo resumen son muy improbables, pero
+                    # se confirma con el registro
+                    with open(self.ruta, 'rb') as archivo:
+                        if self._id_registro(archivo, numero - 1) == id_proceso:
+                            return True
+                posicion = (posicion + 1) & mascara
+
+    def agregar(self, procesos):
+        """Agrega al final los procesos (objetos con to_dict)."""
+        if not procesos:
+            return
+        if 2 * (self.total + len(procesos)) > self.capacidad:
+            capacidad = self.capacidad
+            while 2 * (self.total + len(procesos)) > capacidad:
+                capacidad *= 2
+            self._reconstruir_indice(capacidad)
+        with open(self.ruta, 'ab') as archivo, open(self.ruta_indice, 'r+b') as indice:
+            # Si el archivo quedó más largo que lo registrado (se escribió
+            # pero el estado de la simulación no llegó a guardarse), lo que
+            # sobra se descarta para que ambos coincidan
+            archivo.truncate(self.bytes)
+            for proceso in procesos:
+                if self.total % REGISTROS_POR_BLOQUE == 0:
+                    self.bloques.append(self.bytes)
+                linea = (_codificar(proceso.to_dict()) + '\n').encode('utf-8')
+                archivo.write(linea)
+                self._insertar(indice, self._resumen(proceso.id), self.total)
+                self.bytes += len(linea)
+                self.total += 1
+
+    def leer(self, desde=0, cantidad=None):
+        """Lista de los dicts de los registros desde la posición `desde` (a lo más `cantidad`)."""
+        fin = self.total if cantidad is None else min(self.total, desde + cantidad)
+        if desde >= fin:
+            return []
+        bloque, saltar = divmod(desde, REGISTROS_POR_BLOQUE)
+        registros = []
+        with open(self.ruta, 'rb') as archivo:
+            archivo.seek(self.bloques[bloque])
+            for _ in range(saltar):
+                archivo.readline()
+            for _ in range(fin - desde):
+                registros.append(json.loads(archivo.readline()))
+        return registros
+
+    def __iter__(self):
+        # Solo los registros que cuenta el estado, aunque el archivo tenga más
+        with open(self.ruta, 'rb') as archivo:
+            for _ in range(self.total):
+                yield json.loads(archivo.readline())
+
+    def eliminar(self):
+        eliminar_archivo(self.ruta)
+
+
+def eliminar_archivo(ruta):
+    """Borra el archivo de terminados en `ruta` y su índice de ids."""
+    for ruta_borrar in (ruta, ruta + '.ids'):
+        try:
+            os.remove(ruta_borrar)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,192 @@
+"""
+Barrido de parámetros de la simulación en paralelo.
+
+Ejecuta todas las combinaciones de los parámetros indicados (política,
+quantum, tamaño de marco, marcos en RAM por proceso, dimensiones de RAM y
+ROM, número de recursos y núcleos) con cada una de las semillas, repartiendo
+las ejecuciones entre procesos con ProcessPoolExecutor. Cada ejecución usa su
+propia instancia de MemoryManager, así que no comparten estado.
+
+Los procesos de la carga se admiten a medida que hay memoria libre (en orden
+de llegada); los que no caben ni con la memoria vacía se cuentan como
+rechazados. Al final se imprime una tabla con el promedio de las métricas de
+cada combinación sobre las semillas.
+
+Uso (desde la raíz del repositorio):
+    python barrido.py --quantum 2 5 10 --frame-size 2.5 5 --ram 5x5 10x10 --semillas 0 1 2
+"""
+import argparse
+import itertools
+import logging
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from memory_manager import MemoryManager
+from motor_simulacion import MotorSimulacion, generar_carga
+from politicas import POLITICAS, crear_politica
+
+# Parámetros de cada combinación, en el orden en que se muestran
+PARAMETROS = ['politica', 'quantum', 'frame_size', 'marcos_ram', 'ram', 'rom', 'recursos', 'cpus']
+
+POLITICAS_CON_QUANTUM = ('rr', 'prioridad')
+
+METRICAS = ['ticks', 'terminados', 'rechazados', 'throughput', 'retorno', 'retorno_p95', 'espera', 'utilizacion']
+
+
+def dimensiones(texto):
+    """Convierte 'FILASxCOLUMNAS' en una tupla (filas, columnas)."""
+    try:
+        filas, columnas = (int(n) for n in texto.lower().split('x'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'dimensiones inválidas: {texto!r} (se espera FILASxCOLUMNAS)')
+    return filas, columnas
+
+
+def ejecutar_configuracion(configuracion, semilla, n_procesos, max_ticks=None):
+    """Ejecuta una simulación completa y devuelve sus métricas."""
+    nombres_recursos = [f'Recurso{n}' for n in range(1, configuracion['recursos'] + 1)]
+    memoria = MemoryManager(
+        ram_rows=configuracion['ram'][0], ram_cols=configuracion['ram'][1],
+        rom_rows=configuracion['rom'][0], rom_cols=configuracion['rom'][1],
+        frame_size=configuracion['frame_size'],
+        max_ram_frames=configuracion['marcos_ram'],
+        semilla=semilla,
+    )
+    motor = MotorSimulacion(
+        memoria=memoria,
+        politica=crear_politica(configuracion['politica'], configuracion['quantum']),
+        n_cpus=configuracion['cpus'],
+        recursos=nombres_recursos,
+        semilla=semilla,
+    )
+
+    pendientes = deque(generar_carga(n_procesos, semilla, recursos=nombres_recursos))
+    rechazados = 0
+
+    def admitir():
+        nonlocal rechazados
+        while pendientes:
+            success, _ = motor.agregar_proceso(pendientes[0])
+            if success:
+                pendientes.popleft()
+            elif not memoria.processes:
+                # No cabe ni con la memoria vacía
+                pendientes.popleft()
+                rechazados += 1
+            else:
+                break
+        if motor.nuevo:
+            motor.iniciar()
+
+    admitir()
+    while motor.simulacion_en_curso and (max_ticks is None or motor.tick < max_ticks):
+        motor.paso()
+        # Los tiempos de los terminados quedan en motor.estadisticas
+        motor.descartar_terminados()
+        if pendientes:
+            admitir()
+
+    resumen = motor.resumen()
+    return {
+        'ticks': motor.tick,
+        'terminados': resumen['terminados'],
+        'rechazados': rechazados,
+        'throughput': resumen['rendimiento'],
+        'retorno': resumen['retorno']['promedio'],
+        'retorno_p95': resumen['retorno']['cuantiles'][0.95],
+        'espera': resumen['espera']['promedio'],
+        'utilizacion': resumen['utilizacion_cpu'],
+    }
+
+
+def _ejecutar(tarea):
+    return ejecutar_configuracion(*tarea)
+
+
+def combinaciones(args):
+    valores = [
+        args.politica, args.quantum, args.frame_size, args.marcos_ram,
+        args.ram, args.rom, args.recursos, args.cpus,
+    ]
+    resultado = {}
+    for combinacion in itertools.product(*valores):
+        configuracion = dict(zip(PARAMETROS, combinacion))
+        # El quantum solo cambia algo en rr y prioridad; se evita repetir las
+        # demás políticas una vez por quantum
+        if configuracion['politica'] not in POLITICAS_CON_QUANTUM:
+            configuracion['quantum'] = None
+        resultado.setdefault(tuple(configuracion.values()), configuracion)
+    return list(resultado.values())
+
+
+def barrer(configuraciones, semillas, n_procesos, max_ticks=None, workers=None):
+    """
+    Ejecuta cada configuración con cada semilla en paralelo. Devuelve una lista
+    de (configuración, métricas promedio sobre las semillas).
+    """
+    tareas = [(c, s, n_procesos, max_ticks) for c in configuraciones for s in semillas]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        resultados = list(executor.map(_ejecutar, tareas, chunksize=max(1, len(tareas) // (4 * (workers or os.cpu_count() or 1)))))
+
+    tabla = []
+    for n, configuracion in enumerate(configuraciones):
+        por_semilla = resultados[n * len(semillas):(n + 1) * len(semillas)]
+        promedio = {m: sum(r[m] for r in por_semilla) / len(por_semilla) for m in METRICAS}
+        tabla.append((configuracion, promedio))
+    return tabla
+
+
+def formatear_valor(valor):
+    if valor is None:
+        return '-'
+    if isinstance(valor, tuple):
+        return 'x'.join(str(n) for n in valor)
+    if isinstance(valor, float):
+        return f'{valor:.1f}'
+    return str(valor)
+
+
+def formatear_metrica(metrica, valor):
+    if metrica == 'throughput':
+        return f'{valor:.4f}'
+    if metrica == 'utilizacion':
+        return f'{valor:.1%}'
+    return formatear_valor(valor)
+
+
+def imprimir_tabla(tabla):
+    columnas = PARAMETROS + METRICAS
+    filas = [[formatear_valor(c[p]) for p in PARAMETROS] + [formatear_metrica(k, m[k]) for k in METRICAS] for c, m in tabla]
+    anchos = [max(len(col), *(len(fila[n]) for fila in filas)) for n, col in enumerate(columnas)]
+    print('  '.join(col.rjust(ancho) for col, ancho in zip(columnas, anchos)))
+    for fila in filas:
+        print('  '.join(valor.rjust(ancho) for valor, ancho in zip(fila, anchos)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Ejecuta un barrido de parámetros de la simulación en paralelo.')
+    parser.add_argument('--politica', nargs='+', choices=sorted(POLITICAS), default=['actual'])
+    parser.add_argument('--quantum', nargs='+', type=int, default=[5], help='quantum (solo aplica a rr y prioridad)')
+    parser.add_argument('--frame-size', nargs='+', type=float, default=[2.5], help='tamaño de marco en kb')
+    parser.add_argument('--marcos-ram', nargs='+', type=int, default=[3], help='máximo de marcos en RAM por proceso')
+    parser.add_argument('--ram', nargs='+', type=dimensiones, default=[(5, 5)], help='dimensiones de la RAM (FILASxCOLUMNAS)')
+    parser.add_argument('--rom', nargs='+', type=dimensiones, default=[(5, 10)], help='dimensiones de la ROM (FILASxCOLUMNAS)')
+    parser.add_argument('--recursos', nargs='+', type=int, default=[6], help='número de recursos del sistema')
+    parser.add_argument('--cpus', nargs='+', type=int, default=[1], help='número de núcleos')
+    parser.add_argument('--semillas', nargs='+', type=int, default=[0])
+    parser.add_argument('--procesos', type=int, default=200, help='procesos de la carga de cada ejecución')
+    parser.add_argument('--max-ticks', type=int, default=None, help='límite de pasos por ejecución')
+    parser.add_argument('--workers', type=int, default=None, help='procesos en paralelo (por defecto, uno por núcleo)')
+    args = parser.parse_args(argv)
+
+    # Los avisos del motor por cada proceso no interesan aquí (los procesos
+    # del pool heredan la configuración)
+    logging.basicConfig(level=logging.ERROR)
+    configuraciones = combinaciones(args)
+    print(f'{len(configuraciones)} combinaciones x {len(args.semillas)} semillas')
+    imprimir_tabla(barrer(configuraciones, args.semillas, args.procesos, args.max_ticks, args.workers))
+
+
+if __name__ == '__main__':
+    main()
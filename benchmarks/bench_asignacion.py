@@ -0,0 +1,101 @@
+"""
+Compara las formas de asignar memoria de MemoryManager.
+
+Con cada asignación (ver memory_manager.ASIGNACIONES) se ejecuta la misma
+secuencia de operaciones: crear procesos de tamaño aleatorio (hasta
+MAX_PROCESS_SIZE), reducirlos como lo hace el motor y eliminarlos. Se informa
+la latencia media de create_process_memory y de delete_process_memory, las
+operaciones por segundo, la fracción de creaciones rechazadas y la
+fragmentación interna y externa promedio. Con --compactar, una creación
+rechazada compacta la memoria y se reintenta. Con --repetidos K los tamaños se
+eligen entre K valores fijos, el caso en que el slab reutiliza más.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_asignacion [--operaciones N] [--semilla S] [--compactar] [--repetidos K]
+"""
+import argparse
+import random
+import time
+
+from memory_manager import ASIGNACIONES, MAX_PROCESS_SIZE, MemoryManager
+
+MUESTREO = 50
+
+
+def ejecutar(asignacion, operaciones, semilla, compactar, repetidos=0):
+    random.seed(semilla)
+    rng = random.Random(semilla)
+    tamaños = [rng.randint(1, MAX_PROCESS_SIZE) for _ in range(repetidos)]
+    memoria = MemoryManager(20, 20, 40, 50, colors=['#5dade2'] * operaciones, asignacion=asignacion)
+    vivos = []
+    creados = rechazados = compactaciones = 0
+    eliminados = 0
+    tiempo_crear = tiempo_eliminar = 0.0
+    muestras = []
+    inicio_total = time.perf_counter()
+
+    for n in range(operaciones):
+        operacion = rng.random()
+        if operacion < 0.4 or not vivos:
+            nombre = f'p{n}'
+            tamaño = rng.choice(tamaños) if tamaños else rng.randint(1, MAX_PROCESS_SIZE)
+            inicio = time.perf_counter()
+            success, _ = memoria.create_process_memory(nombre, tamaño)
+            if not success and compactar:
+                memoria.compactar()
+                compactaciones += 1
+                success, _ = memoria.create_process_memory(nombre, tamaño)
+            tiempo_crear += time.perf_counter() - inicio
+            creados += 1
+            if success:
+                vivos.append(nombre)
+            else:
+                rechazados += 1
+        elif operacion < 0.7:
+            nombre = rng.choice(vivos)
+            memoria.reduce_process_size(nombre, rng.randint(1, 5))
+            if nombre not in memoria.processes:
+                vivos.remove(nombre)
+        else:
+            nombre = vivos.pop(rng.randrange(len(vivos)))
+            inicio = time.perf_counter()
+            memoria.delete_process_memory(nombre)
+            tiempo_eliminar += time.perf_counter() - inicio
+            eliminados += 1
+        if n % MUESTREO == 0:
+            medicion = time.perf_counter()
+            muestras.append(memoria.fragmentacion())
+            # El muestreo no cuenta en las operaciones por segundo
+            inicio_total += time.perf_counter() - medicion
+
+    duracion = time.perf_counter() - inicio_total
+    promedio = {clave: sum(m[clave] for m in muestras) / len(muestras) for clave in muestras[0]}
+    return {
+        'crear_us': tiempo_crear / creados * 1e6,
+        'eliminar_us': tiempo_eliminar / eliminados * 1e6 if eliminados else 0.0,
+        'ops_s': operaciones / duracion,
+        'rechazo': rechazados / creados,
+        'compactaciones': compactaciones,
+        **promedio,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--operaciones', type=int, default=20000)
+    parser.add_argument('--semilla', type=int, default=0)
+    parser.add_argument('--compactar', action='store_true', help='compactar y reintentar cuando se rechaza una creación')
+    parser.add_argument('--repetidos', type=int, default=0, help='elegir los tamaños entre K valores fijos')
+    args = parser.parse_args(argv)
+
+    print(f"{'asignación':>16} {'crear (µs)':>10} {'elim. (µs)':>10} {'ops/s':>8} {'rechazo':>8} {'compact.':>8} "
+          f"{'frag. interna':>13} {'ext. RAM':>8} {'ext. ROM':>8}")
+    for asignacion in ASIGNACIONES:
+        r = ejecutar(asignacion, args.operaciones, args.semilla, args.compactar, args.repetidos)
+        print(f"{asignacion:>16} {r['crear_us']:>10.2f} {r['eliminar_us']:>10.2f} {r['ops_s']:>8.0f} "
+              f"{r['rechazo']:>8.1%} {r['compactaciones']:>8} "
+              f"{r['interna']:>13.1%} {r['externa_ram']:>8.1%} {r['externa_rom']:>8.1%}")
+
+
+if __name__ == '__main__':
+    main()
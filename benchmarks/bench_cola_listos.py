@@ -0,0 +1,79 @@
+"""
+Benchmark de la cola de listos.
+
+Compara un paso de simulación con N procesos listos usando la cola de dos
+deques (despacho O(1)) frente a la versión anterior, que separaba la cola en
+preeminentes y no preeminentes con dos listas por comprensión en cada paso y
+quitaba el proceso despachado con list.remove.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_cola_listos
+"""
+import random
+import time
+from collections import deque
+
+from motor_simulacion import ColasNucleos, MotorSimulacion, Proceso
+
+LISTOS = [1000, 10000, 50000, 100000]
+PASOS = 200
+
+
+class MotorOriginal(MotorSimulacion):
+    # Copia del despacho anterior (con un solo núcleo), usada como referencia
+
+    def iniciar(self):
+        super().iniciar()
+        nucleo = self.nucleos[0]
+        nucleo.listo = deque(nucleo.listo)
+        self.listo = ColasNucleos(self.nucleos)
+
+    def despachar(self, proceso, nucleo):
+        nucleo.listo.remove(proceso)
+        super().despachar(proceso, nucleo)
+
+    def asignar_procesos(self):
+        nucleo = self.nucleos[0]
+        listo = nucleo.listo
+        recursos = self.recursos
+        procesos_preeminentes = [p for p in listo if p.preeminencia]
+        procesos_no_preeminentes = [p for p in listo if not p.preeminencia]
+        for proceso in procesos_preeminentes + procesos_no_preeminentes:
+            if nucleo.proceso is not None:
+                break
+            if proceso.recursos_obtenidos == proceso.recursos_requeridos:
+                self.despachar(proceso, nucleo)
+            elif recursos.disponibles(proceso):
+                recursos.asignar(proceso)
+                proceso.recursos_obtenidos = proceso.recursos_requeridos[:]
+                self.despachar(proceso, nucleo)
+            else:
+                proceso.estado = 'Bloqueado'
+                proceso.tick_bloqueo = self.tick
+                proceso.recursos_faltantes = recursos.faltantes(proceso)
+                listo.remove(proceso)
+                self.bloqueado.append(proceso)
+                recursos.esperar(proceso)
+
+
+def medir(clase, n_listos):
+    random.seed(0)
+    motor = clase(con_memoria=False)
+    for n in range(n_listos):
+        motor.agregar_proceso(Proceso(f'p{n}', 65, [], preeminencia=n % 4 == 0))
+    motor.iniciar()
+    inicio = time.perf_counter()
+    motor.run(PASOS)
+    return (time.perf_counter() - inicio) / PASOS
+
+
+def main():
+    print(f"{'listos':>8} {'original (µs/paso)':>19} {'dos deques (µs/paso)':>21}")
+    for n_listos in LISTOS:
+        original = medir(MotorOriginal, n_listos)
+        nueva = medir(MotorSimulacion, n_listos)
+        print(f"{n_listos:>8} {original * 1e6:>19.1f} {nueva * 1e6:>21.1f}")
+
+
+if __name__ == '__main__':
+    main()
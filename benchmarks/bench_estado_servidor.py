@@ -0,0 +1,71 @@
+"""
+Benchmark de latencia de /avanzar_simulacion según el número de procesos.
+
+Mide el tiempo medio por petición con el estado guardado en memoria y en
+SQLite, y muestra el tamaño que tendría la cookie firmada si el estado
+completo siguiera viajando en la sesión de Flask (límite práctico: 4 KB).
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_estado_servidor
+"""
+import os
+import tempfile
+import time
+
+import app as aplicacion
+import memory_manager
+from almacen_estado import AlmacenMemoria, AlmacenSQLite
+from motor_simulacion import MotorSimulacion, Proceso
+
+PROCESOS = [10, 50, 200, 1000, 5000]
+PETICIONES = 50
+
+
+def preparar_estado(procesos):
+    memory_manager.RAM_ROWS, memory_manager.RAM_COLS = 150, 150
+    memory_manager.ROM_ROWS, memory_manager.ROM_COLS = 400, 400
+    memory_manager.PREDEFINED_COLORS = ['#5dade2'] * procesos
+    memory_manager.init_memory()
+    motor = MotorSimulacion(memoria=memory_manager)
+    for n in range(procesos):
+        motor.agregar_proceso(Proceso(f'p{n}', 65, ['Recurso1']))
+    motor.iniciar()
+    return motor
+
+
+def medir(almacen, procesos):
+    aplicacion.almacen_estado = almacen
+    cliente = aplicacion.app.test_client()
+    cliente.get('/obtener_estado')
+    with cliente.session_transaction() as sesion:
+        simulacion_id = sesion['simulacion_id']
+    almacen.guardar(simulacion_id, preparar_estado(procesos))
+
+    inicio = time.perf_counter()
+    for _ in range(PETICIONES):
+        cliente.get('/avanzar_simulacion')
+    return (time.perf_counter() - inicio) / PETICIONES
+
+
+def tamaño_cookie(procesos):
+    # Tamaño de la cookie si el estado completo se guardara en la sesión
+    motor = preparar_estado(procesos)
+    estado_simulacion = {estado.lower(): procesos for estado, procesos in motor.procesos_por_estado_dict().items()}
+    estado_simulacion['recursos_disponibles_dict'] = motor.recursos.como_dict()
+    estado_simulacion['simulacion_en_curso'] = motor.simulacion_en_curso
+    estado_simulacion['simulacion_pausada'] = motor.simulacion_pausada
+    serializador = aplicacion.app.session_interface.get_signing_serializer(aplicacion.app)
+    return len(serializador.dumps({'estado_simulacion': estado_simulacion}))
+
+
+def main():
+    directorio = tempfile.mkdtemp()
+    print(f"{'procesos':>8} {'memoria (ms)':>13} {'sqlite (ms)':>12} {'cookie anterior (bytes)':>24}")
+    for procesos in PROCESOS:
+        memoria = medir(AlmacenMemoria(), procesos)
+        sqlite = medir(AlmacenSQLite(os.path.join(directorio, f'estado{procesos}.db')), procesos)
+        print(f"{procesos:>8} {memoria * 1e3:>13.3f} {sqlite * 1e3:>12.3f} {tamaño_cookie(procesos):>24}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark del índice de marcos libres de memory_manager.
+
+Compara el costo de crear y eliminar un proceso de 4 marcos (3 en RAM y 1 en
+ROM) con el recorrido completo de la cuadrícula que hacía get_free_frames
+antes, a medida que crecen RAM_ROWS/RAM_COLS y ROM_ROWS/ROM_COLS.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_marcos_libres
+"""
+import random
+import time
+
+import memory_manager
+
+TAMAÑOS = [(5, 5), (20, 20), (50, 50), (100, 100), (300, 300), (1000, 1000)]
+REPETICIONES = 2000
+
+
+def get_free_frames_original(memory, frames_needed, start_row=0):
+    # Copia de la implementación anterior, usada como referencia
+    if frames_needed == 0:
+        return []
+    free_positions = []
+    rows = len(memory)
+    cols = len(memory[0])
+
+    positions = [(i, j) for i in range(start_row, rows) for j in range(cols)]
+    random.shuffle(positions)
+
+    for (i, j) in positions:
+        if memory[i][j]['process'] is None:
+            free_positions.append((i, j))
+            if len(free_positions) == frames_needed:
+                break
+    return free_positions
+
+
+def medir_indice(repeticiones):
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        memory_manager.create_process_memory('p', 10)
+        memory_manager.delete_process_memory('p')
+    return (time.perf_counter() - inicio) / repeticiones
+
+
+def medir_original(repeticiones):
+    # La cuadrícula de celdas que recorría la implementación anterior
+    ram, rom = memory_manager.vista_ram(), memory_manager.vista_rom()
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        get_free_frames_original(ram, 3, start_row=1)
+        get_free_frames_original(rom, 1)
+    return (time.perf_counter() - inicio) / repeticiones
+
+
+def main():
+    print(f"{'RAM/ROM':>12} {'marcos':>10} {'índice (µs)':>12} {'original (µs)':>14}")
+    for filas, columnas in TAMAÑOS:
+        memory_manager.RAM_ROWS, memory_manager.RAM_COLS = filas, columnas
+        memory_manager.ROM_ROWS, memory_manager.ROM_COLS = filas, columnas
+        memory_manager.init_memory()
+        total = 2 * filas * columnas
+        indice = medir_indice(REPETICIONES)
+        # El recorrido original es O(total de marcos); se limita el número
+        # de repeticiones en memorias grandes para que termine pronto
+        original = medir_original(max(3, REPETICIONES * 100 // total))
+        print(f"{filas:>5}x{columnas:<6} {total:>10} {indice * 1e6:>12.2f} {original * 1e6:>14.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,183 @@
+"""
+Benchmark de un paso de simulación con procesos vivos frente a la versión
+anterior, que reconstruía cada cola con Proceso.from_dict y la volvía a
+serializar con to_dict en cada función del paso.
+
+Para cada tamaño se informa el tiempo medio por paso, los objetos Proceso/dict
+construidos por paso y el pico de memoria reservada durante el paso.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_procesos_vivos
+"""
+import random
+import time
+import tracemalloc
+
+import memory_manager
+from motor_simulacion import MotorSimulacion, Proceso
+
+PROCESOS = [10, 100, 1000, 5000]
+PASOS = 200
+
+
+class Contador:
+    construidos = 0
+
+
+def from_dict(data):
+    Contador.construidos += 1
+    return Proceso.from_dict(data)
+
+
+def to_dict(proceso):
+    Contador.construidos += 1
+    return proceso.to_dict()
+
+
+# Copia de las funciones anteriores, usada como referencia
+def recursos_disponibles(proceso, recursos_disponibles_dict):
+    for recurso in proceso.recursos_requeridos:
+        if not recursos_disponibles_dict.get(recurso, True):
+            return False
+    return True
+
+
+def obtener_recursos_faltantes(proceso, recursos_disponibles_dict):
+    return [r for r in proceso.recursos_requeridos if not recursos_disponibles_dict.get(r, True)]
+
+
+def asignar_recursos(proceso, recursos_disponibles_dict):
+    for recurso in proceso.recursos_requeridos:
+        recursos_disponibles_dict[recurso] = False
+
+
+def liberar_recursos(proceso, recursos_disponibles_dict):
+    for recurso in proceso.recursos_requeridos:
+        recursos_disponibles_dict[recurso] = True
+
+
+def desbloquear_original(estado):
+    bloqueado = [from_dict(p) for p in estado['bloqueado']]
+    recursos = estado['recursos_disponibles_dict']
+    preeminentes = [p for p in bloqueado if p.preeminencia]
+    no_preeminentes = [p for p in bloqueado if not p.preeminencia]
+    for proceso in preeminentes + no_preeminentes:
+        if recursos_disponibles(proceso, recursos):
+            asignar_recursos(proceso, recursos)
+            proceso.recursos_obtenidos = proceso.recursos_requeridos[:]
+            bloqueado.remove(proceso)
+            proceso.estado = 'Listo'
+            proceso.recursos_faltantes = []
+            estado['listo'].append(to_dict(proceso))
+        else:
+            proceso.recursos_faltantes = obtener_recursos_faltantes(proceso, recursos)
+    estado['bloqueado'] = [to_dict(p) for p in bloqueado]
+
+
+def asignar_original(estado):
+    listo = [from_dict(p) for p in estado['listo']]
+    ejecutando = [from_dict(p) for p in estado['ejecutando']]
+    recursos = estado['recursos_disponibles_dict']
+    preeminentes = [p for p in listo if p.preeminencia]
+    no_preeminentes = [p for p in listo if not p.preeminencia]
+    for proceso in preeminentes + no_preeminentes:
+        if len(ejecutando) >= 1:
+            break
+        if proceso.recursos_obtenidos == proceso.recursos_requeridos or recursos_disponibles(proceso, recursos):
+            asignar_recursos(proceso, recursos)
+            proceso.recursos_obtenidos = proceso.recursos_requeridos[:]
+            listo.remove(proceso)
+            proceso.estado = 'Ejecutando'
+            proceso.veces_ejecutando += 1
+            ejecutando.append(proceso)
+        else:
+            proceso.estado = 'Bloqueado'
+            proceso.recursos_faltantes = obtener_recursos_faltantes(proceso, recursos)
+            listo.remove(proceso)
+            estado['bloqueado'].append(to_dict(proceso))
+    estado['listo'] = [to_dict(p) for p in listo]
+    estado['ejecutando'] = [to_dict(p) for p in ejecutando]
+
+
+def ejecutar_original(estado):
+    ejecutando = [from_dict(p) for p in estado['ejecutando']]
+    [from_dict(p) for p in estado['terminado']]
+    [from_dict(p) for p in estado['listo']]
+    recursos = estado['recursos_disponibles_dict']
+    a_listo, terminados = [], []
+    for proceso in ejecutando:
+        proceso.tamaño -= 1
+        proceso.unidades_ejecutadas += 1
+        memory_manager.reduce_process_size(proceso.id, 1)
+        if proceso.tamaño <= 0:
+            proceso.estado = 'Terminado'
+            terminados.append(proceso)
+            memory_manager.delete_process_memory(proceso.id)
+        elif proceso.unidades_ejecutadas >= 5:
+            proceso.estado = 'Listo'
+            a_listo.append(proceso)
+    for proceso in terminados:
+        liberar_recursos(proceso, recursos)
+        proceso.recursos_obtenidos.clear()
+    for proceso in a_listo:
+        if not proceso.preeminencia and random.random() < 0.2:
+            liberar_recursos(proceso, recursos)
+            proceso.recursos_obtenidos.clear()
+        proceso.unidades_ejecutadas = 0
+    estado['ejecutando'] = [to_dict(p) for p in ejecutando if p not in terminados and p not in a_listo]
+    estado['terminado'].extend(to_dict(p) for p in terminados)
+    estado['listo'].extend(to_dict(p) for p in a_listo)
+
+
+def preparar(procesos, como_dict):
+    memory_manager.RAM_ROWS, memory_manager.RAM_COLS = 150, 150
+    memory_manager.ROM_ROWS, memory_manager.ROM_COLS = 400, 400
+    memory_manager.PREDEFINED_COLORS = ['#5dade2'] * procesos
+    memory_manager.init_memory()
+    random.seed(0)
+    motor = MotorSimulacion(memoria=memory_manager)
+    for n in range(procesos):
+        motor.agregar_proceso(Proceso(f'p{n}', 65, [f'Recurso{n % 6 + 1}'], preeminencia=n % 3 == 0))
+    motor.iniciar()
+    if not como_dict:
+        return motor
+    # Estado con el formato anterior: colas de dicts
+    return {
+        'recursos_disponibles_dict': motor.recursos.como_dict(),
+        'listo': [p.to_dict() for p in motor.listo],
+        'ejecutando': [],
+        'bloqueado': [],
+        'terminado': [],
+    }
+
+
+def medir(procesos, como_dict):
+    estado = preparar(procesos, como_dict)
+    Contador.construidos = 0
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    for _ in range(PASOS):
+        if como_dict:
+            desbloquear_original(estado)
+            asignar_original(estado)
+            ejecutar_original(estado)
+        else:
+            estado.desbloquear_procesos()
+            estado.asignar_procesos()
+            estado.ejecutar_procesos()
+    duracion = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return duracion / PASOS, Contador.construidos / PASOS, pico
+
+
+def main():
+    print(f"{'procesos':>8} {'modo':>10} {'µs/paso':>10} {'objetos/paso':>13} {'pico (KB)':>10}")
+    for procesos in PROCESOS:
+        for como_dict, modo in ((True, 'dicts'), (False, 'vivos')):
+            tiempo, construidos, pico = medir(procesos, como_dict)
+            print(f"{procesos:>8} {modo:>10} {tiempo * 1e6:>10.1f} {construidos:>13.1f} {pico / 1024:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
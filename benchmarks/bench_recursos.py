@@ -0,0 +1,103 @@
+"""
+Benchmark del gestor de recursos con máscaras de bits e índice de espera.
+
+Con B procesos bloqueados sobre R recursos, en cada paso se libera un recurso
+y se vuelve a ocupar. La versión anterior revisaba todos los bloqueados contra
+el dict de recursos en cada paso; el gestor solo revisa los que pidieron el
+recurso liberado, que el índice de espera ya entrega en orden.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_recursos
+"""
+import random
+import time
+
+from gestor_recursos import GestorRecursos
+from motor_simulacion import Proceso
+
+BLOQUEADOS = [100, 1000, 10000, 100000]
+RECURSOS = [6, 64, 1024]
+PASOS = 50
+
+
+def recursos_disponibles(proceso, recursos_disponibles_dict):
+    for recurso in proceso.recursos_requeridos:
+        if not recursos_disponibles_dict.get(recurso, True):
+            return False
+    return True
+
+
+def obtener_recursos_faltantes(proceso, recursos_disponibles_dict):
+    faltantes = []
+    for recurso in proceso.recursos_requeridos:
+        if not recursos_disponibles_dict.get(recurso, True):
+            faltantes.append(recurso)
+    return faltantes
+
+
+def revisar_original(bloqueado, recursos_disponibles_dict):
+    # Recorrido anterior: todos los bloqueados contra el dict en cada paso
+    procesos_preeminentes = [p for p in bloqueado if p.preeminencia]
+    procesos_no_preeminentes = [p for p in bloqueado if not p.preeminencia]
+    revisados = 0
+    for proceso in procesos_preeminentes + procesos_no_preeminentes:
+        revisados += 1
+        if not recursos_disponibles(proceso, recursos_disponibles_dict):
+            proceso.recursos_faltantes = obtener_recursos_faltantes(proceso, recursos_disponibles_dict)
+    return revisados
+
+
+def preparar(n_bloqueados, n_recursos):
+    rng = random.Random(0)
+    nombres = [f'Recurso{i}' for i in range(n_recursos)]
+    gestor = GestorRecursos(nombres)
+    # Un proceso "dueño" por recurso, que lo tiene ocupado
+    duenos = [Proceso(f'd{i}', 1, [nombre]) for i, nombre in enumerate(nombres)]
+    for dueno in duenos:
+        gestor.asignar(dueno)
+    bloqueados = []
+    for n in range(n_bloqueados):
+        proceso = Proceso(f'p{n}', 1, rng.sample(nombres, min(3, n_recursos)))
+        gestor.esperar(proceso)
+        bloqueados.append(proceso)
+    return gestor, duenos, bloqueados
+
+
+def medir(n_bloqueados, n_recursos):
+    gestor, duenos, bloqueados = preparar(n_bloqueados, n_recursos)
+    dict_recursos = gestor.como_dict()
+
+    inicio = time.perf_counter()
+    revisados_original = 0
+    for paso in range(PASOS):
+        revisados_original += revisar_original(bloqueados, dict_recursos)
+    original = (time.perf_counter() - inicio) / PASOS
+
+    inicio = time.perf_counter()
+    revisados_indice = 0
+    for paso in range(PASOS):
+        dueno = duenos[paso % n_recursos]
+        gestor.liberar(dueno)
+        candidatos = gestor.despertar()
+        gestor.asignar(dueno)
+        for proceso in candidatos:
+            # Siguen bloqueados: el dueño volvió a ocupar el recurso
+            if not gestor.disponibles(proceso):
+                proceso.recursos_faltantes = gestor.faltantes(proceso)
+                gestor.esperar(proceso)
+        revisados_indice += len(candidatos)
+    indice = (time.perf_counter() - inicio) / PASOS
+    return original, revisados_original / PASOS, indice, revisados_indice / PASOS
+
+
+def main():
+    print(f"{'bloqueados':>10} {'recursos':>8} {'original (µs)':>14} {'revisados':>10} {'gestor (µs)':>12} {'revisados':>10}")
+    for n_recursos in RECURSOS:
+        for n_bloqueados in BLOQUEADOS:
+            original, rev_original, indice, rev_indice = medir(n_bloqueados, n_recursos)
+            print(f"{n_bloqueados:>10} {n_recursos:>8} {original * 1e6:>14.1f} {rev_original:>10.0f} "
+                  f"{indice * 1e6:>12.1f} {rev_indice:>10.0f}")
+
+
+if __name__ == '__main__':
+    main()
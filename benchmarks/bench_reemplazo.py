@@ -0,0 +1,53 @@
+"""
+Benchmark del camino rápido de reemplazo de páginas.
+
+Genera una traza con localidad (por defecto 1M de referencias sobre 200
+páginas) y la reproduce con cada política de reemplazo y distintos números de
+marcos, informando la tasa de fallos, los swaps y la velocidad en referencias
+por segundo. Al final busca, para cada política, cuántos marcos hacen falta
+para no superar la tasa de fallos objetivo.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_reemplazo [--referencias N] [--paginas P] [--objetivo T]
+"""
+import argparse
+import random
+import time
+
+from reemplazo_paginas import POLITICAS_REEMPLAZO, generar_referencias, marcos_para_tasa, simular_traza
+
+MARCOS = [3, 8, 16, 32, 64]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--referencias', type=int, default=1_000_000)
+    parser.add_argument('--paginas', type=int, default=200)
+    parser.add_argument('--localidad', type=float, default=0.95)
+    parser.add_argument('--objetivo', type=float, default=0.05, help='tasa de fallos objetivo')
+    parser.add_argument('--semilla', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    inicio = time.perf_counter()
+    traza = generar_referencias(args.paginas, args.referencias, random.Random(args.semilla), args.localidad)
+    print(f"Traza de {len(traza)} referencias a {args.paginas} páginas "
+          f"generada en {time.perf_counter() - inicio:.2f} s")
+
+    print(f"{'política':>8} {'marcos':>7} {'tasa fallos':>11} {'aciertos':>9} "
+          f"{'swap in':>9} {'swap out':>9} {'refs/s':>11}")
+    for politica in POLITICAS_REEMPLAZO:
+        for marcos in MARCOS:
+            inicio = time.perf_counter()
+            e = simular_traza(traza, marcos, politica)
+            duracion = time.perf_counter() - inicio
+            print(f"{politica:>8} {marcos:>7} {e.tasa_fallos:>11.2%} {e.tasa_aciertos:>9.2%} "
+                  f"{e.swap_in:>9} {e.swap_out:>9} {len(traza) / duracion:>11.0f}")
+
+    print(f"Marcos necesarios para una tasa de fallos <= {args.objetivo:.1%}:")
+    for politica in POLITICAS_REEMPLAZO:
+        marcos = marcos_para_tasa(traza, args.objetivo, politica)
+        print(f"{politica:>8} {marcos if marcos is not None else 'no alcanza':>7}")
+
+
+if __name__ == '__main__':
+    main()
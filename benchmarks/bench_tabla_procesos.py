@@ -0,0 +1,55 @@
+"""
+Micro-benchmark de la tabla de procesos de memory_manager.
+
+Llena la memoria con N procesos residentes y mide el costo medio de
+create_process_memory, reduce_process_size y delete_process_memory sobre un
+proceso adicional. Con la tabla indexada por nombre los tiempos no deben
+crecer con N.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_tabla_procesos
+"""
+import time
+
+import memory_manager
+
+RESIDENTES = [100, 1000, 10000, 20000]
+REPETICIONES = 2000
+
+
+def preparar(residentes):
+    # Memoria y paleta suficientes para todos los procesos residentes
+    memory_manager.RAM_ROWS, memory_manager.RAM_COLS = 250, 250
+    memory_manager.ROM_ROWS, memory_manager.ROM_COLS = 250, 250
+    memory_manager.PREDEFINED_COLORS = ['#5dade2'] * (residentes + 1)
+    memory_manager.init_memory()
+    for n in range(residentes):
+        memory_manager.create_process_memory(f'residente{n}', 5)
+
+
+def medir(residentes):
+    crear = reducir = eliminar = 0.0
+    for _ in range(REPETICIONES):
+        inicio = time.perf_counter()
+        memory_manager.create_process_memory('extra', 10)
+        t1 = time.perf_counter()
+        memory_manager.reduce_process_size('extra', 1)
+        t2 = time.perf_counter()
+        memory_manager.delete_process_memory('extra')
+        t3 = time.perf_counter()
+        crear += t1 - inicio
+        reducir += t2 - t1
+        eliminar += t3 - t2
+    return crear / REPETICIONES, reducir / REPETICIONES, eliminar / REPETICIONES
+
+
+def main():
+    print(f"{'residentes':>10} {'crear (µs)':>11} {'reducir (µs)':>13} {'eliminar (µs)':>14}")
+    for residentes in RESIDENTES:
+        preparar(residentes)
+        crear, reducir, eliminar = medir(residentes)
+        print(f"{residentes:>10} {crear * 1e6:>11.2f} {reducir * 1e6:>13.2f} {eliminar * 1e6:>14.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""
+Compara las políticas de planificación sobre la misma carga de trabajo.
+
+Cada política ejecuta la misma carga generada con la misma semilla (sin
+simular memoria) y se informa el throughput (procesos terminados por paso),
+el tiempo medio de retorno y de espera (en pasos) y la velocidad del motor
+(pasos por segundo).
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.comparar_politicas [--procesos N] [--semilla S] [--quantum Q ...]
+"""
+import argparse
+import random
+import time
+
+from motor_simulacion import MotorSimulacion, generar_carga
+from politicas import PoliticaActual, PoliticaFCFS, PoliticaPrioridad, PoliticaRoundRobin, PoliticaSJF, PoliticaSRTF
+
+
+def ejecutar(politica, n_procesos, semilla):
+    random.seed(semilla)
+    motor = MotorSimulacion(con_memoria=False, politica=politica)
+    for proceso in generar_carga(n_procesos, semilla):
+        motor.agregar_proceso(proceso)
+    motor.iniciar()
+    inicio = time.perf_counter()
+    ticks = motor.run_until_done()
+    duracion = time.perf_counter() - inicio
+
+    retornos = [p.tick_fin - p.tick_llegada for p in motor.terminado]
+    # Con una sola CPU que ejecuta una unidad por paso, la espera es el
+    # retorno menos el tamaño inicial
+    esperas = [p.tick_fin - p.tick_llegada - p.tamaño_inicial for p in motor.terminado]
+    return {
+        'ticks': ticks,
+        'terminados': len(motor.terminado),
+        'throughput': len(motor.terminado) / ticks if ticks else 0.0,
+        'retorno': sum(retornos) / len(retornos) if retornos else 0.0,
+        'espera': sum(esperas) / len(esperas) if esperas else 0.0,
+        'pasos_por_segundo': ticks / duracion if duracion else 0.0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--procesos', type=int, default=2000)
+    parser.add_argument('--semilla', type=int, default=0)
+    parser.add_argument('--quantum', type=int, nargs='+', default=[2, 5, 10])
+    args = parser.parse_args(argv)
+
+    politicas = [('actual', PoliticaActual()), ('fcfs', PoliticaFCFS())]
+    politicas += [(f'rr q={q}', PoliticaRoundRobin(quantum=q)) for q in args.quantum]
+    politicas += [('sjf', PoliticaSJF()), ('srtf', PoliticaSRTF())]
+    politicas += [(f'prioridad q={q}', PoliticaPrioridad(quantum=q)) for q in args.quantum]
+
+    print(f"{'política':>14} {'pasos':>8} {'terminados':>10} {'throughput':>10} "
+          f"{'retorno medio':>13} {'espera media':>12} {'pasos/s':>10}")
+    for nombre, politica in politicas:
+        r = ejecutar(politica, args.procesos, args.semilla)
+        print(f"{nombre:>14} {r['ticks']:>8} {r['terminados']:>10} {r['throughput']:>10.4f} "
+              f"{r['retorno']:>13.1f} {r['espera']:>12.1f} {r['pasos_por_segundo']:>10.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""
+Mide cómo escala la simulación con el número de núcleos de CPU.
+
+La misma carga (generada con la misma semilla, sin simular memoria) se
+ejecuta con 1, 2, 4, ... núcleos y se informa el número de pasos hasta
+terminar, el throughput (procesos terminados por paso), la aceleración
+respecto a un núcleo y la utilización media de los núcleos.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.escalado_nucleos [--procesos N] [--semilla S] [--max-cpus M] [--sin-robo]
+"""
+import argparse
+import random
+import time
+
+from motor_simulacion import MotorSimulacion, generar_carga
+from politicas import POLITICAS, crear_politica
+
+
+def ejecutar(n_cpus, n_procesos, semilla, politica, robo_trabajo):
+    random.seed(semilla)
+    motor = MotorSimulacion(con_memoria=False, politica=crear_politica(politica), n_cpus=n_cpus, robo_trabajo=robo_trabajo)
+    for proceso in generar_carga(n_procesos, semilla):
+        motor.agregar_proceso(proceso)
+    motor.iniciar()
+    inicio = time.perf_counter()
+    ticks = motor.run_until_done()
+    duracion = time.perf_counter() - inicio
+
+    utilizaciones = [fraccion for _, _, fraccion in motor.utilizacion_nucleos()]
+    return {
+        'ticks': ticks,
+        'terminados': len(motor.terminado),
+        'throughput': len(motor.terminado) / ticks if ticks else 0.0,
+        'utilizacion': sum(utilizaciones) / len(utilizaciones),
+        'pasos_por_segundo': ticks / duracion if duracion else 0.0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--procesos', type=int, default=2000)
+    parser.add_argument('--semilla', type=int, default=0)
+    parser.add_argument('--max-cpus', type=int, default=64)
+    parser.add_argument('--politica', choices=sorted(POLITICAS), default='actual')
+    parser.add_argument('--sin-robo', action='store_true', help='desactivar el robo de trabajo entre núcleos')
+    args = parser.parse_args(argv)
+
+    print(f"{'núcleos':>7} {'pasos':>8} {'terminados':>10} {'throughput':>10} "
+          f"{'aceleración':>11} {'utilización':>11} {'pasos/s':>10}")
+    base = None
+    n_cpus = 1
+    while n_cpus <= args.max_cpus:
+        r = ejecutar(n_cpus, args.procesos, args.semilla, args.politica, not args.sin_robo)
+        if base is None:
+            base = r['ticks']
+        aceleracion = base / r['ticks'] if r['ticks'] else 0.0
+        print(f"{n_cpus:>7} {r['ticks']:>8} {r['terminados']:>10} {r['throughput']:>10.4f} "
+              f"{aceleracion:>11.2f} {r['utilizacion']:>11.1%} {r['pasos_por_segundo']:>10.0f}")
+        n_cpus *= 2
+
+
+if __name__ == '__main__':
+    main()
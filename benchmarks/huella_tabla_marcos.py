@@ -0,0 +1,109 @@
+"""
+Huella en memoria de la tabla de marcos con 1M de marcos.
+
+Llena una memoria de RAM 500x1000 y ROM 500x1000 (1.000.000 de marcos) con
+procesos de 6 páginas (3 en RAM y 3 en ROM) y mide con tracemalloc los bytes
+de la tabla de marcos y de los procesos con sus tablas de páginas. Como
+referencia se construyen, con la misma ocupación, las estructuras de la
+versión anterior: una celda {'process', 'frame_id'} por marco y un dict
+{'type', 'i', 'j', 'frame_id'} por página (sin contar los objetos proceso,
+que la versión anterior también tenía).
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.huella_tabla_marcos [--filas F] [--columnas C]
+"""
+import argparse
+import time
+import tracemalloc
+
+from memory_manager import MARCO_SO, MemoryManager
+
+
+def medir(funcion):
+    """Devuelve (resultado, bytes reservados que siguen vivos, segundos)."""
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    inicio = time.perf_counter()
+    resultado = funcion()
+    duracion = time.perf_counter() - inicio
+    despues = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return resultado, despues - antes, duracion
+
+
+def llenar(memoria):
+    n = 0
+    while memoria.create_process_memory(f'p{n}', 6 * memoria.frame_size)[0]:
+        n += 1
+    return n
+
+
+def tabla_original(memoria):
+    # Celdas de la cuadrícula como en la versión anterior
+    ram = [[None] * memoria.ram_cols for _ in range(memoria.ram_rows)]
+    rom = [[None] * memoria.rom_cols for _ in range(memoria.rom_rows)]
+    for k in range(memoria.n_ram + memoria.n_rom):
+        if k < memoria.n_ram:
+            matriz, (i, j) = ram, divmod(k, memoria.ram_cols)
+        else:
+            matriz, (i, j) = rom, divmod(k - memoria.n_ram, memoria.rom_cols)
+        matriz[i][j] = {'process': None, 'frame_id': None}
+        if memoria.duenio[k] == MARCO_SO:
+            matriz[i][j] = {'process': 'S.O.', 'frame_id': 'S.O.-0'}
+    return ram, rom
+
+
+def paginas_original(memoria, ram, rom):
+    # Un dict por página, con el frame_id compartido con la celda
+    todos = []
+    for process in memoria.processes.values():
+        frames = []
+        for numero_pagina, k in enumerate(process.paginas, start=1):
+            frame_id = f"{process.name}-{numero_pagina}"
+            if k < memoria.n_ram:
+                tipo, matriz, (i, j) = 'RAM', ram, divmod(k, memoria.ram_cols)
+            else:
+                tipo, matriz, (i, j) = 'ROM', rom, divmod(k - memoria.n_ram, memoria.rom_cols)
+            matriz[i][j]['process'] = process
+            matriz[i][j]['frame_id'] = frame_id
+            frames.append({'type': tipo, 'i': i, 'j': j, 'frame_id': frame_id})
+        todos.append(frames)
+    return todos
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--filas', type=int, default=500)
+    parser.add_argument('--columnas', type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    filas, columnas = args.filas, args.columnas
+    total = 2 * filas * columnas
+
+    def crear():
+        return MemoryManager(filas, columnas, filas, columnas, colors=['#5dade2'])
+
+    memoria, bytes_tabla, t_tabla = medir(crear)
+    # Un solo color repetido alcanza para todos los procesos
+    memoria.colors = memoria.available_colors = ['#5dade2'] * total
+    procesos, bytes_paginas, t_llenar = medir(lambda: llenar(memoria))
+    ocupados = total - len(memoria.ram_free) - len(memoria.rom_free)
+
+    (ram, rom), bytes_tabla_original, t_tabla_original = medir(lambda: tabla_original(memoria))
+    _, bytes_paginas_original, t_paginas_original = medir(lambda: paginas_original(memoria, ram, rom))
+
+    print(f"Marcos: {total} (RAM {filas}x{columnas}, ROM {filas}x{columnas}), "
+          f"ocupados: {ocupados}, procesos: {procesos}")
+    print(f"{'estructura':>34} {'MB':>9} {'bytes/marco':>12} {'tiempo (s)':>11}")
+    filas_tabla = [
+        ('tabla de marcos + índices libres', bytes_tabla, total, t_tabla),
+        ('tabla de marcos original', bytes_tabla_original, total, t_tabla_original),
+        ('procesos + tablas de páginas', bytes_paginas, ocupados, t_llenar),
+        ('dicts de páginas original', bytes_paginas_original, ocupados, t_paginas_original),
+    ]
+    for nombre, n_bytes, marcos, duracion in filas_tabla:
+        print(f"{nombre:>34} {n_bytes / 2**20:>9.1f} {n_bytes / marcos:>12.1f} {duracion:>11.2f}")
+
+
+if __name__ == '__main__':
+    main()
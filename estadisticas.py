@@ -0,0 +1,182 @@
+"""
+Estadísticas de una simulación que se calculan a medida que avanza, con
+memoria acotada: no dependen de cuántos procesos terminaron, de modo que una
+ejecución de millones de procesos se resume sin guardarlos.
+
+- SketchCuantiles: promedio exacto y cuantiles aproximados (error relativo
+  acotado) de una serie de valores no negativos.
+- SerieAcotada: una serie en el tiempo con un número máximo de puntos; al
+  llenarse, cada punto pasa a promediar el doble de pasos.
+- EstadisticasSimulacion: retorno, espera, respuesta y tiempo bloqueado de
+  los procesos terminados, y ocupación de la memoria en cada paso.
+"""
+import math
+
+# Cuantiles que se informan en los reportes
+CUANTILES = (0.5, 0.9, 0.95, 0.99)
+
+
+class SketchCuantiles:
+    """
+    Cuantiles aproximados al estilo de DDSketch: cada valor positivo x se
+    cuenta en la cubeta ceil(log(x) / log(gamma)), con
+    gamma = (1 + precision) / (1 - precision), y el cuantil se estima con el
+    centro de su cubeta, a menos de `precision` (relativo) del valor exacto.
+    El número de cubetas crece con el logaritmo del mayor valor, no con la
+    cantidad de valores.
+    """
+
+    def __init__(self, precision=0.01):
+        self.gamma = (1 + precision) / (1 - precision)
+        self.log_gamma = math.log(self.gamma)
+        self.cubetas = {}  # índice -> cantidad de valores
+        self.ceros = 0  # valores <= 0
+        self.n = 0
+        self.suma = 0
+        self.minimo = None
+        self.maximo = None
+
+    def agregar(self, valor):
+        self.n += 1
+        self.suma += valor
+        if self.minimo is None or valor < self.minimo:
+            self.minimo = valor
+        if self.maximo is None or valor > self.maximo:
+            self.maximo = valor
+        if valor <= 0:
+            self.ceros += 1
+            return
+        indice = math.ceil(math.log(valor) / self.log_gamma)
+        self.cubetas[indice] = self.cubetas.get(indice, 0) + 1
+
+    @property
+    def promedio(self):
+        return self.suma / self.n if self.n else 0.0
+
+    def cuantil(self, q):
+        """Valor aproximado por debajo del cual queda la fracción `q` de los valores."""
+        if not self.n:
+            return 0.0
+        rango = q * (self.n - 1)
+        acumulado = self.ceros
+        if rango < acumulado:
+            return max(self.minimo, 0)
+        for indice in sorted(self.cubetas):
+            acumulado += self.cubetas[indice]
+            if rango < acumulado:
+                estimado = 2 * self.gamma ** indice / (self.gamma + 1)
+                return min(max(estimado, self.minimo), self.maximo)
+        return self.maximo
+
+    def como_dict(self):
+        return {
+            'n': self.n,
+            'promedio': self.promedio,
+            'minimo': self.minimo if self.minimo is not None else 0,
+            'maximo': self.maximo if self.maximo is not None else 0,
+            'cuantiles': {q: self.cuantil(q) for q in CUANTILES},
+        }
+
+
+class SerieAcotada:
+    """
+    Serie de valores por paso con a lo más `max_puntos` puntos. Cada punto es
+    el promedio de `ancho` pasos consecutivos; cuando se pasa del máximo se
+    juntan de a pares y el ancho se duplica.
+    """
+
+    def __init__(self, max_puntos=128):
+        self.max_puntos = max_puntos
+        self.ancho = 1
+        self.puntos = []  # [primer paso del punto, suma de los valores, cantidad]
+
+    def agregar(self, tick, valor):
+        inicio = tick - tick % self.ancho
+        puntos = self.puntos
+        if puntos and puntos[-1][0] == inicio:
+            puntos[-1][1] += valor
+            puntos[-1][2] += 1
+            return
+        puntos.append([inicio, valor, 1])
+        while len(puntos) > self.max_puntos:
+            self._juntar()
+            puntos = self.puntos
+
+    def _juntar(self):
+        self.ancho *= 2
+        juntos = []
+        for inicio, suma, n in self.puntos:
+            inicio -= inicio % self.ancho
+            if juntos and juntos[-1][0] == inicio:
+                juntos[-1][1] += suma
+                juntos[-1][2] += n
+            else:
+                juntos.append([inicio, suma, n])
+        self.puntos = juntos
+
+    def valores(self):
+        """Lista de (primer paso, promedio) de cada punto."""
+        return [(inicio, suma / n) for inicio, suma, n in self.puntos]
+
+
+class EstadisticasSimulacion:
+    def __init__(self):
+        self.terminados = 0
+        # Retorno: de la llegada a la cola de listos hasta terminar. Espera:
+        # retorno menos los pasos de CPU. Respuesta: hasta la primera
+        # ejecución. Bloqueo: pasos en la cola de bloqueados.
+        self.retorno = SketchCuantiles()
+        self.espera = SketchCuantiles()
+        self.respuesta = SketchCuantiles()
+        self.bloqueo = SketchCuantiles()
+        # Fracción de los marcos de RAM y ROM (sin los del S.O.) ocupados
+        self.ocupacion_memoria = SerieAcotada()
+        self.suma_ocupacion = 0.0
+        self.pasos_medidos = 0
+        self.maxima_ocupacion = 0.0
+
+    def registrar_terminado(self, proceso):
+        retorno = proceso.tick_fin - proceso.tick_llegada
+        self.terminados += 1
+        self.retorno.agregar(retorno)
+        self.espera.agregar(retorno - proceso.tamaño_inicial)
+        self.respuesta.agregar(proceso.tick_primera_ejecucion - proceso.tick_llegada)
+        self.bloqueo.agregar(proceso.ticks_bloqueado)
+
+    def registrar_paso(self, tick, ocupacion):
+        self.ocupacion_memoria.agregar(tick, ocupacion)
+        self.suma_ocupacion += ocupacion
+        self.pasos_medidos += 1
+        if ocupacion > self.maxima_ocupacion:
+            self.maxima_ocupacion = ocupacion
+
+    @property
+    def ocupacion_promedio(self):
+        return self.suma_ocupacion / self.pasos_medidos if self.pasos_medidos else 0.0
+
+    def como_dict(self):
+        return {
+            'terminados': self.terminados,
+            'retorno': self.retorno.como_dict(),
+            'espera': self.espera.como_dict(),
+            'respuesta': self.respuesta.como_dict(),
+            'bloqueo': self.bloqueo.como_dict(),
+            'ocupacion_memoria': {
+                'promedio': self.ocupacion_promedio,
+                'maxima': self.maxima_ocupacion,
+                'serie': self.ocupacion_memoria.valores(),
+            },
+        }
+
+
+def imprimir_resumen(resumen):
+    """Imprime los cuantiles y las utilizaciones de MotorSimulacion.resumen()."""
+    for nombre, clave in (('Retorno', 'retorno'), ('Espera', 'espera'), ('Respuesta', 'respuesta'),
+                          ('Bloqueado', 'bloqueo')):
+        serie = resumen[clave]
+        cuantiles = ', '.join(f"p{q * 100:g} {valor:.1f}" for q, valor in serie['cuantiles'].items())
+        print(f"{nombre}: promedio {serie['promedio']:.2f}, {cuantiles}, máximo {serie['maximo']}")
+    ocupacion = resumen['ocupacion_memoria']
+    print(f"Utilización de CPU: {resumen['utilizacion_cpu']:.1%}, "
+          f"rendimiento: {resumen['rendimiento']:.4f} procesos/paso, "
+          f"ocupación de memoria: promedio {ocupacion['promedio']:.1%}, máxima {ocupacion['maxima']:.1%}")
@@ -0,0 +1,207 @@
+# Gestor de recursos del planificador. Cada recurso tiene un bit asignado, de
+# modo que el conjunto de recursos de un proceso es un entero (máscara) y
+# comprobar si están todos libres es un solo AND. Además mantiene un índice de
+# espera (recurso -> procesos bloqueados que lo pidieron) para que al liberar
+# un recurso solo se revisen los procesos que lo esperan.
+#
+# Un proceso se registra una sola vez, al bloquearse, en todos los recursos
+# que pidió, y sale del índice solo cuando deja de estar bloqueado. Así cada
+# lista queda en el orden en que se bloquearon sus procesos (hay una para los
+# preeminentes y otra para el resto) y despertar() devuelve los candidatos ya
+# en el orden en que se deben revisar, sin volver a registrar a los que siguen
+# bloqueados ni ordenar nada (solo se mezclan las listas cuando en un paso se
+# liberó más de un recurso). Ver benchmarks/bench_recursos.py.
+#
+# Lo que ya tiene cada proceso se guarda en proceso.mascara_obtenida; con
+# adquisición parcial un proceso bloqueado puede tener una parte de sus
+# recursos. Si se le da un grafo de espera (interbloqueos.GrafoEspera), el
+# gestor lo mantiene al día en cada asignación, liberación y bloqueo.
+
+import heapq
+
+
+class GestorRecursos:
+    def __init__(self, recursos=(), grafo=None):
+        self.grafo = grafo
+        self.bits = {}  # nombre del recurso -> posición de su bit
+        self.nombres = []  # posición del bit -> nombre del recurso
+        for recurso in recursos:
+            self.indice(recurso)
+        self.reiniciar()
+
+    def reiniciar(self):
+        """Libera todos los recursos y vacía el índice de espera."""
+        self.ocupados = 0
+        # Recursos liberados desde la última llamada a despertar()
+        self.liberados = 0
+        # Para los preeminentes (0) y el resto (1): posición del bit ->
+        # procesos registrados en ese recurso (dict usado como conjunto
+        # ordenado, en orden de bloqueo)
+        self.esperando = ({}, {})
+        # Proceso registrado -> su turno (orden en que se bloqueó)
+        self.turnos = {}
+        self.siguiente_turno = 0
+        # Proceso bloqueado -> (máscara, nombres) de lo que le faltaba la
+        # última vez que se calculó
+        self.faltan = {}
+        if self.grafo is not None:
+            self.grafo.reiniciar()
+
+    def indice(self, recurso):
+        # Los recursos desconocidos se agregan la primera vez que se usan,
+        # igual que hacía el dict de recursos disponibles
+        indice = self.bits.get(recurso)
+        if indice is None:
+            indice = len(self.nombres)
+            self.bits[recurso] = indice
+            self.nombres.append(recurso)
+        return indice
+
+    def mascara(self, proceso):
+        mascara = proceso.mascara_recursos
+        if mascara is None:
+            mascara = 0
+            for recurso in proceso.recursos_requeridos:
+                mascara |= 1 << self.indice(recurso)
+            proceso.mascara_recursos = mascara
+        return mascara
+
+    def nombres_de(self, mascara):
+        nombres = []
+        while mascara:
+            bit = mascara & -mascara
+            nombres.append(self.nombres[bit.bit_length() - 1])
+            mascara ^= bit
+        return nombres
+
+    def pendientes(self, proceso):
+        """Máscara de los recursos que el proceso pidió y todavía no tiene."""
+        mascara = proceso.mascara_recursos
+        if mascara is None:
+            mascara = self.mascara(proceso)
+        return mascara & ~proceso.mascara_obtenida
+
+    def disponibles(self, proceso):
+        return self.pendientes(proceso) & self.ocupados == 0
+
+    def filtrar(self, proceso, mascara):
+        # Recursos de `mascara` en el orden en que el proceso los pidió
+        bits = self.bits
+        return [r for r in proceso.recursos_requeridos if mascara >> bits[r] & 1]
+
+    def faltantes(self, proceso):
+        faltan = self.pendientes(proceso) & self.ocupados
+        if not faltan:
+            return []
+        # Un candidato que sigue bloqueado suele esperar lo mismo que antes:
+        # se reutiliza la lista de la última vez
+        anterior = self.faltan.get(proceso)
+        if anterior is not None and anterior[0] == faltan:
+            return anterior[1]
+        nombres = self.filtrar(proceso, faltan)
+        self.faltan[proceso] = (faltan, nombres)
+        return nombres
+
+    def asignar(self, proceso, mascara=None):
+        """Asigna al proceso los recursos de `mascara` (por defecto todos los que le faltan)."""
+        if mascara is None:
+            mascara = self.pendientes(proceso)
+        self.ocupados |= mascara
+        proceso.mascara_obtenida |= mascara
+        if self.grafo is not None:
+            self.grafo.tomar(proceso, mascara)
+
+    def liberar(self, proceso):
+        """Libera todos los recursos que tiene el proceso."""
+        mascara = proceso.mascara_obtenida
+        proceso.mascara_obtenida = 0
+        self.liberados |= mascara & self.ocupados
+        self.ocupados &= ~mascara
+        if self.grafo is not None:
+            self.grafo.soltar(mascara)
+
+    def esperar(self, proceso):
+        """
+        Registra un proceso bloqueado en el índice de los recursos que pidió
+        (si no lo estaba ya) y actualiza el grafo de espera.
+        """
+        if self.grafo is not None:
+            self.grafo.esperar(proceso, self.pendientes(proceso))
+        if proceso in self.turnos:
+            return
+        self.turnos[proceso] = self.siguiente_turno
+        self.siguiente_turno += 1
+        # Se registra en todos los recursos que pidió, no solo en los que le
+        # faltan ahora: los que tiene o están libres pueden faltarle más
+        # adelante (por ejemplo, si se lo elige como víctima de un
+        # interbloqueo) y así nunca hay que insertarlo fuera de orden
+        esperando = self.esperando[not proceso.preeminencia]
+        mascara = self.mascara(proceso)
+        while mascara:
+            bit = mascara & -mascara
+            mascara ^= bit
+            indice = bit.bit_length() - 1
+            procesos = esperando.get(indice)
+            if procesos is None:
+                esperando[indice] = {proceso: None}
+            else:
+                procesos[proceso] = None
+
+    def dejar_de_esperar(self, proceso):
+        """Quita del índice de espera a un proceso que dejó de estar bloqueado."""
+        if self.grafo is not None:
+            self.grafo.dejar_de_esperar(proceso)
+        self.faltan.pop(proceso, None)
+        if self.turnos.pop(proceso, None) is None:
+            return
+        esperando = self.esperando[not proceso.preeminencia]
+        mascara = proceso.mascara_recursos
+        while mascara:
+            bit = mascara & -mascara
+            mascara ^= bit
+            indice = bit.bit_length() - 1
+            procesos = esperando[indice]
+            del procesos[proceso]
+            if not procesos:
+                del esperando[indice]
+
+    def despertar(self, otros=()):
+        """
+        Devuelve los procesos registrados en algún recurso liberado desde la
+        última llamada, más los de `otros` (procesos registrados que se deben
+        volver a revisar aunque no esperen esos recursos), sin repetidos:
+        primero los preeminentes y luego el resto, cada grupo en el orden en
+        que se bloquearon. El costo depende de cuántos procesos esperaban los
+        recursos liberados, no del total de bloqueados.
+        """
+        liberados = self.liberados
+        self.liberados = 0
+        if not liberados and not otros:
+            return []
+        indices = []
+        while liberados:
+            bit = liberados & -liberados
+            liberados ^= bit
+            indices.append(bit.bit_length() - 1)
+        turno = self.turnos.__getitem__
+        candidatos = []
+        for nivel, esperando in enumerate(self.esperando):
+            listas = [esperando[indice] for indice in indices if indice in esperando]
+            extra = [p for p in otros if p.preeminencia != bool(nivel) and p in self.turnos]
+            if extra:
+                listas.append(sorted(extra, key=turno))
+            if len(listas) == 1:
+                candidatos.extend(listas[0])
+            elif listas:
+                # Cada lista está en orden de bloqueo; un proceso que está en
+                # varias aparece seguido en la mezcla
+                anterior = None
+                for proceso in heapq.merge(*listas, key=turno):
+                    if proceso is not anterior:
+                        candidatos.append(proceso)
+                        anterior = proceso
+        return candidatos
+
+    def como_dict(self):
+        """Recurso -> True si está libre (formato del antiguo recursos_disponibles_dict)."""
+        return {nombre: not (self.ocupados >> indice & 1) for nombre, indice in self.bits.items()}
@@ -0,0 +1,202 @@
+"""
+Detección y prevención de interbloqueos sobre los recursos del planificador.
+
+Con adquisición parcial (ver MotorSimulacion) un proceso bloqueado conserva
+los recursos que ya obtuvo mientras espera los demás, y puede formarse un
+ciclo de espera. Cada recurso tiene una sola instancia, así que el grafo de
+espera (proceso -> proceso que tiene el recurso que espera) basta para
+detectarlos: hay interbloqueo si y solo si hay un ciclo.
+
+GrafoEspera se actualiza en cada asignación, liberación y bloqueo. Un ciclo
+nuevo tiene que pasar por una arista nueva, así que solo se busca a partir de
+los procesos cuyas aristas cambiaron, no en todo el grafo.
+
+Modos (MotorSimulacion(interbloqueos=...)):
+    'detectar'  busca ciclos en el mismo paso en que se forman y los rompe
+                quitándole sus recursos a una víctima.
+    'evitar'    algoritmo del banquero: una asignación parcial solo se hace si
+                el estado resultante es seguro, de modo que no se forman ciclos.
+"""
+
+MODOS_INTERBLOQUEO = ('detectar', 'evitar')
+
+# Cada cuántos pasos (los múltiplos de este número) revisaría el grafo un
+# detector periódico, que es la referencia para medir los pasos que se ahorra
+# la detección incremental
+PERIODO_DETECCION = 10
+
+
+class EstadisticasInterbloqueos:
+    def __init__(self):
+        self.detectados = 0
+        # Procesos a los que se les quitaron sus recursos para romper un ciclo
+        self.victimas = 0
+        # Pasos entre la detección de cada ciclo y la primera revisión de un
+        # detector periódico posterior a que se formó (el paso de su arista
+        # más nueva, ver GrafoEspera.formacion): lo que sus procesos habrían
+        # seguido bloqueados con ese detector
+        self.ticks_ahorrados = 0
+        self.procesos_ticks_ahorrados = 0
+        # Asignaciones parciales rechazadas por el algoritmo del banquero
+        self.denegaciones = 0
+
+    def como_dict(self):
+        return {
+            'detectados': self.detectados,
+            'victimas': self.victimas,
+            'ticks_ahorrados': self.ticks_ahorrados,
+            'procesos_ticks_ahorrados': self.procesos_ticks_ahorrados,
+            'denegaciones': self.denegaciones,
+        }
+
+
+class GrafoEspera:
+    """
+    Grafo de espera incremental. No guarda las aristas: las deduce de quién
+    tiene cada recurso (`tenedor`) y de qué recursos espera cada proceso
+    bloqueado (`espera`), que son los datos que cambian con cada operación.
+    """
+
+    def __init__(self):
+        self.reiniciar()
+
+    def reiniciar(self):
+        # Paso actual de la simulación (lo fija el motor), para fechar las aristas
+        self.tick = 0
+        self.tenedor = {}  # posición del bit -> proceso que tiene el recurso
+        self.tomado = {}  # posición del bit -> paso en que lo tomó su tenedor
+        self.espera = {}  # proceso bloqueado -> máscara de los recursos que le faltan
+        # Proceso bloqueado -> {posición del bit: paso desde el que lo espera}
+        self.desde = {}
+        # Procesos desde los que hay que buscar un ciclo (dict usado como
+        # conjunto ordenado)
+        self.revisar = {}
+
+    def tomar(self, proceso, mascara):
+        tenedor = self.tenedor
+        tomado = self.tomado
+        while mascara:
+            bit = mascara & -mascara
+            mascara ^= bit
+            indice = bit.bit_length() - 1
+            tenedor[indice] = proceso
+            tomado[indice] = self.tick
+        # Los que esperan estos recursos ahora apuntan a `proceso`: un ciclo
+        # por esas aristas tiene que volver a él, y solo si él también espera
+        if proceso in self.espera:
+            self.revisar[proceso] = None
+
+    def soltar(self, mascara):
+        tenedor = self.tenedor
+        while mascara:
+            bit = mascara & -mascara
+            mascara ^= bit
+            indice = bit.bit_length() - 1
+            tenedor.pop(indice, None)
+            self.tomado.pop(indice, None)
+
+    def esperar(self, proceso, mascara):
+        # Si espera lo mismo que antes no tiene aristas nuevas (los cambios de
+        # dueño de esos recursos ya los marca tomar)
+        anterior = self.espera.get(proceso)
+        if anterior != mascara:
+            self.espera[proceso] = mascara
+            self.revisar[proceso] = None
+            # Los recursos que ya esperaba conservan su fecha
+            desde = self.desde.get(proceso, {})
+            nuevo = {}
+            resto = mascara
+            while resto:
+                bit = resto & -resto
+                resto ^= bit
+                indice = bit.bit_length() - 1
+                nuevo[indice] = desde.get(indice, self.tick)
+            self.desde[proceso] = nuevo
+
+    def dejar_de_esperar(self, proceso):
+        self.espera.pop(proceso, None)
+        self.desde.pop(proceso, None)
+        self.revisar.pop(proceso, None)
+
+    def sucesores(self, proceso):
+        """Procesos que tienen algún recurso que `proceso` espera."""
+        resto = self.espera.get(proceso, 0)
+        tenedor = self.tenedor
+        while resto:
+            bit = resto & -resto
+            resto ^= bit
+            otro = tenedor.get(bit.bit_length() - 1)
+            if otro is not None and otro is not proceso:
+                yield otro
+
+    def ciclo_desde(self, inicio):
+        """Un ciclo que pasa por `inicio` (lista de procesos) o None."""
+        camino = [inicio]
+        pila = [self.sucesores(inicio)]
+        visitados = {inicio}
+        while pila:
+            siguiente = next(pila[-1], None)
+            if siguiente is None:
+                pila.pop()
+                camino.pop()
+            elif siguiente is inicio:
+                return camino
+            elif siguiente not in visitados and siguiente in self.espera:
+                visitados.add(siguiente)
+                camino.append(siguiente)
+                pila.append(self.sucesores(siguiente))
+        return None
+
+    def buscar_ciclo(self):
+        """Busca un ciclo desde los procesos cuyas aristas cambiaron."""
+        while self.revisar:
+            proceso = next(iter(self.revisar))
+            del self.revisar[proceso]
+            ciclo = self.ciclo_desde(proceso)
+            if ciclo is not None:
+                return ciclo
+        return None
+
+    def formacion(self, ciclo):
+        """
+        Paso en que se formó un ciclo de ciclo_desde(): el de su arista más
+        nueva. La arista de un proceso al siguiente existe desde que el
+        primero espera un recurso y el segundo lo tiene (si son varios
+        recursos, cuenta el más antiguo).
+        """
+        formado = 0
+        for posicion, proceso in enumerate(ciclo):
+            siguiente = ciclo[(posicion + 1) % len(ciclo)]
+            arista = None
+            for indice, espera_desde in self.desde[proceso].items():
+                if self.tenedor.get(indice) is siguiente:
+                    desde = max(espera_desde, self.tomado[indice])
+                    arista = desde if arista is None else min(arista, desde)
+            formado = max(formado, arista)
+        return formado
+
+    def retenedores(self):
+        """Procesos que tienen al menos un recurso."""
+        return dict.fromkeys(self.tenedor.values())
+
+
+def estado_seguro(ocupados, procesos):
+    """
+    Algoritmo del banquero con recursos de una instancia. `procesos` son
+    pares (máscara que le falta, máscara que tiene) de los procesos que tienen
+    algún recurso. El estado es seguro si hay un orden en que cada uno puede
+    obtener lo que le falta con los recursos libres y, al terminar, liberar
+    todo lo suyo.
+    """
+    pendientes = list(procesos)
+    while pendientes:
+        quedan = []
+        for falta, tiene in pendientes:
+            if falta & ocupados:
+                quedan.append((falta, tiene))
+            else:
+                ocupados &= ~tiene
+        if len(quedan) == len(pendientes):
+            return False
+        pendientes = quedan
+    return True
@@ -1,4 +1,15 @@
+import bisect
+import colorsys
+import functools
+import math
 import random
+import threading
+import time
+import uuid
+import zlib
+from array import array
+
+from metricas import METRICAS
 
 # Constantes
 RAM_ROWS, RAM_COLS = 5, 5
@@ -6,260 +17,1076 @@ ROM_ROWS, ROM_COLS = 5, 10  # Tamaño de la ROM es 5x10
 FRAME_SIZE = 2.5
 MAX_PROCESS_SIZE = 65
 
-# Lista predeterminada de colores
+# Si es True los marcos libres se eligen al azar (comportamiento original);
+# si es False se asignan en orden, empezando por la esquina superior izquierda
+RANDOM_PLACEMENT = True
+
+# Lista predeterminada de colores. Cuando se acaban, cada proceso recibe un
+# color derivado de su nombre (color_derivado)
 PREDEFINED_COLORS = ['#5dade2', '#76d7c4', '#e74c3c', '#0e03f5', '#1df503', '#f4d03f', '#e90075', '#b400e9']
 available_colors = PREDEFINED_COLORS.copy()
 
-# Inicializa la matriz de RAM y ROM
-ram = []
-rom = []
 
-def init_memory():
-    global ram, rom, processes, available_colors
-    ram = []
+def color_derivado(name):
+    """
+    Color fijo para el proceso `name`, derivado del crc32 de su nombre (que,
+    a diferencia de hash(), no cambia entre ejecuciones). El tono recorre
+    todo el círculo; la luminosidad es baja para que se lea el texto blanco.
+    """
+    h = zlib.crc32(name.encode('utf-8'))
+    tono = (h % 360) / 360
+    luminosidad = 0.35 + (h >> 9) % 16 / 100
+    saturacion = 0.55 + (h >> 13) % 30 / 100
+    r, g, b = colorsys.hls_to_rgb(tono, luminosidad, saturacion)
+    return f'#{round(r * 255):02x}{round(g * 255):02x}{round(b * 255):02x}'
+
+# Valores especiales de la tabla de dueños de los marcos
+MARCO_LIBRE = -1
+MARCO_SO = -2
+
+# Formas de elegir los marcos de un proceso: 'paginada' toma marcos sueltos
+# (al azar o en orden según RANDOM_PLACEMENT); las de ajuste asignan bloques
+# contiguos con particiones variables y la estrategia indicada; 'buddy' usa
+# bloques de 2^k marcos y 'slab' reutiliza bloques del mismo número de marcos
+ASIGNACIONES = ('paginada', 'primer_ajuste', 'mejor_ajuste', 'peor_ajuste', 'siguiente_ajuste',
+                'buddy', 'slab')
+
+# Marcos que se intentan reservar de una vez para un slab
+MARCOS_POR_SLAB = 32
+
+# Cambios de marcos que se conservan en el registro de cada memoria; quien
+# pida los cambios desde una versión más antigua recibe la memoria completa
+MAX_REGISTRO_CAMBIOS = 10000
+
+class MarcosLibres:
+    """
+    Índice de marcos libres de una región de memoria (RAM o ROM).
+
+    Los marcos se identifican por su número global k; la región ocupa los
+    números desde `inicio` hasta `inicio + rows * cols - 1`, y dentro de ella
+    k - inicio = i * cols + j. El pool guarda los marcos libres y
+    `posicion[k - inicio]` indica dónde está k dentro del pool (-1 si está
+    ocupado), de modo que tomar y liberar un marco es O(1).
+    """
+
+    def __init__(self, rows, cols, start_row=0, inicio=0):
+        self.total = rows * cols
+        self.inicio = inicio
+        self.reiniciar(start_row * cols)
+
+    def reiniciar(self, primero):
+        """Deja libres solo los marcos desde la posición `primero` de la región."""
+        total, inicio = self.total, self.inicio
+        self.posicion = array('i', [-1]) * total
+        # Se guarda en orden inverso para que el modo secuencial saque primero
+        # los marcos de la esquina superior izquierda
+        self.pool = array('i', range(inicio + total - 1, inicio + primero - 1, -1))
+        self.posicion[primero:] = array('i', range(total - primero - 1, -1, -1))
+
+    def fragmentacion_externa(self):
+        # Cualquier marco libre sirve para cualquier página
+        return 0.0
+
+    def marcos_sin_uso(self):
+        # Marcos reservados que ningún proceso usa
+        return 0
+
+    def __len__(self):
+        return len(self.pool)
+
+    def _quitar(self, idx):
+        # Intercambia el marco con el último del pool y lo saca
+        pool = self.pool
+        k = pool[idx]
+        ultimo = pool.pop()
+        if ultimo != k:
+            pool[idx] = ultimo
+            self.posicion[ultimo - self.inicio] = idx
+        self.posicion[k - self.inicio] = -1
+        return k
+
+    def tomar(self, frames_needed, aleatorio=True, rng=random):
+        """Reserva `frames_needed` marcos y devuelve sus números."""
+        if frames_needed > len(self.pool):
+            return []
+        marcos = []
+        for _ in range(frames_needed):
+            idx = rng.randrange(len(self.pool)) if aleatorio else len(self.pool) - 1
+            marcos.append(self._quitar(idx))
+        return marcos
+
+    def liberar(self, k):
+        if self.posicion[k - self.inicio] == -1:
+            self.posicion[k - self.inicio] = len(self.pool)
+            self.pool.append(k)
+
+class HuecosLibres:
+    """
+    Índice de huecos (bloques de marcos libres contiguos) de una región, para
+    la asignación contigua. Tiene la misma interfaz que MarcosLibres, pero
+    tomar(n) devuelve n marcos consecutivos.
+
+    Un árbol de segmentos sobre las posiciones guarda el tamaño del hueco que
+    empieza en cada una (0 si ninguno) y el máximo de cada rango, con lo que
+    el primer hueco de al menos n marcos desde una posición se encuentra en
+    O(log n). Los huecos ordenados por tamaño están en una lista ordenada,
+    para el mejor y el peor ajuste.
+    """
+
+    def __init__(self, rows, cols, start_row=0, inicio=0, ajuste='primer_ajuste'):
+        self.total = rows * cols
+        self.inicio = inicio
+        self.ajuste = ajuste
+        self.hojas = 1
+        while self.hojas < self.total:
+            self.hojas *= 2
+        self.reiniciar(start_row * cols)
+
+    def reiniciar(self, primero):
+        """Deja libres solo los marcos desde la posición `primero` de la región."""
+        self.arbol = array('i', [0]) * (2 * self.hojas)
+        # ultimo[p] es el inicio del hueco que termina en p (-1 si ninguno)
+        self.ultimo = array('i', [-1]) * self.total
+        self.ocupado = bytearray([1]) * self.total
+        self.por_tamaño = []
+        self.libres = 0
+        # Donde sigue buscando el siguiente ajuste
+        self.cursor = 0
+        if primero < self.total:
+            self.ocupado[primero:] = bytearray(self.total - primero)
+            self._agregar_hueco(primero, self.total - primero)
+
+    def __len__(self):
+        return self.libres
+
+    def _fijar(self, posicion, tamaño):
+        nodo = self.hojas + posicion
+        arbol = self.arbol
+        arbol[nodo] = tamaño
+        # Se sube hasta que el máximo de un nodo no cambie
+        while nodo > 1:
+            izquierdo = arbol[nodo & ~1]
+            derecho = arbol[nodo | 1]
+            nodo >>= 1
+            maximo = izquierdo if izquierdo > derecho else derecho
+            if arbol[nodo] == maximo:
+                break
+            arbol[nodo] = maximo
+
+    def _agregar_hueco(self, posicion, tamaño):
+        self._fijar(posicion, tamaño)
+        self.ultimo[posicion + tamaño - 1] = posicion
+        bisect.insort(self.por_tamaño, (tamaño, posicion))
+        self.libres += tamaño
+
+    def _quitar_hueco(self, posicion):
+        tamaño = self.arbol[self.hojas + posicion]
+        self._fijar(posicion, 0)
+        self.ultimo[posicion + tamaño - 1] = -1
+        del self.por_tamaño[bisect.bisect_left(self.por_tamaño, (tamaño, posicion))]
+        self.libres -= tamaño
+        return tamaño
+
+    def _primero_desde(self, n, desde):
+        # Menor posición >= desde donde empieza un hueco de al menos n marcos
+        arbol = self.arbol
+
+        def buscar(nodo, izquierda, derecha):
+            if derecha <= desde or arbol[nodo] < n:
+                return -1
+            if derecha - izquierda == 1:
+                return izquierda
+            medio = (izquierda + derecha) // 2
+            posicion = buscar(2 * nodo, izquierda, medio)
+            return posicion if posicion != -1 else buscar(2 * nodo + 1, medio, derecha)
+
+        return buscar(1, 0, self.hojas)
+
+    def _elegir(self, n):
+        if self.ajuste == 'mejor_ajuste':
+            idx = bisect.bisect_left(self.por_tamaño, (n, -1))
+            return self.por_tamaño[idx][1] if idx < len(self.por_tamaño) else -1
+        if self.ajuste == 'peor_ajuste':
+            if self.por_tamaño and self.por_tamaño[-1][0] >= n:
+                return self.por_tamaño[-1][1]
+            return -1
+        if self.ajuste == 'siguiente_ajuste':
+            posicion = self._primero_desde(n, self.cursor)
+            return posicion if posicion != -1 else self._primero_desde(n, 0)
+        return self._primero_desde(n, 0)
+
+    def tomar(self, frames_needed, aleatorio=True, rng=random):
+        """Reserva `frames_needed` marcos consecutivos; [] si no hay un hueco suficiente."""
+        posicion = self._elegir(frames_needed)
+        if posicion == -1:
+            return []
+        tamaño = self._quitar_hueco(posicion)
+        if tamaño > frames_needed:
+            self._agregar_hueco(posicion + frames_needed, tamaño - frames_needed)
+        self.ocupado[posicion:posicion + frames_needed] = bytearray([1]) * frames_needed
+        self.cursor = posicion + frames_needed
+        return list(range(self.inicio + posicion, self.inicio + posicion + frames_needed))
+
+    def liberar(self, k):
+        posicion = k - self.inicio
+        if not self.ocupado[posicion]:
+            return
+        self.ocupado[posicion] = 0
+        tamaño = 1
+        # Unir con los huecos vecinos
+        if posicion > 0 and self.ultimo[posicion - 1] != -1:
+            izquierdo = self.ultimo[posicion - 1]
+            tamaño += self._quitar_hueco(izquierdo)
+            posicion = izquierdo
+        derecho = posicion + tamaño
+        if derecho < self.total and self.arbol[self.hojas + derecho]:
+            tamaño += self._quitar_hueco(derecho)
+        self._agregar_hueco(posicion, tamaño)
+
+    def mayor_hueco(self):
+        return self.arbol[1]
+
+    def fragmentacion_externa(self):
+        """Fracción de la memoria libre que no está en el hueco más grande."""
+        return 1 - self.mayor_hueco() / self.libres if self.libres else 0.0
+
+    def marcos_sin_uso(self):
+        return 0
+
+
+class BloquesBuddy:
+    """
+    Índice de marcos libres con el sistema buddy. Misma interfaz que
+    MarcosLibres.
+
+    La memoria libre se divide en bloques de 2^k marcos alineados a su tamaño;
+    `bloques[k]` es la lista ordenada de los bloques libres de orden k.
+    tomar(n) parte el menor bloque suficiente hasta llegar a 2^k >= n y
+    liberar une un bloque con su buddy (el de la posición `p ^ 2^k`) mientras
+    también esté libre, ambas cosas en O(log n). Los marcos del bloque que el
+    proceso no usa quedan reservados (fragmentación interna) hasta que se
+    libera el bloque entero.
+    """
+
+    def __init__(self, rows, cols, start_row=0, inicio=0):
+        self.total = rows * cols
+        self.inicio = inicio
+        self.max_orden = self.total.bit_length()
+        self.reiniciar(start_row * cols)
+
+    def reiniciar(self, primero):
+        """Deja libres solo los marcos desde la posición `primero` de la región."""
+        total = self.total
+        self.bloques = [[] for _ in range(self.max_orden + 1)]
+        # orden_libre[p] es el orden del bloque libre que empieza en p (-1 si ninguno)
+        self.orden_libre = array('b', [-1]) * total
+        # Bloque reservado al que pertenece cada marco en uso (-1 si ninguno),
+        # y para cada bloque reservado su orden y cuántos de sus marcos se usan
+        self.bloque_de = array('i', [-1]) * total
+        self.orden_reservado = array('b', [0]) * total
+        self.en_uso = array('i', [0]) * total
+        self.libres = 0
+        self.sin_uso = 0
+        # Los marcos anteriores a `primero` quedan como bloques de un marco en uso
+        self.bloque_de[:primero] = array('i', range(primero))
+        self.en_uso[:primero] = array('i', [1]) * primero
+        # El resto se divide en los bloques alineados más grandes posibles
+        posicion = primero
+        while posicion < total:
+            orden = (posicion & -posicion).bit_length() - 1 if posicion else self.max_orden
+            while posicion + (1 << orden) > total:
+                orden -= 1
+            self._agregar_bloque(posicion, orden)
+            posicion += 1 << orden
+
+    def __len__(self):
+        return self.libres
+
+    def _agregar_bloque(self, posicion, orden):
+        bisect.insort(self.bloques[orden], posicion)
+        self.orden_libre[posicion] = orden
+        self.libres += 1 << orden
+
+    def _quitar_bloque(self, posicion, orden):
+        lista = self.bloques[orden]
+        del lista[bisect.bisect_left(lista, posicion)]
+        self.orden_libre[posicion] = -1
+        self.libres -= 1 << orden
+
+    def tomar(self, frames_needed, aleatorio=True, rng=random):
+        """Reserva un bloque de 2^k >= frames_needed marcos y devuelve los primeros frames_needed; [] si no hay."""
+        orden = (frames_needed - 1).bit_length()
+        disponible = orden
+        while disponible <= self.max_orden and not self.bloques[disponible]:
+            disponible += 1
+        if disponible > self.max_orden:
+            return []
+        # Se usa el bloque de menor dirección
+        posicion = self.bloques[disponible][0]
+        self._quitar_bloque(posicion, disponible)
+        # Partir el bloque: la mitad derecha queda libre en cada paso
+        while disponible > orden:
+            disponible -= 1
+            self._agregar_bloque(posicion + (1 << disponible), disponible)
+        self.bloque_de[posicion:posicion + frames_needed] = array('i', [posicion]) * frames_needed
+        self.orden_reservado[posicion] = orden
+        self.en_uso[posicion] = frames_needed
+        self.sin_uso += (1 << orden) - frames_needed
+        return list(range(self.inicio + posicion, self.inicio + posicion + frames_needed))
+
+    def liberar(self, k):
+        posicion = k - self.inicio
+        bloque = self.bloque_de[posicion]
+        if bloque == -1:
+            return
+        self.bloque_de[posicion] = -1
+        self.en_uso[bloque] -= 1
+        orden = self.orden_reservado[bloque]
+        if self.en_uso[bloque]:
+            self.sin_uso += 1
+            return
+        self.sin_uso -= (1 << orden) - 1
+        # Unir con el buddy mientras esté libre y sea del mismo orden
+        while orden < self.max_orden:
+            buddy = bloque ^ (1 << orden)
+            if buddy + (1 << orden) > self.total or self.orden_libre[buddy] != orden:
+                break
+            self._quitar_bloque(buddy, orden)
+            bloque = min(bloque, buddy)
+            orden += 1
+        self._agregar_bloque(bloque, orden)
+
+    def mayor_hueco(self):
+        for orden in range(self.max_orden, -1, -1):
+            if self.bloques[orden]:
+                return 1 << orden
+        return 0
+
+    def fragmentacion_externa(self):
+        """Fracción de la memoria libre que no está en el bloque libre más grande."""
+        return 1 - self.mayor_hueco() / self.libres if self.libres else 0.0
+
+    def marcos_sin_uso(self):
+        return self.sin_uso
+
+
+class Slab:
+    __slots__ = ('inicio', 'marcos', 'objetos', 'libres')
+
+    def __init__(self, inicio, marcos, objetos):
+        self.inicio = inicio
+        self.marcos = marcos  # Marcos de cada objeto
+        self.objetos = objetos
+        # Posiciones de los objetos libres del slab
+        self.libres = list(range(inicio + (objetos - 1) * marcos, inicio - 1, -marcos))
+
+
+class CacheSlab:
+    """
+    Índice de marcos libres con caches de slabs. Misma interfaz que
+    MarcosLibres.
+
+    Como los tamaños de proceso están acotados por MAX_PROCESS_SIZE y se
+    redondean a marcos, hay pocas clases de tamaño (número de marcos). Para
+    cada clase se reservan slabs: bloques contiguos de hasta MARCOS_POR_SLAB
+    marcos tomados de un índice de huecos (primer ajuste), partidos en
+    objetos del tamaño de la clase. tomar(n) entrega un objeto libre de un
+    slab de la clase n en O(1), y al liberar todos sus marcos el objeto vuelve
+    al slab. Cada clase conserva a lo sumo un slab vacío; los demás se
+    devuelven al índice de huecos, y si este no tiene espacio se recuperan
+    primero los slabs vacíos de todas las clases.
+    """
+
+    def __init__(self, rows, cols, start_row=0, inicio=0):
+        self.total = rows * cols
+        self.inicio = inicio
+        self.huecos = HuecosLibres(rows, cols, inicio=inicio)
+        self.reiniciar(start_row * cols)
+
+    def reiniciar(self, primero):
+        """Deja libres solo los marcos desde la posición `primero` de la región."""
+        total = self.total
+        self.huecos.reiniciar(primero)
+        # Slabs por posición de inicio, y por clase los que tienen objetos libres
+        self.slabs = {}
+        self.caches = {}
+        # Slabs sin objetos en uso, que se pueden devolver si falta espacio
+        self.vacios = set()
+        # Objeto al que pertenece cada marco en uso (-1 si ninguno), y para
+        # cada objeto cuántos de sus marcos se usan y el slab al que pertenece
+        self.objeto_de = array('i', [-1]) * total
+        self.en_uso = array('i', [0]) * total
+        self.slab_de = array('i', [0]) * total
+        # Marcos de los objetos libres de los slabs
+        self.en_objetos_libres = 0
+        self.sin_uso = 0
+        # Los marcos anteriores a `primero` quedan en uso fuera de los slabs
+        # (slab_de = -1); al liberarlos vuelven directamente a los huecos
+        self.objeto_de[:primero] = array('i', range(primero))
+        self.en_uso[:primero] = array('i', [1]) * primero
+        self.slab_de[:primero] = array('i', [-1]) * primero
+
+    def __len__(self):
+        return len(self.huecos) + self.en_objetos_libres
+
+    def _crear_slab(self, marcos):
+        objetos = max(1, MARCOS_POR_SLAB // marcos)
+        while objetos:
+            frames = self.huecos.tomar(marcos * objetos)
+            if frames:
+                slab = Slab(frames[0] - self.inicio, marcos, objetos)
+                self.slabs[slab.inicio] = slab
+                self.en_objetos_libres += marcos * objetos
+                return slab
+            objetos //= 2
+        return None
+
+    def _devolver_slab(self, slab):
+        del self.slabs[slab.inicio]
+        self.vacios.discard(slab.inicio)
+        cache = self.caches.get(slab.marcos)
+        if cache is not None:
+            cache.pop(slab.inicio, None)
+        self.en_objetos_libres -= slab.marcos * slab.objetos
+        for posicion in range(slab.inicio, slab.inicio + slab.marcos * slab.objetos):
+            self.huecos.liberar(self.inicio + posicion)
 
-    # Primera fila ocupada por el S.O.
-    so_row = [{'process': 'S.O.', 'frame_id': 'S.O.-0'} for _ in range(RAM_COLS)]
-    ram.append(so_row)
+    def _recuperar(self):
+        # Devuelve al índice de huecos los slabs vacíos de todas las clases
+        for inicio in list(self.vacios):
+            self._devolver_slab(self.slabs[inicio])
 
-    # Resto de las filas inicializadas como libres
-    for _ in range(RAM_ROWS - 1):
-        row = [{'process': None, 'frame_id': None} for _ in range(RAM_COLS)]
-        ram.append(row)
+    def tomar(self, frames_needed, aleatorio=True, rng=random):
+        """Reserva un objeto de `frames_needed` marcos contiguos; [] si no hay espacio."""
+        cache = self.caches.setdefault(frames_needed, {})
+        if cache:
+            slab = next(iter(cache.values()))
+        else:
+            slab = self._crear_slab(frames_needed)
+            if slab is None:
+                self._recuperar()
+                slab = self._crear_slab(frames_needed)
+                if slab is None:
+                    return []
+            cache[slab.inicio] = slab
+        objeto = slab.libres.pop()
+        self.vacios.discard(slab.inicio)
+        if not slab.libres:
+            del cache[slab.inicio]
+        self.en_objetos_libres -= frames_needed
+        self.objeto_de[objeto:objeto + frames_needed] = array('i', [objeto]) * frames_needed
+        self.en_uso[objeto] = frames_needed
+        self.slab_de[objeto] = slab.inicio
+        return list(range(self.inicio + objeto, self.inicio + objeto + frames_needed))
 
-    # Inicializa la matriz de ROM
-    rom = [[{'process': None, 'frame_id': None} for _ in range(ROM_COLS)] for _ in range(ROM_ROWS)]
+    def liberar(self, k):
+        posicion = k - self.inicio
+        objeto = self.objeto_de[posicion]
+        if objeto == -1:
+            return
+        self.objeto_de[posicion] = -1
+        self.en_uso[objeto] -= 1
+        if self.slab_de[objeto] == -1:
+            self.huecos.liberar(k)
+            return
+        slab = self.slabs[self.slab_de[objeto]]
+        if self.en_uso[objeto]:
+            self.sin_uso += 1
+            return
+        self.sin_uso -= slab.marcos - 1
+        # El objeto vuelve a su slab
+        slab.libres.append(objeto)
+        self.en_objetos_libres += slab.marcos
+        cache = self.caches.setdefault(slab.marcos, {})
+        if len(slab.libres) == slab.objetos:
+            if len(cache) > (slab.inicio in cache):
+                # Ya hay otro slab con objetos libres en la clase
+                self._devolver_slab(slab)
+                return
+            self.vacios.add(slab.inicio)
+        cache[slab.inicio] = slab
 
-    # Vaciar la lista de procesos
-    processes.clear()
+    def mayor_hueco(self):
+        return self.huecos.mayor_hueco()
 
-    # Restaurar la lista de colores disponibles
-    available_colors = PREDEFINED_COLORS.copy()
+    def fragmentacion_externa(self):
+        """Fracción de la memoria libre (huecos y objetos libres) fuera del hueco más grande."""
+        libres = len(self)
+        return 1 - self.mayor_hueco() / libres if libres else 0.0
 
-# Lista para almacenar los procesos creados
-processes = []
+    def marcos_sin_uso(self):
+        return self.sin_uso
 
 class ProcesoMemoria:
-    def __init__(self, name, size, color):
+    __slots__ = ('name', 'size_initial', 'size', 'color', 'pid', 'paginas', 'paginas_ram', 'paginas_rom')
+
+    def __init__(self, name, size, color, pid=0):
         self.name = name
         self.size_initial = size  # Tamaño inicial del proceso
         self.size = size
         self.color = color
-        self.frames = []  # Lista de marcos asignados (RAM y ROM)
+        self.pid = pid  # Número con el que aparece en la tabla de dueños
+        # Tabla de páginas: paginas[n - 1] es el marco donde está la página n
+        # (en RAM si es menor que el número de marcos de RAM, si no en ROM)
+        self.paginas = array('i')
+        # Números de las páginas que están en RAM y en ROM, ordenados
+        self.paginas_ram = []
+        self.paginas_rom = []
 
-def create_process_memory(name, size):
-    # Verifica si el nombre del proceso ya existe
-    if any(p.name == name for p in processes):
-        return False, 'Ya existe un proceso con ese nombre en memoria.'
+def _sincronizado(metodo):
+    # Ejecuta el método con el candado de la instancia tomado (y mide su
+    # tiempo si las métricas están activas)
+    nombre = metodo.__name__
 
-    # Selecciona un color aleatorio de los disponibles y lo remueve de la lista
-    color = random.choice(available_colors)
-    available_colors.remove(color)
+    @functools.wraps(metodo)
+    def envoltura(self, *args, **kwargs):
+        with self.lock:
+            if METRICAS.activo:
+                inicio = time.perf_counter()
+                try:
+                    return metodo(self, *args, **kwargs)
+                finally:
+                    METRICAS.sumar_tiempo(nombre, time.perf_counter() - inicio)
+            return metodo(self, *args, **kwargs)
+    return envoltura
 
-    # Crea una instancia del proceso
-    process = ProcesoMemoria(name, size, color)
 
-    total_frames_needed = int(size // FRAME_SIZE)
-    if size % FRAME_SIZE != 0:
-        total_frames_needed += 1  # Si hay residuo, necesitamos un marco extra
+class MemoryManager:
+    """
+    Estado de la memoria de una simulación: la tabla de marcos de RAM y ROM,
+    sus índices de marcos libres, la tabla de procesos y los colores
+    disponibles.
 
-    # Asignamos hasta 3 marcos en RAM
-    ram_frames_needed = min(3, total_frames_needed)
-    rom_frames_needed = total_frames_needed - ram_frames_needed
+    Los marcos de RAM se numeran de 0 a n_ram - 1 y los de ROM a continuación.
+    La tabla de marcos son dos arreglos de enteros: `duenio[k]` es el pid del
+    proceso dueño del marco k (MARCO_LIBRE o MARCO_SO si no tiene) y
+    `pagina[k]` el número de página que guarda. Los frame_id ("nombre-página")
+    solo se generan al dibujar la memoria (vista_ram y vista_rom).
 
-    ram_positions = get_free_frames(ram, ram_frames_needed, start_row=1)  # Empezamos desde la fila 1
-    rom_positions = get_free_frames(rom, rom_frames_needed)
+    Cada operación que modifica la memoria incrementa `version` y anota en un
+    registro los marcos y procesos que cambió, de modo que cambios_desde(v)
+    devuelve solo lo que cambió después de la versión v. Las versiones solo
+    valen para la misma `instancia` (un id que cambia con cada memoria nueva
+    y con cada init_memory).
 
-    if len(ram_positions) < ram_frames_needed or len(rom_positions) < rom_frames_needed:
-        return False, 'No hay suficiente espacio en memoria.'
+    Cada instancia es independiente, de modo que se pueden tener varias
+    simulaciones a la vez (por ejemplo en procesos distintos de un barrido de
+    parámetros, o una por sesión en la aplicación web). Las operaciones
+    públicas toman el candado `lock`, así que una instancia se puede usar desde
+    varios hilos. Los parámetros que no se indican toman el valor de las
+    constantes del módulo. `asignacion` es una de ASIGNACIONES. Con `semilla`
+    la instancia usa su propio random.Random, de modo que la simulación se
+    puede reproducir.
+    """
 
-    # Asignamos los marcos a RAM
-    for idx, (i, j) in enumerate(ram_positions, start=1):
-        frame_id = f"{name}-{idx}"
-        ram[i][j]['process'] = process
-        ram[i][j]['frame_id'] = frame_id
-        process.frames.append({'type': 'RAM', 'i': i, 'j': j, 'frame_id': frame_id})
+    def __init__(self, ram_rows=None, ram_cols=None, rom_rows=None, rom_cols=None,
+                 frame_size=None, max_ram_frames=3, colors=None, random_placement=None,
+                 asignacion='paginada', semilla=None):
+        if asignacion not in ASIGNACIONES:
+            raise ValueError(f'Asignación desconocida: {asignacion}')
+        self.ram_rows = RAM_ROWS if ram_rows is None else ram_rows
+        self.ram_cols = RAM_COLS if ram_cols is None else ram_cols
+        self.rom_rows = ROM_ROWS if rom_rows is None else rom_rows
+        self.rom_cols = ROM_COLS if rom_cols is None else rom_cols
+        self.n_ram = self.ram_rows * self.ram_cols
+        self.n_rom = self.rom_rows * self.rom_cols
+        self.frame_size = FRAME_SIZE if frame_size is None else frame_size
+        # Máximo de marcos de un proceso que se mantienen en RAM
+        self.max_ram_frames = max_ram_frames
+        self.colors = list(PREDEFINED_COLORS if colors is None else colors)
+        self.random_placement = RANDOM_PLACEMENT if random_placement is None else random_placement
+        self.asignacion = asignacion
+        # Generador de los colores y de la ubicación aleatoria de los marcos.
+        # Sin semilla se usa el generador global del módulo random.
+        self.rng = random.Random(semilla) if semilla is not None else random
+        self.processes = {}
+        self.lock = threading.RLock()
+        self.version = 0
+        self.init_memory()
 
-    # Asignamos los marcos a ROM
-    for idx, (i, j) in enumerate(rom_positions, start=ram_frames_needed + 1):
-        frame_id = f"{name}-{idx}"
-        rom[i][j]['process'] = process
-        rom[i][j]['frame_id'] = frame_id
-        process.frames.append({'type': 'ROM', 'i': i, 'j': j, 'frame_id': frame_id})
+    def __getstate__(self):
+        # El candado y el módulo random no se pueden serializar con pickle
+        estado = self.__dict__.copy()
+        del estado['lock']
+        if self.rng is random:
+            estado['rng'] = None
+        return estado
 
-    processes.append(process)
-    return True, 'Proceso creado exitosamente.'
+    def __setstate__(self, estado):
+        self.__dict__.update(estado)
+        self.lock = threading.RLock()
+        if self.rng is None:
+            self.rng = random
 
-def get_free_frames(memory, frames_needed, start_row=0):
-    if frames_needed == 0:
-        return []
-    free_positions = []
-    rows = len(memory)
-    cols = len(memory[0])
+    @_sincronizado
+    def init_memory(self):
+        total = self.n_ram + self.n_rom
+        # Todo cambia: quien venga de una versión anterior, o de otra memoria,
+        # recibe la memoria completa
+        self.instancia = uuid.uuid4().hex
+        self.version += 1
+        self.version_minima = self.version
+        self.registro_versiones = array('q')
+        self.registro_marcos = array('i')
+        self.procesos_cambiados = {}
+        self.duenio = array('i', [MARCO_LIBRE]) * total
+        self.pagina = array('i', [0]) * total
 
-    positions = [(i, j) for i in range(start_row, rows) for j in range(cols)]
-    random.shuffle(positions)
+        # Primera fila de la RAM ocupada por el S.O.
+        self.duenio[:self.ram_cols] = array('i', [MARCO_SO]) * self.ram_cols
 
-    for (i, j) in positions:
-        if memory[i][j]['process'] is None:
-            free_positions.append((i, j))
-            if len(free_positions) == frames_needed:
-                break
-    return free_positions
+        # La primera fila de la RAM queda fuera del índice porque es del S.O.
+        self.ram_free = self._crear_indice(self.ram_rows, self.ram_cols, start_row=1)
+        self.rom_free = self._crear_indice(self.rom_rows, self.rom_cols, inicio=self.n_ram)
 
-def delete_process_memory(name):
-    global processes
-    process_to_delete = None
-    for process in processes:
-        if process.name == name:
-            process_to_delete = process
-            break
-
-    if process_to_delete:
-        # Liberamos los marcos en RAM y ROM
-        for frame in process_to_delete.frames:
-            mem_type = frame['type']
-            i = frame['i']
-            j = frame['j']
-            if mem_type == 'RAM':
-                ram[i][j]['process'] = None
-                ram[i][j]['frame_id'] = None
+        # Vaciar la tabla de procesos, indexada por nombre. Los dict de Python
+        # conservan el orden de inserción, que es el que se usa al mostrarlos.
+        self.processes.clear()
+        self.por_pid = {}
+        self.siguiente_pid = 0
+
+        # Restaurar la lista de colores disponibles
+        self.available_colors = self.colors.copy()
+        self.paleta = set(self.colors)
+
+    def _crear_indice(self, rows, cols, start_row=0, inicio=0):
+        if self.asignacion == 'paginada':
+            return MarcosLibres(rows, cols, start_row, inicio)
+        if self.asignacion == 'buddy':
+            return BloquesBuddy(rows, cols, start_row, inicio)
+        if self.asignacion == 'slab':
+            return CacheSlab(rows, cols, start_row, inicio)
+        return HuecosLibres(rows, cols, start_row, inicio, ajuste=self.asignacion)
+
+    def _registrar_marco(self, k):
+        self.registro_versiones.append(self.version)
+        self.registro_marcos.append(k)
+
+    def _registrar_proceso(self, name):
+        self.procesos_cambiados[name] = self.version
+
+    def _nueva_version(self):
+        self.version += 1
+        self._recortar_registro()
+
+    def _recortar_registro(self):
+        # Se descartan las versiones más viejas cuando el registro duplica el máximo
+        if len(self.registro_marcos) <= 2 * MAX_REGISTRO_CAMBIOS:
+            return
+        ultima = self.registro_versiones[len(self.registro_versiones) - MAX_REGISTRO_CAMBIOS - 1]
+        corte = bisect.bisect_right(self.registro_versiones, ultima)
+        del self.registro_versiones[:corte]
+        del self.registro_marcos[:corte]
+        self.version_minima = ultima
+        self.procesos_cambiados = {
+            name: version for name, version in self.procesos_cambiados.items() if version > ultima
+        }
+
+    def _celda(self, k):
+        # Estado de un marco para los cambios de la memoria
+        pid = self.duenio[k]
+        if k < self.n_ram:
+            region, (i, j) = 'ram', divmod(k, self.ram_cols)
+        else:
+            region, (i, j) = 'rom', divmod(k - self.n_ram, self.rom_cols)
+        celda = {'k': k, 'region': region, 'i': i, 'j': j, 'process': None, 'frame_id': None, 'color': None}
+        if pid == MARCO_SO:
+            celda.update(process='S.O.', frame_id='S.O.-0')
+        elif pid != MARCO_LIBRE:
+            process = self.por_pid[pid]
+            celda.update(process=process.name, frame_id=f"{process.name}-{self.pagina[k]}", color=process.color)
+        return celda
+
+    def _resumen_proceso(self, process):
+        return {
+            'name': process.name,
+            'color': process.color,
+            'size_initial': process.size_initial,
+            'size': process.size,
+            'paginas': len(process.paginas),
+            'paginas_restantes': math.ceil(process.size / self.frame_size),
+        }
+
+    @_sincronizado
+    def cambios_desde(self, version, instancia=None):
+        """
+        Marcos y procesos que cambiaron después de `version` de la memoria
+        `instancia`. Si es de otra memoria (o de antes de un init_memory), o
+        el registro ya no llega a esa versión, se devuelven todos, con
+        'completo' en True.
+        """
+        completo = (instancia != self.instancia or version < self.version_minima
+                    or version > self.version)
+        if completo:
+            marcos = range(self.n_ram + self.n_rom)
+            procesos = list(self.processes.values())
+            eliminados = []
+        else:
+            desde = bisect.bisect_right(self.registro_versiones, version)
+            marcos = sorted(set(self.registro_marcos[desde:]))
+            nombres = [name for name, v in self.procesos_cambiados.items() if v > version]
+            procesos = [self.processes[name] for name in nombres if name in self.processes]
+            eliminados = [name for name in nombres if name not in self.processes]
+        return {
+            'instancia': self.instancia,
+            'version': self.version,
+            'completo': completo,
+            'marcos': [self._celda(k) for k in marcos],
+            'procesos': [self._resumen_proceso(p) for p in procesos],
+            'eliminados': eliminados,
+        }
+
+    def _vista(self, inicio, rows, cols):
+        duenio, pagina, por_pid = self.duenio, self.pagina, self.por_pid
+        filas = []
+        for i in range(rows):
+            fila = []
+            for k in range(inicio + i * cols, inicio + (i + 1) * cols):
+                pid = duenio[k]
+                if pid == MARCO_LIBRE:
+                    fila.append({'process': None, 'frame_id': None})
+                elif pid == MARCO_SO:
+                    fila.append({'process': 'S.O.', 'frame_id': 'S.O.-0'})
+                else:
+                    process = por_pid[pid]
+                    fila.append({'process': process, 'frame_id': f"{process.name}-{pagina[k]}"})
+            filas.append(fila)
+        return filas
+
+    @_sincronizado
+    def vista_ram(self):
+        """Matriz de la RAM con una celda {'process', 'frame_id'} por marco, para dibujarla."""
+        return self._vista(0, self.ram_rows, self.ram_cols)
+
+    @_sincronizado
+    def vista_rom(self):
+        """Como vista_ram, para la ROM."""
+        return self._vista(self.n_ram, self.rom_rows, self.rom_cols)
+
+    def get_free_frames(self, free_index, frames_needed):
+        """Como la función get_free_frames del módulo."""
+        if frames_needed == 0:
+            return []
+        if METRICAS.activo:
+            inicio = time.perf_counter()
+            marcos = free_index.tomar(frames_needed, aleatorio=self.random_placement, rng=self.rng)
+            METRICAS.sumar_tiempo('get_free_frames', time.perf_counter() - inicio)
+            METRICAS.contar('marcos_asignados', len(marcos))
+            return marcos
+        return free_index.tomar(frames_needed, aleatorio=self.random_placement, rng=self.rng)
+
+    def _liberar_marco(self, k):
+        self.duenio[k] = MARCO_LIBRE
+        self._registrar_marco(k)
+        if k < self.n_ram:
+            self.ram_free.liberar(k)
+        else:
+            self.rom_free.liberar(k)
+
+    def _ocupar_marco(self, k, process, numero_pagina):
+        # Si la página cambia de región se mueve entre los índices ordenados
+        # del proceso
+        anterior_en_ram = process.paginas[numero_pagina - 1] < self.n_ram
+        if anterior_en_ram != (k < self.n_ram):
+            if anterior_en_ram:
+                origen, destino = process.paginas_ram, process.paginas_rom
             else:
-                rom[i][j]['process'] = None
-                rom[i][j]['frame_id'] = None
+                origen, destino = process.paginas_rom, process.paginas_ram
+            del origen[bisect.bisect_left(origen, numero_pagina)]
+            bisect.insort(destino, numero_pagina)
+            if METRICAS.activo:
+                METRICAS.contar('paginas_movidas', 1, 'destino="rom"' if anterior_en_ram else 'destino="ram"')
+        self.duenio[k] = process.pid
+        self.pagina[k] = numero_pagina
+        process.paginas[numero_pagina - 1] = k
+        self._registrar_marco(k)
+
+    def _tomar_color(self, name):
+        if self.available_colors:
+            # Selecciona un color aleatorio de los disponibles y lo remueve de la lista
+            # (se intercambia con el último para que quitarlo sea O(1))
+            idx = self.rng.randrange(len(self.available_colors))
+            self.available_colors[idx], self.available_colors[-1] = self.available_colors[-1], self.available_colors[idx]
+            return self.available_colors.pop()
+        # Sin colores libres: uno derivado del nombre, distinto de los de la
+        # paleta para no devolverlo a la lista al eliminar el proceso
+        color = color_derivado(name)
+        intento = 0
+        while color in self.paleta:
+            intento += 1
+            color = color_derivado(f'{name}#{intento}')
+        return color
+
+    def _devolver_color(self, color):
+        if color in self.paleta:
+            self.available_colors.append(color)
+
+    @_sincronizado
+    def create_process_memory(self, name, size):
+        # Verifica si el nombre del proceso ya existe
+        if name in self.processes:
+            return False, 'Ya existe un proceso con ese nombre en memoria.'
+
+        color = self._tomar_color(name)
+
+        total_frames_needed = int(size // self.frame_size)
+        if size % self.frame_size != 0:
+            total_frames_needed += 1  # Si hay residuo, necesitamos un marco extra
+
+        # Asignamos hasta max_ram_frames marcos en RAM
+        ram_frames_needed = min(self.max_ram_frames, total_frames_needed)
+        rom_frames_needed = total_frames_needed - ram_frames_needed
+
+        # Se comprueba el espacio antes de reservar para no tener que deshacer nada
+        if len(self.ram_free) < ram_frames_needed or len(self.rom_free) < rom_frames_needed:
+            self._devolver_color(color)
+            return False, 'No hay suficiente espacio en memoria.'
+
+        # Crea una instancia del proceso
+        process = ProcesoMemoria(name, size, color, pid=self.siguiente_pid)
+        self.siguiente_pid += 1
+
+        ram_frames = self.get_free_frames(self.ram_free, ram_frames_needed)  # El índice de RAM excluye la fila del S.O.
+        rom_frames = self.get_free_frames(self.rom_free, rom_frames_needed)
+
+        # Con asignación contigua puede haber marcos libres suficientes pero
+        # ningún hueco del tamaño pedido (fragmentación externa)
+        if len(ram_frames) < ram_frames_needed or len(rom_frames) < rom_frames_needed:
+            for k in ram_frames:
+                self.ram_free.liberar(k)
+            for k in rom_frames:
+                self.rom_free.liberar(k)
+            self._devolver_color(color)
+            return False, 'No hay un hueco contiguo suficiente en memoria.'
+
+        # La versión solo cambia si la operación modifica la memoria
+        self._nueva_version()
+        # Las primeras páginas quedan en RAM y el resto en ROM
+        process.paginas = array('i', ram_frames + rom_frames)
+        process.paginas_ram = list(range(1, ram_frames_needed + 1))
+        process.paginas_rom = list(range(ram_frames_needed + 1, total_frames_needed + 1))
+        duenio, pagina = self.duenio, self.pagina
+        for numero_pagina, k in enumerate(process.paginas, start=1):
+            duenio[k] = process.pid
+            pagina[k] = numero_pagina
+        self.registro_versiones.extend(array('q', [self.version]) * total_frames_needed)
+        self.registro_marcos.extend(process.paginas)
+
+        self.processes[name] = process
+        self.por_pid[process.pid] = process
+        self._registrar_proceso(name)
+        return True, 'Proceso creado exitosamente.'
 
-        # Devuelve el color a la lista de colores disponibles
-        available_colors.append(process_to_delete.color)
+    @_sincronizado
+    def delete_process_memory(self, name):
+        process_to_delete = self.processes.pop(name, None)
 
-        # Eliminamos el proceso de la lista
-        processes = [p for p in processes if p.name != name]
+        if process_to_delete:
+            self._nueva_version()
+            self._registrar_proceso(name)
+            del self.por_pid[process_to_delete.pid]
+            # Liberamos los marcos en RAM y ROM
+            for k in process_to_delete.paginas:
+                self._liberar_marco(k)
+
+            # Devuelve el color a la lista de colores disponibles
+            self._devolver_color(process_to_delete.color)
+            return True
+        else:
+            return False
+
+    def ocupacion(self):
+        """Fracción de los marcos de RAM y ROM (sin los del S.O.) que no están libres."""
+        # Solo lee el tamaño de los dos índices; no toma el candado porque el
+        # motor la consulta en cada paso
+        marcos = self.n_ram - self.ram_cols + self.n_rom
+        return 1 - (len(self.ram_free) + len(self.rom_free)) / marcos
+
+    @_sincronizado
+    def fragmentacion(self):
+        """
+        Fragmentación interna (kb reservados en marcos que el proceso no usa,
+        incluidos los marcos sobrantes de los bloques buddy y de los objetos
+        slab) y externa (fracción de la memoria libre fuera del hueco más
+        grande) de cada región.
+        """
+        marcos = sum(len(p.paginas) for p in self.processes.values())
+        marcos += self.ram_free.marcos_sin_uso() + self.rom_free.marcos_sin_uso()
+        reservado = marcos * self.frame_size
+        usado = sum(p.size for p in self.processes.values())
+        return {
+            'interna_kb': reservado - usado,
+            'interna': (reservado - usado) / reservado if reservado else 0.0,
+            'externa_ram': self.ram_free.fragmentacion_externa(),
+            'externa_rom': self.rom_free.fragmentacion_externa(),
+        }
+
+    @_sincronizado
+    def compactar(self):
+        """
+        Mueve los marcos ocupados de cada región al principio, conservando su
+        orden, para que la memoria libre quede en un solo hueco. Devuelve el
+        número de marcos movidos.
+        """
+        duenio, pagina, por_pid = self.duenio, self.pagina, self.por_pid
+        movidos = 0
+        regiones = [
+            (self.ram_free, self.ram_cols, self.n_ram),
+            (self.rom_free, self.n_ram, self.n_ram + self.n_rom),
+        ]
+        for indice, desde, hasta in regiones:
+            destino = desde
+            for k in range(desde, hasta):
+                pid = duenio[k]
+                if pid < 0:
+                    continue
+                if k != destino:
+                    if not movidos:
+                        self._nueva_version()
+                    duenio[destino] = pid
+                    pagina[destino] = pagina[k]
+                    por_pid[pid].paginas[pagina[k] - 1] = destino
+                    duenio[k] = MARCO_LIBRE
+                    self._registrar_marco(destino)
+                    self._registrar_marco(k)
+                    movidos += 1
+                destino += 1
+            indice.reiniciar(destino - indice.inicio)
+        return movidos
+
+    @_sincronizado
+    def subir_pagina(self, name, numero_pagina):
+        """Sube una página de ROM a un marco libre de RAM; False si no hay marcos libres."""
+        process = self.processes[name]
+        ram_frames = self.get_free_frames(self.ram_free, 1)
+        if not ram_frames:
+            return False
+        self._nueva_version()
+        self._liberar_marco(process.paginas[numero_pagina - 1])
+        self._ocupar_marco(ram_frames[0], process, numero_pagina)
         return True
-    else:
-        return False
 
-def extract_frame_number(frame):
+    @_sincronizado
+    def intercambiar_paginas(self, name, pagina_entrante, pagina_saliente):
+        """Intercambia los marcos de dos páginas del proceso (una en ROM y otra en RAM)."""
+        self._nueva_version()
+        process = self.processes[name]
+        k_entrante = process.paginas[pagina_entrante - 1]
+        k_saliente = process.paginas[pagina_saliente - 1]
+        self._ocupar_marco(k_saliente, process, pagina_entrante)
+        self._ocupar_marco(k_entrante, process, pagina_saliente)
+
+    @_sincronizado
+    def reduce_process_size(self, name, amount):
+        process = self.processes.get(name)
+        if not process:
+            return False, f'El proceso "{name}" no existe.'
+
+        old_size = process.size
+        new_size = max(0, old_size - amount)
+
+        if new_size == old_size:
+            return False, 'No se puede reducir más el tamaño del proceso.'
+        self._nueva_version()
+
+        # Cálculo de marcos antes y después de la reducción
+        old_total_frames = int(old_size // self.frame_size) + (1 if old_size % self.frame_size != 0 else 0)
+        new_total_frames = int(new_size // self.frame_size) + (1 if new_size % self.frame_size != 0 else 0)
+        frames_to_remove = old_total_frames - new_total_frames
+
+        # Actualizamos el tamaño del proceso
+        process.size = new_size
+        self._registrar_proceso(name)
+
+        # Si el tamaño es cero, eliminamos el proceso por completo
+        if process.size == 0:
+            self.delete_process_memory(name)
+            return True, f'El proceso "{name}" ha sido eliminado porque su tamaño es cero.'
+
+        # Si el nuevo total de marcos es menor que max_ram_frames, no mover marcos a ROM ni liberarlos
+        if new_total_frames < self.max_ram_frames:
+            # No se realiza ningún cambio en los marcos
+            return True, 'El tamaño del proceso ha sido reducido y los marcos se han mantenido en RAM.'
+
+        # Si el tamaño no es menor que max_ram_frames, proceder con la lógica original
+        # Paso 1: Mover marcos de RAM a ROM (números de página en orden)
+        pages_to_move = process.paginas_ram[:frames_to_remove]
+
+        # Buscamos espacio libre en ROM para colocar estos marcos
+        rom_frames = self.get_free_frames(self.rom_free, len(pages_to_move))
+        if len(rom_frames) < len(pages_to_move):
+            return False, 'No hay suficiente espacio en ROM para bajar las páginas.'
+
+        # Movemos los marcos de RAM a ROM
+        for numero_pagina, rom_k in zip(pages_to_move, rom_frames):
+            # Liberamos el marco en RAM y asignamos el de ROM
+            self._liberar_marco(process.paginas[numero_pagina - 1])
+            self._ocupar_marco(rom_k, process, numero_pagina)
+
+        # Paso 2: Subir un marco desde ROM a RAM solo si frames_to_remove es 1 y new_total_frames > 2
+        if frames_to_remove == 1:
+            pages_in_ram = process.paginas_ram
+            pages_in_rom = process.paginas_rom
+
+            if len(pages_in_ram) < self.max_ram_frames and pages_in_rom:
+                # Subir la página de ROM de menor número entre las posteriores
+                # a la última página en RAM; si no hay, la de menor número.
+                # Los índices están ordenados, así que basta una bisección.
+                max_ram_page = pages_in_ram[-1] if pages_in_ram else -1
+                idx = bisect.bisect_right(pages_in_rom, max_ram_page)
+                page_to_move_up = pages_in_rom[idx] if idx < len(pages_in_rom) else pages_in_rom[0]
+
+                # Buscar una posición libre en RAM (el índice excluye la fila del S.O.)
+                free_ram_frames = self.get_free_frames(self.ram_free, 1)
+                if len(free_ram_frames) < 1:
+                    return False, 'No hay suficiente espacio en RAM para subir una página desde ROM.'
+
+                # Liberar la posición en ROM y asignar el marco en RAM
+                self._liberar_marco(process.paginas[page_to_move_up - 1])
+                self._ocupar_marco(free_ram_frames[0], process, page_to_move_up)
+
+        return True, 'El tamaño del proceso ha sido reducido, las páginas sobrantes han sido bajadas a ROM y un marco ha sido subido a RAM.'
+
+# Instancia que usan las funciones del módulo (la aplicación web y los
+# benchmarks). Sus estructuras se exponen también como globales del módulo.
+_actual = None
+ram_free = None
+rom_free = None
+processes = {}
+
+def init_memory():
+    global _actual, ram_free, rom_free, processes, available_colors
+    # Se crea una instancia nueva para tomar los valores actuales de las
+    # constantes del módulo
+    _actual = MemoryManager()
+    ram_free, rom_free = _actual.ram_free, _actual.rom_free
+    processes = _actual.processes
+    available_colors = _actual.available_colors
+
+def vista_ram():
+    return _actual.vista_ram()
+
+def vista_rom():
+    return _actual.vista_rom()
+
+def create_process_memory(name, size):
+    return _actual.create_process_memory(name, size)
+
+def get_free_frames(free_index, frames_needed):
     """
-    Extrae el número del frame_id. Asume que frame_id sigue el formato "ProcesoX-Y",
-    donde Y es un número entero.
+    Reserva marcos libres del índice dado. El costo es O(frames_needed) sin
+    importar el tamaño de la memoria. Devuelve una lista vacía si no hay
+    suficientes marcos libres (en ese caso no se reserva nada).
     """
-    if isinstance(frame, dict) and 'frame_id' in frame:
-        try:
-            return int(frame['frame_id'].split('-')[-1])
-        except (IndexError, ValueError):
-            return -1  # Valor predeterminado en caso de formato incorrecto
-    else:
-        return -1  # Valor predeterminado si frame no es dict o no tiene frame_id
+    if frames_needed == 0:
+        return []
+    return free_index.tomar(frames_needed, aleatorio=RANDOM_PLACEMENT)
+
+def delete_process_memory(name):
+    return _actual.delete_process_memory(name)
 
 def reduce_process_size(name, amount):
-    global processes
-    process = next((p for p in processes if p.name == name), None)
-    if not process:
-        return False, f'El proceso "{name}" no existe.'
-    
-    # Verificar que todos los marcos sean diccionarios
-    for frame in process.frames:
-        if not isinstance(frame, dict):
-            return False, 'Error: Algunos marcos no están correctamente estructurados como diccionarios.'
-    
-    old_size = process.size
-    new_size = max(0, old_size - amount)
-    
-    if new_size == old_size:
-        return False, 'No se puede reducir más el tamaño del proceso.'
-    
-    # Cálculo de marcos antes y después de la reducción
-    old_total_frames = int(old_size // FRAME_SIZE) + (1 if old_size % FRAME_SIZE != 0 else 0)
-    new_total_frames = int(new_size // FRAME_SIZE) + (1 if new_size % FRAME_SIZE != 0 else 0)
-    frames_to_remove = old_total_frames - new_total_frames
-    
-    # Actualizamos el tamaño del proceso
-    process.size = new_size
-    
-    # Si el tamaño es cero, eliminamos el proceso por completo
-    if process.size == 0:
-        delete_process_memory(name)
-        return True, f'El proceso "{name}" ha sido eliminado porque su tamaño es cero.'
-    
-    # Si el nuevo total de marcos es menor que 3, no mover marcos a ROM ni liberarlos
-    if new_total_frames < 3:
-        # No se realiza ningún cambio en los marcos
-        return True, 'El tamaño del proceso ha sido reducido y los marcos se han mantenido en RAM.'
-    
-    # Si el tamaño no es menor que 3, proceder con la lógica original
-    # Paso 1: Mover marcos de RAM a ROM
-    ram_frames = [frame for frame in process.frames if frame['type'] == 'RAM']
-    frames_to_move = ram_frames[:frames_to_remove]
-    
-    # Buscamos espacio libre en ROM para colocar estos marcos
-    rom_positions = get_free_frames(rom, len(frames_to_move))
-    if len(rom_positions) < len(frames_to_move):
-        return False, 'No hay suficiente espacio en ROM para bajar las páginas.'
-    
-    # Movemos los marcos de RAM a ROM
-    for idx, frame in enumerate(frames_to_move):
-        # Limpiamos la celda en RAM
-        ram_i, ram_j = frame['i'], frame['j']
-        ram[ram_i][ram_j]['process'] = None
-        ram[ram_i][ram_j]['frame_id'] = None
-    
-        # Asignamos el marco a la ROM
-        rom_i, rom_j = rom_positions[idx]
-        rom[rom_i][rom_j]['process'] = process
-        rom[rom_i][rom_j]['frame_id'] = frame['frame_id']
-    
-        # Actualizamos la información del marco en el objeto del proceso
-        frame['type'] = 'ROM'
-        frame['i'] = rom_i
-        frame['j'] = rom_j
-    
-    # Paso 2: Subir un marco desde ROM a RAM solo si frames_to_remove es 1 y new_total_frames > 2
-    if frames_to_remove == 1:
-        # Recalcular las listas después de mover marcos a ROM
-        frames_in_ram = [f for f in process.frames if f['type'] == 'RAM']
-        frames_in_rom = [f for f in process.frames if f['type'] == 'ROM']
-        
-        if len(frames_in_ram) < 3 and frames_in_rom:
-            # Ordenar los marcos en ROM por frame_id de menor a mayor
-            frames_in_rom_sorted = sorted(
-                frames_in_rom,
-                key=lambda f: extract_frame_number(f)
-            )
-            
-            # Obtener el frame_id máximo en RAM
-            ram_frame_ids = [extract_frame_number(f) for f in frames_in_ram]
-            max_ram_id = max(ram_frame_ids) if ram_frame_ids else -1
-            
-            # Filtrar marcos en ROM con frame_id mayor que max_ram_id
-            eligible_rom_frames = [
-                f for f in frames_in_rom_sorted
-                if extract_frame_number(f) > max_ram_id
-            ]
-            
-            # Si hay marcos elegibles, seleccionar el de menor frame_id entre ellos
-            if eligible_rom_frames:
-                frame_to_move_up = eligible_rom_frames[0]
-            else:
-                # Si no hay marcos con frame_id mayor, seleccionar el de menor frame_id en ROM
-                frame_to_move_up = frames_in_rom_sorted[0]
-            
-            # Buscar una posición libre en RAM (empezando desde la fila 1 para reservar la primera fila al S.O.)
-            free_ram_positions = get_free_frames(ram, 1, start_row=1)
-            if len(free_ram_positions) < 1:
-                return False, 'No hay suficiente espacio en RAM para subir una página desde ROM.'
-            
-            ram_i, ram_j = free_ram_positions[0]
-            
-            # Liberar la posición en ROM
-            rom[frame_to_move_up['i']][frame_to_move_up['j']]['process'] = None
-            rom[frame_to_move_up['i']][frame_to_move_up['j']]['frame_id'] = None
-            
-            # Asignar el marco en RAM
-            ram[ram_i][ram_j]['process'] = process
-            ram[ram_i][ram_j]['frame_id'] = frame_to_move_up['frame_id']
-            
-            # Actualizar la información del marco en el objeto proceso
-            frame_to_move_up['type'] = 'RAM'
-            frame_to_move_up['i'] = ram_i
-            frame_to_move_up['j'] = ram_j
-    
-    return True, 'El tamaño del proceso ha sido reducido, las páginas sobrantes han sido bajadas a ROM y un marco ha sido subido a RAM.'
+    return _actual.reduce_process_size(name, amount)
+
+def ocupacion():
+    return _actual.ocupacion()
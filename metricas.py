@@ -0,0 +1,170 @@
+"""
+Tiempos y contadores del simulador, para ver en qué se va cada paso y cada
+petición (leer y guardar el estado, desbloquear, asignar, ejecutar, reducir
+procesos en memoria, buscar marcos libres...).
+
+Hay un solo registro por proceso, METRICAS. Está apagado por defecto (o
+encendido con SIMULADOR_METRICAS=1) y se enciende y apaga en tiempo de
+ejecución con activar() y desactivar(). Apagado, el código instrumentado solo
+comprueba METRICAS.activo. El texto para Prometheus lo genera
+prometheus() y la aplicación web lo sirve en /metrics.
+
+Con perfilar(n_pasos, ruta) los siguientes n pasos de simulación se ejecutan
+bajo cProfile y el perfil se guarda en `ruta` (se abre con pstats o snakeviz).
+"""
+import cProfile
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Descripción de cada contador para la salida de Prometheus
+CONTADORES = {
+    'pasos': 'Pasos de simulación ejecutados',
+    'marcos_asignados': 'Marcos entregados por los índices de marcos libres',
+    'paginas_movidas': 'Páginas movidas entre RAM y ROM, por región de destino',
+    'procesos_despertados': 'Procesos bloqueados revisados al liberarse un recurso',
+    'procesos_desbloqueados': 'Procesos que pasaron de bloqueado a listo',
+    'bytes_serializados': 'Bytes del estado serializado al guardarlo o leerlo del almacén',
+    'bytes_respuesta': 'Bytes de las respuestas de la aplicación web, por ruta',
+}
+
+PREFIJO = 'simulador_'
+
+
+class CapturaPerfil:
+    def __init__(self, pasos, ruta):
+        self.perfil = cProfile.Profile()
+        self.pasos = pasos
+        self.ruta = ruta
+
+
+class Metricas:
+    def __init__(self, activo=False):
+        self.activo = activo
+        self.captura = None  # CapturaPerfil en curso, si la hay
+        self.candado = threading.Lock()
+        self.reiniciar()
+
+    def reiniciar(self):
+        with self.candado:
+            # (nombre, etiquetas) -> valor
+            self.contadores = {}
+            # (fase, etiquetas) -> [segundos acumulados, llamadas]
+            self.tiempos = {}
+
+    def activar(self):
+        self.activo = True
+
+    def desactivar(self):
+        self.activo = False
+
+    def contar(self, nombre, n=1, etiquetas=''):
+        clave = (nombre, etiquetas)
+        with self.candado:
+            self.contadores[clave] = self.contadores.get(clave, 0) + n
+
+    def sumar_tiempo(self, fase, segundos, etiquetas=''):
+        clave = (fase, etiquetas)
+        with self.candado:
+            acumulado = self.tiempos.get(clave)
+            if acumulado is None:
+                self.tiempos[clave] = [segundos, 1]
+            else:
+                acumulado[0] += segundos
+                acumulado[1] += 1
+
+    @contextmanager
+    def medir(self, fase, etiquetas=''):
+        """Suma al tiempo de `fase` lo que tarda el bloque (si las métricas están activas)."""
+        if not self.activo:
+            yield
+            return
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.sumar_tiempo(fase, time.perf_counter() - inicio, etiquetas)
+
+    def perfilar(self, pasos, ruta):
+        """Ejecuta los siguientes `pasos` pasos bajo cProfile y guarda el perfil en `ruta`."""
+        with self.candado:
+            self.captura = CapturaPerfil(pasos, os.path.abspath(ruta))
+        return self.captura.ruta
+
+    def terminar_perfil(self):
+        """Guarda ya la captura en curso (si faltaban pasos); devuelve su ruta o None."""
+        with self.candado:
+            captura, self.captura = self.captura, None
+        if captura is None:
+            return None
+        captura.perfil.dump_stats(captura.ruta)
+        return captura.ruta
+
+    def ejecutar_paso(self, fases):
+        """
+        Ejecuta las fases de un paso (pares (nombre, función)) midiendo cada
+        una, y bajo el perfilador si hay una captura en curso.
+        """
+        with self.candado:
+            # La captura se saca del registro mientras dura el paso, para que
+            # otro hilo no la use a la vez
+            captura, self.captura = self.captura, None
+        if captura is None:
+            self._ejecutar_fases(fases)
+            return
+        try:
+            captura.perfil.runcall(self._ejecutar_fases, fases)
+        finally:
+            captura.pasos -= 1
+            if captura.pasos > 0:
+                with self.candado:
+                    if self.captura is None:
+                        self.captura = captura
+            else:
+                captura.perfil.dump_stats(captura.ruta)
+
+    def _ejecutar_fases(self, fases):
+        if not self.activo:
+            for _, fase in fases:
+                fase()
+            return
+        reloj = time.perf_counter
+        inicio_paso = reloj()
+        for nombre, fase in fases:
+            inicio = reloj()
+            fase()
+            self.sumar_tiempo(nombre, reloj() - inicio)
+        self.sumar_tiempo('paso', reloj() - inicio_paso)
+        self.contar('pasos')
+
+    def prometheus(self):
+        """Las métricas en el formato de texto de Prometheus."""
+        with self.candado:
+            contadores = dict(self.contadores)
+            tiempos = {clave: list(valor) for clave, valor in self.tiempos.items()}
+
+        lineas = [
+            f'# HELP {PREFIJO}metricas_activas 1 si las métricas se están registrando',
+            f'# TYPE {PREFIJO}metricas_activas gauge',
+            f'{PREFIJO}metricas_activas {int(self.activo)}',
+            f'# HELP {PREFIJO}fase_segundos Tiempo dedicado a cada fase de un paso o de una petición',
+            f'# TYPE {PREFIJO}fase_segundos summary',
+        ]
+        for (fase, etiquetas), (segundos, llamadas) in sorted(tiempos.items()):
+            # Las etiquetas se guardan ya en el formato de Prometheus: 'ruta="/x"'
+            todas = f'fase="{fase}"' + (',' + etiquetas if etiquetas else '')
+            lineas.append(f'{PREFIJO}fase_segundos_sum{{{todas}}} {segundos!r}')
+            lineas.append(f'{PREFIJO}fase_segundos_count{{{todas}}} {llamadas}')
+
+        for nombre, descripcion in CONTADORES.items():
+            metrica = f'{PREFIJO}{nombre}_total'
+            lineas.append(f'# HELP {metrica} {descripcion}')
+            lineas.append(f'# TYPE {metrica} counter')
+            valores = sorted((e, v) for (n, e), v in contadores.items() if n == nombre)
+            for etiquetas, valor in valores or [('', 0)]:
+                lineas.append(f'{metrica}{{{etiquetas}}} {valor}' if etiquetas else f'{metrica} {valor}')
+        return '\n'.join(lineas) + '\n'
+
+
+METRICAS = Metricas(activo=os.environ.get('SIMULADOR_METRICAS', '') not in ('', '0'))
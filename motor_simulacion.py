@@ -0,0 +1,774 @@
+import argparse
+import json
+import logging
+import random
+import time
+from collections import deque
+
+import memory_manager
+from estadisticas import EstadisticasSimulacion, imprimir_resumen
+from gestor_recursos import GestorRecursos
+from interbloqueos import MODOS_INTERBLOQUEO, PERIODO_DETECCION, EstadisticasInterbloqueos, GrafoEspera, estado_seguro
+from metricas import METRICAS
+from politicas import POLITICAS, PoliticaActual, crear_politica
+from reemplazo_paginas import POLITICAS_REEMPLAZO, Paginador
+
+logger = logging.getLogger(__name__)
+
+# Estados posibles para un proceso
+ESTADOS = ['Nuevo', 'Listo', 'Ejecutando', 'Bloqueado', 'Terminado']
+
+# Lista de recursos disponibles
+RECURSOS_DISPONIBLES = ['Recurso1', 'Recurso2', 'Recurso3', 'Recurso4', 'Recurso5', 'Recurso6']
+
+# Formas de obtener los recursos: 'total' los asigna todos juntos o ninguno;
+# con 'parcial' un proceso bloqueado se queda con los que ya estaban libres
+ADQUISICIONES = ('total', 'parcial')
+
+class Proceso:
+    # Los procesos se mantienen vivos durante toda la simulación; __slots__
+    # evita el dict por instancia y reduce memoria y tiempo de acceso
+    __slots__ = (
+        'id', 'tamaño', 'tamaño_inicial', 'recursos_requeridos', 'estado', 'preeminencia',
+        'recursos_obtenidos', 'unidades_ejecutadas', 'recursos_faltantes', 'veces_ejecutando',
+        'mascara_recursos', 'mascara_obtenida', 'tick_llegada', 'tick_fin', 'nucleo',
+        'tick_primera_ejecucion', 'tick_bloqueo', 'ticks_bloqueado',
+    )
+
+    def __init__(self, id_proceso, tamaño, recursos_requeridos, preeminencia=False):
+        self.id = id_proceso
+        self.tamaño = int(tamaño)
+        self.tamaño_inicial = int(tamaño)  # Nuevo atributo
+        self.recursos_requeridos = recursos_requeridos  # Lista de recursos
+        self.estado = 'Nuevo'
+        self.preeminencia=preeminencia
+        self.recursos_obtenidos = []
+        self.unidades_ejecutadas = 0  # Contador de unidades ejecutadas en este ciclo
+        self.recursos_faltantes = []  # Recursos faltantes si está bloqueado
+        self.veces_ejecutando = 0
+        self.mascara_recursos = None  # La calcula GestorRecursos la primera vez
+        self.mascara_obtenida = 0  # Recursos que tiene, la mantiene GestorRecursos
+        self.tick_llegada = None  # Paso en que llegó (el de su traza o en que entró a la cola de listos)
+        self.tick_primera_ejecucion = None  # Paso en que se ejecutó por primera vez
+        self.tick_fin = None  # Paso en que terminó
+        self.tick_bloqueo = None  # Paso en que se bloqueó por última vez
+        self.ticks_bloqueado = 0  # Pasos que pasó bloqueado en total
+        self.nucleo = None  # Núcleo en el que se ejecutó por última vez
+
+    def __str__(self):
+        return f"ID: {self.id}, Tamaño: {self.tamaño_inicial}, Restante: {self.tamaño}, Estado: {self.estado}, Preeminencia: {self.preeminencia}"
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'tamaño': self.tamaño,
+            'tamaño_inicial': self.tamaño_inicial,
+            'recursos_requeridos': self.recursos_requeridos,
+            'estado': self.estado,
+            'preeminencia': self.preeminencia,
+            'recursos_obtenidos': self.recursos_obtenidos,
+            'unidades_ejecutadas': self.unidades_ejecutadas,
+            'recursos_faltantes': self.recursos_faltantes,
+            'veces_ejecutando': self.veces_ejecutando,
+            'tick_llegada': self.tick_llegada,
+            'tick_primera_ejecucion': self.tick_primera_ejecucion,
+            'tick_fin': self.tick_fin,
+            'ticks_bloqueado': self.ticks_bloqueado,
+        }
+
+    @staticmethod
+    def from_dict(data):
+        proceso = Proceso(data['id'], data['tamaño_inicial'], data['recursos_requeridos'],preeminencia=data.get('preeminencia', False))
+        proceso.tamaño = data['tamaño']
+        proceso.estado = data['estado']
+        proceso.recursos_obtenidos = data['recursos_obtenidos']
+        proceso.unidades_ejecutadas = data['unidades_ejecutadas']
+        proceso.recursos_faltantes = data.get('recursos_faltantes', [])
+        proceso.veces_ejecutando = data.get('veces_ejecutando', 0)
+        proceso.tick_llegada = data.get('tick_llegada')
+        proceso.tick_primera_ejecucion = data.get('tick_primera_ejecucion')
+        proceso.tick_fin = data.get('tick_fin')
+        proceso.ticks_bloqueado = data.get('ticks_bloqueado', 0)
+        return proceso
+
+
+class ColaOrdenada:
+    """
+    Cola que conserva el orden de llegada y permite quitar cualquier elemento
+    en O(1). Se usa para los bloqueados, que salen en cualquier orden.
+    """
+
+    def __init__(self, elementos=()):
+        self._orden = {}
+        self._siguiente = 0
+        for elemento in elementos:
+            self.append(elemento)
+
+    def append(self, elemento):
+        self._orden[elemento] = self._siguiente
+        self._siguiente += 1
+
+    def remove(self, elemento):
+        del self._orden[elemento]
+
+    def orden(self, elemento):
+        return self._orden[elemento]
+
+    def __contains__(self, elemento):
+        return elemento in self._orden
+
+    def __iter__(self):
+        return iter(self._orden)
+
+    def __len__(self):
+        return len(self._orden)
+
+
+class Nucleo:
+    """Un núcleo de CPU: su cola de listos, el proceso que ejecuta y su uso."""
+
+    def __init__(self, indice, listo):
+        self.indice = indice
+        self.listo = listo
+        self.proceso = None
+        self.ticks_ocupado = 0
+
+
+class ColasNucleos:
+    """
+    Vista de las colas de listos de todos los núcleos como una sola cola. Los
+    procesos que llegan se encolan en el núcleo con menos trabajo pendiente.
+    """
+
+    def __init__(self, nucleos):
+        self.colas = [nucleo.listo for nucleo in nucleos]
+
+    def append(self, proceso):
+        min(self.colas, key=len).append(proceso)
+
+    def extend(self, procesos):
+        for proceso in procesos:
+            self.append(proceso)
+
+    def mas_larga(self):
+        return max(self.colas, key=len)
+
+    def __iter__(self):
+        for cola in self.colas:
+            yield from cola
+
+    def __len__(self):
+        return sum(len(cola) for cola in self.colas)
+
+
+class MotorSimulacion:
+    """
+    Planificador de procesos independiente de Flask. Guarda las colas de cada
+    estado y avanza la simulación un paso a la vez (desbloquear → asignar →
+    ejecutar). La interfaz web y la línea de comandos usan esta misma clase.
+
+    `memoria` es el gestor de memoria que se actualiza al ejecutar cada
+    proceso: una instancia de memory_manager.MemoryManager o el módulo
+    memory_manager (que usa la memoria global del módulo y requiere haber
+    llamado a memory_manager.init_memory()). Con None (el valor por defecto)
+    se crea un MemoryManager nuevo.
+    `con_memoria` en False hace que la simulación solo planifique CPU y
+    recursos, sin gestor de memoria (y entonces no se admite `memoria`).
+    `politica` es la política de planificación (ver politicas.py); por
+    defecto la del simulador original.
+    `recursos` es la lista de nombres de los recursos del sistema.
+    `paginacion` es un reemplazo_paginas.Paginador para simular paginación por
+    demanda (requiere una instancia de MemoryManager) o None.
+    `n_cpus` es el número de núcleos; cada uno tiene su propia cola de listos
+    y, con `robo_trabajo`, un núcleo sin trabajo toma procesos de la cola más
+    larga.
+    `semilla` inicializa el random.Random propio de la simulación (por
+    ejemplo, para decidir si un proceso expulsado suelta sus recursos); sin
+    semilla se usa el generador global del módulo random.
+    `adquisicion` es 'total' (todos los recursos juntos, como el simulador
+    original) o 'parcial' (un proceso bloqueado conserva los que obtuvo, y
+    pueden formarse interbloqueos).
+    `interbloqueos` es None, 'detectar' o 'evitar' (ver interbloqueos.py);
+    `periodo_deteccion` es el del detector periódico con el que se miden los
+    pasos ahorrados (ver EstadisticasInterbloqueos).
+    `archivo` es un archivo_terminados.ArchivoTerminados donde se guardan los
+    procesos terminados en lugar de la cola 'terminado', que queda vacía; con
+    None se guardan en la cola.
+    """
+
+    def __init__(self, memoria=None, politica=None, n_cpus=1, robo_trabajo=True, recursos=RECURSOS_DISPONIBLES,
+                 paginacion=None, semilla=None, adquisicion='total', interbloqueos=None,
+                 periodo_deteccion=PERIODO_DETECCION, archivo=None, con_memoria=True):
+        if adquisicion not in ADQUISICIONES:
+            raise ValueError(f"Adquisición desconocida: {adquisicion!r}")
+        if interbloqueos is not None and interbloqueos not in MODOS_INTERBLOQUEO:
+            raise ValueError(f"Modo de interbloqueos desconocido: {interbloqueos!r}")
+        if not con_memoria:
+            if memoria is not None:
+                raise ValueError("No se puede indicar una memoria con con_memoria=False")
+        elif memoria is None:
+            memoria = memory_manager.MemoryManager()
+        # Internamente None indica que no se simula la memoria
+        self.memoria = memoria
+        self.semilla = semilla
+        self.rng = random.Random(semilla) if semilla is not None else random
+        self.paginacion = paginacion
+        self.politica = politica if politica is not None else PoliticaActual()
+        self.n_cpus = n_cpus
+        self.robo_trabajo = robo_trabajo
+        self.adquisicion = adquisicion
+        self.interbloqueos = interbloqueos
+        self.periodo_deteccion = periodo_deteccion
+        self.estadisticas_interbloqueos = EstadisticasInterbloqueos()
+        # Retorno, espera, etc. de los terminados y ocupación de la memoria,
+        # acumulados sin guardar los procesos
+        self.estadisticas = EstadisticasSimulacion()
+        self.recursos = GestorRecursos(recursos, GrafoEspera() if interbloqueos else None)
+        # Procesos a los que el banquero les negó una asignación parcial; se
+        # reintentan cuando se libera algún recurso
+        self.denegados = {}
+        self.nuevo = deque()
+        self.nucleos = [Nucleo(i, self.politica.crear_cola(self)) for i in range(n_cpus)]
+        self.listo = ColasNucleos(self.nucleos)
+        self.ejecutando = []
+        self.bloqueado = ColaOrdenada()
+        self.terminado = []
+        self.archivo = archivo
+        # Ids de los procesos de la simulación en cualquier estado (los que
+        # están en el archivo se buscan en él, ver existe_id)
+        self.ids = set()
+        self.simulacion_en_curso = False
+        self.simulacion_pausada = False
+        self.tick = 0
+        # Lista de cambios (tick, proceso, estado anterior, estado nuevo,
+        # tamaño) que se llena solo mientras se ejecuta run_registrando
+        self.cambios = None
+
+    def __getstate__(self):
+        # El módulo memory_manager no se puede serializar con pickle; solo se
+        # guarda si la simulación lo usaba. Una instancia de MemoryManager se
+        # guarda completa. Lo mismo con el módulo random.
+        estado = self.__dict__.copy()
+        if self.memoria is memory_manager:
+            estado['memoria'] = True
+        if self.rng is random:
+            estado['rng'] = None
+        return estado
+
+    def __setstate__(self, estado):
+        memoria = estado.pop('memoria')
+        self.__dict__.update(estado)
+        self.memoria = memory_manager if memoria is True else memoria
+        if self.rng is None:
+            self.rng = random
+
+    def cola(self, estado):
+        return getattr(self, estado.lower())
+
+    def procesos_por_estado(self):
+        return {estado: self.cola(estado) for estado in ESTADOS}
+
+    def procesos_por_estado_dict(self):
+        # Serializa las colas para las respuestas JSON
+        return {estado: [p.to_dict() for p in self.cola(estado)] for estado in ESTADOS}
+
+    def agregar_proceso(self, proceso):
+        """
+        Agrega un proceso nuevo y le asigna memoria. Devuelve (éxito, mensaje)
+        como create_process_memory.
+        """
+        if self.existe_id(proceso.id):
+            return False, 'Ya existe un proceso con ese ID.'
+        if self.memoria is not None:
+            success, msg = self.memoria.create_process_memory(proceso.id, float(proceso.tamaño))
+            if not success:
+                return False, msg
+        proceso.estado = 'Nuevo'
+        self.nuevo.append(proceso)
+        self.ids.add(proceso.id)
+        return True, 'Proceso creado exitosamente.'
+
+    def existe_id(self, id_proceso):
+        """True si algún proceso de la simulación, vivo o terminado, tiene ese id."""
+        return id_proceso in self.ids or (self.archivo is not None and self.archivo.contiene(id_proceso))
+
+    def contar_procesos(self):
+        """Procesos de la simulación en todos los estados, incluidos los archivados."""
+        return len(self.ids) + (len(self.archivo) if self.archivo is not None else 0)
+
+    def contar_terminados(self):
+        """Procesos terminados, en la cola y en el archivo."""
+        return len(self.terminado) + (len(self.archivo) if self.archivo is not None else 0)
+
+    def leer_terminados(self, desde=0, cantidad=None):
+        """
+        Los procesos terminados desde la posición `desde` (a lo más
+        `cantidad`), en el orden en que terminaron. Los del archivo se
+        reconstruyen con Proceso.from_dict.
+        """
+        if self.archivo is None:
+            return self.terminado[desde:None if cantidad is None else desde + cantidad]
+        return [Proceso.from_dict(datos) for datos in self.archivo.leer(desde, cantidad)]
+
+    def iterar_terminados(self):
+        """Todos los procesos terminados, de a uno."""
+        yield from self.terminado
+        if self.archivo is not None:
+            for datos in self.archivo:
+                yield Proceso.from_dict(datos)
+
+    def descartar_terminados(self):
+        """
+        Quita los procesos terminados de la simulación (sus ids quedan libres)
+        y los devuelve.
+        """
+        terminados, self.terminado = self.terminado, []
+        self.ids.difference_update(p.id for p in terminados)
+        return terminados
+
+    def iniciar(self):
+        if not self.simulacion_en_curso:
+            # Reiniciar el estado de la simulación, excepto 'nuevo' y 'terminado'
+            self.recursos.reiniciar()
+            self.denegados = {}
+            for nucleo in self.nucleos:
+                nucleo.listo = self.politica.crear_cola(self)
+                nucleo.proceso = None
+            self.listo = ColasNucleos(self.nucleos)
+            self.ejecutando = []
+            self.bloqueado = ColaOrdenada()
+        self.simulacion_en_curso = True
+        self.simulacion_pausada = False
+
+        # Mover procesos de 'Nuevo' a 'Listo'
+        while self.nuevo:
+            proceso = self.nuevo.popleft()
+            proceso.estado = 'Listo'
+            # Los procesos de una traza ya traen su paso de llegada, que puede
+            # ser anterior si esperaron memoria para ser admitidos
+            if proceso.tick_llegada is None:
+                proceso.tick_llegada = self.tick
+            self.listo.append(proceso)
+
+    def registrar_cambio(self, proceso, estado_anterior):
+        if self.cambios is not None:
+            self.cambios.append((self.tick, proceso, estado_anterior, proceso.estado, proceso.tamaño))
+
+    def paso(self):
+        """Realiza un paso de simulación."""
+        self.tick += 1
+        if self.recursos.grafo is not None:
+            self.recursos.grafo.tick = self.tick
+        if METRICAS.activo or METRICAS.captura is not None:
+            METRICAS.ejecutar_paso(self.fases())
+        else:
+            self.desbloquear_procesos()
+            self.asignar_procesos()
+            if self.interbloqueos == 'detectar':
+                self.resolver_interbloqueos()
+            self.ejecutar_procesos()
+        if self.memoria is not None:
+            self.estadisticas.registrar_paso(self.tick, self.memoria.ocupacion())
+
+        # Verificar si la simulación ha terminado
+        if not self.listo and not self.bloqueado and not self.ejecutando:
+            self.simulacion_en_curso = False
+
+    def fases(self):
+        """Las fases de un paso, en orden, como pares (nombre, método)."""
+        fases = [('desbloquear_procesos', self.desbloquear_procesos), ('asignar_procesos', self.asignar_procesos)]
+        if self.interbloqueos == 'detectar':
+            fases.append(('resolver_interbloqueos', self.resolver_interbloqueos))
+        fases.append(('ejecutar_procesos', self.ejecutar_procesos))
+        return fases
+
+    def run(self, n_ticks):
+        """Avanza hasta `n_ticks` pasos; devuelve cuántos se ejecutaron."""
+        ejecutados = 0
+        while ejecutados < n_ticks and self.simulacion_en_curso:
+            self.paso()
+            ejecutados += 1
+        return ejecutados
+
+    def run_registrando(self, n_ticks):
+        """
+        Igual que run, pero devuelve también los cambios de cada paso como
+        tuplas (tick, proceso, estado anterior, estado nuevo, tamaño).
+        """
+        self.cambios = []
+        try:
+            ejecutados = self.run(n_ticks)
+            return ejecutados, self.cambios
+        finally:
+            self.cambios = None
+
+    def run_con_cambios(self, n_ticks):
+        """
+        Igual que run_registrando, pero con el id del proceso en lugar del
+        objeto, para que el cliente pueda reproducir los cambios sin pedir el
+        estado completo.
+        """
+        ejecutados, cambios = self.run_registrando(n_ticks)
+        return ejecutados, [(tick, p.id, anterior, nuevo, tamaño) for tick, p, anterior, nuevo, tamaño in cambios]
+
+    def run_procesos_cambiados(self, n_ticks):
+        """Avanza hasta `n_ticks` pasos y devuelve los procesos que cambiaron."""
+        ejecutados, cambios = self.run_registrando(n_ticks)
+        return ejecutados, list({id(c[1]): c[1] for c in cambios}.values())
+
+    def run_until_done(self, max_ticks=None):
+        """Avanza hasta que no queden procesos por ejecutar (o hasta `max_ticks`)."""
+        ejecutados = 0
+        while self.simulacion_en_curso and (max_ticks is None or ejecutados < max_ticks):
+            self.paso()
+            ejecutados += 1
+        return ejecutados
+
+    def desbloquear_procesos(self):
+        # Solo se revisan los procesos que esperaban algún recurso liberado
+        # desde el paso anterior; los demás seguirían bloqueados
+        denegados = ()
+        if self.denegados and self.recursos.liberados:
+            # Con menos recursos ocupados el banquero puede aceptar ahora
+            denegados = self.denegados
+            self.denegados = {}
+        # Preeminentes primero y luego los demás, en el orden en que se
+        # bloquearon
+        candidatos = self.recursos.despertar(denegados)
+        if not candidatos:
+            return
+        if METRICAS.activo:
+            METRICAS.contar('procesos_despertados', len(candidatos))
+
+        bloqueado = self.bloqueado
+        for proceso in candidatos:
+            if self.recursos.disponibles(proceso):
+                self.recursos.asignar(proceso)
+                proceso.recursos_obtenidos = proceso.recursos_requeridos[:]
+                proceso.estado = 'Listo'
+                proceso.recursos_faltantes = []
+                proceso.ticks_bloqueado += self.tick - proceso.tick_bloqueo
+                bloqueado.remove(proceso)
+                self.recursos.dejar_de_esperar(proceso)
+                self.listo.append(proceso)
+                self.registrar_cambio(proceso, 'Bloqueado')
+                if METRICAS.activo:
+                    METRICAS.contar('procesos_desbloqueados')
+            else:
+                if self.adquisicion == 'parcial':
+                    self.retener_libres(proceso)
+                proceso.recursos_faltantes = self.recursos.faltantes(proceso)
+                self.recursos.esperar(proceso)
+
+    def despachar(self, proceso, nucleo):
+        proceso.estado = 'Ejecutando'
+        proceso.veces_ejecutando += 1
+        if proceso.tick_primera_ejecucion is None:
+            proceso.tick_primera_ejecucion = self.tick
+        proceso.nucleo = nucleo.indice
+        nucleo.proceso = proceso
+        self.ejecutando.append(proceso)
+        self.registrar_cambio(proceso, 'Listo')
+
+    def asignar_procesos(self):
+        recursos = self.recursos
+
+        for nucleo in self.nucleos:
+            # Se toman los procesos en el orden que define la política hasta
+            # que el núcleo quede ocupado
+            while nucleo.proceso is None:
+                listo = nucleo.listo
+                if not listo:
+                    if not self.robo_trabajo or self.n_cpus == 1:
+                        break
+                    # Robo de trabajo: tomar de la cola más larga
+                    listo = self.listo.mas_larga()
+                    if not listo:
+                        # No queda trabajo en ninguna cola
+                        return
+                proceso = listo.popleft()
+                if proceso.recursos_obtenidos == proceso.recursos_requeridos:
+                    self.despachar(proceso, nucleo)
+                elif recursos.disponibles(proceso):
+                    recursos.asignar(proceso)
+                    proceso.recursos_obtenidos = proceso.recursos_requeridos[:]
+                    self.despachar(proceso, nucleo)
+                else:
+                    if self.adquisicion == 'parcial':
+                        self.retener_libres(proceso)
+                    proceso.estado = 'Bloqueado'
+                    proceso.tick_bloqueo = self.tick
+                    proceso.recursos_faltantes = recursos.faltantes(proceso)
+                    self.bloqueado.append(proceso)
+                    recursos.esperar(proceso)
+                    self.registrar_cambio(proceso, 'Listo')
+
+    def retener_libres(self, proceso):
+        """
+        Adquisición parcial: el proceso que se bloquea toma los recursos que
+        le faltan y están libres. En modo 'evitar' solo si el estado que
+        resulta es seguro para el algoritmo del banquero.
+        """
+        recursos = self.recursos
+        libres = recursos.pendientes(proceso) & ~recursos.ocupados
+        if not libres:
+            return
+        if self.interbloqueos == 'evitar':
+            tiene = proceso.mascara_obtenida | libres
+            procesos = [(recursos.pendientes(p), p.mascara_obtenida)
+                        for p in recursos.grafo.retenedores() if p is not proceso]
+            procesos.append((recursos.mascara(proceso) & ~tiene, tiene))
+            if not estado_seguro(recursos.ocupados | libres, procesos):
+                self.estadisticas_interbloqueos.denegaciones += 1
+                self.denegados[proceso] = None
+                return
+        recursos.asignar(proceso, libres)
+        proceso.recursos_obtenidos = recursos.filtrar(proceso, proceso.mascara_obtenida)
+
+    def resolver_interbloqueos(self):
+        """
+        Busca los ciclos de espera que se formaron en este paso y rompe cada
+        uno quitándole sus recursos a una víctima: la que no tiene
+        preeminencia, tiene menos recursos y se bloqueó más tarde.
+        """
+        grafo = self.recursos.grafo
+        estadisticas = self.estadisticas_interbloqueos
+        while True:
+            ciclo = grafo.buscar_ciclo()
+            if ciclo is None:
+                return
+            bloqueado = self.bloqueado
+            victima = min(ciclo, key=lambda p: (
+                p.preeminencia, bin(p.mascara_obtenida).count('1'), -bloqueado.orden(p),
+            ))
+            estadisticas.detectados += 1
+            estadisticas.victimas += 1
+            # Un detector periódico lo habría visto en su primera revisión
+            # (en un múltiplo del período) desde que se formó
+            formado = grafo.formacion(ciclo)
+            visto = formado + -formado % self.periodo_deteccion
+            ahorro = max(0, visto - self.tick)
+            estadisticas.ticks_ahorrados += ahorro
+            estadisticas.procesos_ticks_ahorrados += ahorro * len(ciclo)
+
+            self.recursos.liberar(victima)
+            victima.recursos_obtenidos = []
+            victima.recursos_faltantes = self.recursos.faltantes(victima)
+            self.recursos.esperar(victima)
+            # Puede haber otro ciclo por los mismos procesos
+            for proceso in ciclo:
+                if proceso is not victima:
+                    grafo.revisar[proceso] = None
+
+    def ejecutar_procesos(self):
+        ejecutando = self.ejecutando
+
+        procesos_a_listo = []
+        procesos_terminados = []
+        for proceso in ejecutando:
+            nucleo = self.nucleos[proceso.nucleo]
+            nucleo.ticks_ocupado += 1
+             # Almacenar el tamaño anterior
+            tamaño_anterior = proceso.tamaño
+            # Reducir tamaño en 1 unidad por ciclo
+            proceso.tamaño -= 1
+            proceso.unidades_ejecutadas += 1
+
+            # Referencias a memoria de la unidad ejecutada
+            if self.paginacion is not None:
+                self.paginacion.ejecutar(proceso, self.memoria)
+
+            # Calcular la cantidad reducida
+            cantidad_reducida = tamaño_anterior - proceso.tamaño
+            # Actualizar la asignación de memoria
+            if self.memoria is not None:
+                success, msg = self.memoria.reduce_process_size(proceso.id, cantidad_reducida)
+                if not success:
+                    logger.warning("Error al reducir el tamaño del proceso '%s' en memoria: %s", proceso.id, msg)
+
+            if proceso.tamaño <= 0:
+                proceso.estado = 'Terminado'
+                proceso.tick_fin = self.tick
+                nucleo.proceso = None
+                procesos_terminados.append(proceso)
+                # Eliminar el proceso de la memoria
+                if self.memoria is not None:
+                    self.memoria.delete_process_memory(proceso.id)
+                if self.paginacion is not None:
+                    self.paginacion.olvidar(proceso.id)
+            elif self.politica.debe_expulsar(proceso, nucleo.listo):
+                # La política lo interrumpe (por ejemplo, agotó su quantum)
+                proceso.estado = 'Listo'
+                nucleo.proceso = None
+                procesos_a_listo.append(proceso)
+            else:
+                # Continúa ejecutando
+                proceso.estado = 'Ejecutando'
+            self.registrar_cambio(proceso, 'Ejecutando')
+
+        if not procesos_terminados and not procesos_a_listo:
+            return
+
+        # Remover procesos de 'Ejecutando' y actualizar estados
+        for proceso in procesos_terminados:
+            self.recursos.liberar(proceso)
+            proceso.recursos_obtenidos.clear()
+            self.estadisticas.registrar_terminado(proceso)
+
+        for proceso in procesos_a_listo:
+            if self.politica.libera_recursos_al_expulsar(proceso, self.rng):
+                self.recursos.liberar(proceso)
+                proceso.recursos_obtenidos.clear()
+            proceso.unidades_ejecutadas = 0  # Reiniciar contador de unidades ejecutadas
+
+        self.ejecutando = [p for p in ejecutando if p.estado == 'Ejecutando']
+        if self.archivo is not None:
+            # Sus ids pasan a buscarse en el archivo
+            self.archivo.agregar(procesos_terminados)
+            self.ids.difference_update(p.id for p in procesos_terminados)
+        else:
+            self.terminado.extend(procesos_terminados)
+        # Los procesos expulsados vuelven a la cola del núcleo donde corrían
+        for proceso in procesos_a_listo:
+            self.nucleos[proceso.nucleo].listo.append(proceso)
+
+    def resumen(self):
+        """
+        Estadísticas de toda la simulación: las de EstadisticasSimulacion más
+        la utilización de CPU (fracción de pasos-núcleo ocupados) y el
+        rendimiento (procesos terminados por paso).
+        """
+        resumen = self.estadisticas.como_dict()
+        ocupados = sum(nucleo.ticks_ocupado for nucleo in self.nucleos)
+        resumen['utilizacion_cpu'] = ocupados / (self.tick * self.n_cpus) if self.tick else 0.0
+        resumen['rendimiento'] = resumen['terminados'] / self.tick if self.tick else 0.0
+        resumen['ticks'] = self.tick
+        return resumen
+
+    def utilizacion_nucleos(self):
+        """Lista de (núcleo, pasos ocupado, fracción de pasos ocupado)."""
+        return [
+            (nucleo.indice, nucleo.ticks_ocupado, nucleo.ticks_ocupado / self.tick if self.tick else 0.0)
+            for nucleo in self.nucleos
+        ]
+
+
+def cargar_carga(ruta):
+    """
+    Lee un archivo de carga de trabajo: una lista JSON de procesos con las
+    claves 'id', 'tamaño', 'recursos' (opcional) y 'preeminencia' (opcional).
+    """
+    with open(ruta, encoding='utf-8') as archivo:
+        datos = json.load(archivo)
+    return [
+        Proceso(str(d['id']).lower(), d['tamaño'], list(d.get('recursos', [])), preeminencia=bool(d.get('preeminencia', False)))
+        for d in datos
+    ]
+
+
+def iterar_carga(n_procesos, rng, max_recursos=2, probabilidad_preeminencia=0.3, recursos=RECURSOS_DISPONIBLES):
+    """Genera de a uno los procesos de una carga aleatoria, usando el generador `rng`."""
+    for n in range(n_procesos):
+        yield Proceso(
+            f'p{n}', rng.randint(1, memory_manager.MAX_PROCESS_SIZE),
+            rng.sample(recursos, rng.randint(0, min(max_recursos, len(recursos)))),
+            preeminencia=rng.random() < probabilidad_preeminencia,
+        )
+
+
+def generar_carga(n_procesos, semilla=0, max_recursos=2, probabilidad_preeminencia=0.3, recursos=RECURSOS_DISPONIBLES):
+    """Genera una carga de trabajo aleatoria reproducible a partir de `semilla`."""
+    return list(iterar_carga(n_procesos, random.Random(semilla), max_recursos, probabilidad_preeminencia, recursos))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Ejecuta una simulación sin interfaz web.')
+    parser.add_argument('carga', help='archivo JSON con la lista de procesos')
+    parser.add_argument('--ticks', type=int, default=None, help='número máximo de pasos (por defecto hasta terminar)')
+    parser.add_argument('--semilla', type=int, default=None, help='semilla para el generador aleatorio')
+    parser.add_argument('--sin-memoria', action='store_true', help='no simular la asignación de memoria')
+    parser.add_argument('--politica', choices=sorted(POLITICAS), default='actual', help='política de planificación')
+    parser.add_argument('--quantum', type=int, default=None, help='quantum para las políticas rr y prioridad')
+    parser.add_argument('--cpus', type=int, default=1, help='número de núcleos de CPU')
+    parser.add_argument('--sin-robo', action='store_true', help='desactivar el robo de trabajo entre núcleos')
+    parser.add_argument('--paginacion', choices=sorted(POLITICAS_REEMPLAZO), default=None,
+                        help='simular paginación por demanda con esta política de reemplazo')
+    parser.add_argument('--adquisicion', choices=ADQUISICIONES, default='total',
+                        help="'parcial': los procesos bloqueados conservan los recursos que obtuvieron")
+    parser.add_argument('--interbloqueos', choices=MODOS_INTERBLOQUEO, default=None,
+                        help='detectar y romper interbloqueos, o evitarlos con el algoritmo del banquero')
+    parser.add_argument('--metricas', action='store_true',
+                        help='medir cada fase y mostrar las métricas en formato Prometheus al terminar')
+    parser.add_argument('--perfil', type=int, default=0, metavar='PASOS',
+                        help='ejecutar los primeros PASOS pasos bajo cProfile')
+    parser.add_argument('--perfil-salida', default='perfil_simulacion.prof', help='archivo donde guardar el perfil')
+    args = parser.parse_args(argv)
+    if args.paginacion and args.sin_memoria:
+        parser.error('--paginacion requiere simular la memoria')
+
+    memoria = None
+    if not args.sin_memoria:
+        memoria = memory_manager.MemoryManager(semilla=args.semilla)
+    paginacion = None
+    if args.paginacion:
+        paginacion = Paginador(args.paginacion, semilla=args.semilla or 0)
+    motor = MotorSimulacion(
+        memoria=memoria,
+        con_memoria=not args.sin_memoria,
+        politica=crear_politica(args.politica, args.quantum),
+        n_cpus=args.cpus,
+        robo_trabajo=not args.sin_robo,
+        paginacion=paginacion,
+        semilla=args.semilla,
+        adquisicion=args.adquisicion,
+        interbloqueos=args.interbloqueos,
+    )
+
+    rechazados = 0
+    for proceso in cargar_carga(args.carga):
+        success, msg = motor.agregar_proceso(proceso)
+        if not success:
+            rechazados += 1
+            print(f"Proceso '{proceso.id}' rechazado: {msg}")
+
+    if args.metricas:
+        METRICAS.activar()
+    if args.perfil > 0:
+        METRICAS.perfilar(args.perfil, args.perfil_salida)
+
+    inicio = time.perf_counter()
+    motor.iniciar()
+    ticks = motor.run_until_done(args.ticks)
+    duracion = time.perf_counter() - inicio
+
+    print(f"Pasos ejecutados: {ticks}")
+    print(f"Procesos terminados: {len(motor.terminado)}")
+    print(f"Procesos pendientes: {len(motor.listo) + len(motor.ejecutando) + len(motor.bloqueado)}")
+    print(f"Procesos rechazados: {rechazados}")
+    print(f"Tiempo: {duracion:.3f} s ({ticks / duracion if duracion else 0:.0f} pasos/s)")
+    imprimir_resumen(motor.resumen())
+    if motor.n_cpus > 1:
+        for indice, ocupado, fraccion in motor.utilizacion_nucleos():
+            print(f"Núcleo {indice}: {ocupado} pasos ocupado ({fraccion:.1%})")
+    if paginacion is not None:
+        e = paginacion.estadisticas
+        print(f"Paginación ({paginacion.politica}): {e.referencias} referencias, {e.fallos} fallos "
+              f"(tasa de fallos {e.tasa_fallos:.2%}, aciertos {e.tasa_aciertos:.2%}), "
+              f"swap in {e.swap_in}, swap out {e.swap_out}")
+    if motor.interbloqueos is not None:
+        e = motor.estadisticas_interbloqueos
+        print(f"Interbloqueos ({motor.interbloqueos}): {e.detectados} detectados, {e.victimas} víctimas, "
+              f"{e.denegaciones} asignaciones denegadas por el banquero")
+        print(f"Pasos entre la detección de cada ciclo y la revisión de un detector cada "
+              f"{motor.periodo_deteccion} pasos: {e.ticks_ahorrados} "
+              f"({e.procesos_ticks_ahorrados} pasos-proceso bloqueados)")
+    if args.perfil > 0:
+        # Si la simulación terminó antes, se guarda lo capturado hasta ahí
+        METRICAS.terminar_perfil()
+        print(f"Perfil de los primeros {min(args.perfil, ticks)} pasos en {args.perfil_salida}")
+    if args.metricas:
+        print(METRICAS.prometheus(), end='')
+
+
+if __name__ == '__main__':
+    main()
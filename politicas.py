@@ -0,0 +1,193 @@
+import heapq
+import random
+from collections import deque
+
+# Políticas de planificación de CPU. Cada política decide:
+#   - qué estructura usa la cola de listos (crear_cola), que debe ofrecer
+#     append/extend/popleft/__iter__/__len__,
+#   - cuándo se expulsa al proceso en ejecución (debe_expulsar, que recibe
+#     la cola de listos del núcleo donde corre),
+#   - si un proceso expulsado suelta sus recursos (libera_recursos_al_expulsar,
+#     que recibe el generador aleatorio de la simulación).
+
+
+class ColaListos:
+    """
+    Cola de procesos listos. Guarda los preeminentes y los demás en dos deques
+    separados, de modo que el siguiente proceso a despachar (el primer
+    preeminente, o el primero de los demás si no hay preeminentes) se obtiene
+    en O(1) sin recorrer ni reconstruir la cola. Cada proceso lleva su número
+    de llegada para poder recorrer la cola en el orden original.
+    """
+
+    def __init__(self, elementos=()):
+        self.preeminentes = deque()
+        self.normales = deque()
+        self._siguiente = 0
+        self.extend(elementos)
+
+    def append(self, proceso):
+        cola = self.preeminentes if proceso.preeminencia else self.normales
+        cola.append((self._siguiente, proceso))
+        self._siguiente += 1
+
+    def extend(self, procesos):
+        for proceso in procesos:
+            self.append(proceso)
+
+    def popleft(self):
+        cola = self.preeminentes or self.normales
+        return cola.popleft()[1]
+
+    def __iter__(self):
+        # Recorre en orden de llegada mezclando las dos colas
+        for _, proceso in heapq.merge(self.preeminentes, self.normales, key=lambda e: e[0]):
+            yield proceso
+
+    def __len__(self):
+        return len(self.preeminentes) + len(self.normales)
+
+
+class ColaPrioridad:
+    """
+    Montículo de procesos listos ordenado por `politica.clave(proceso, motor)`.
+    Insertar y sacar cuestan O(log n); el número de llegada desempata.
+    """
+
+    def __init__(self, politica, motor):
+        self.politica = politica
+        self.motor = motor
+        self.monticulo = []
+        self._siguiente = 0
+
+    def append(self, proceso):
+        clave = self.politica.clave(proceso, self.motor)
+        heapq.heappush(self.monticulo, (clave, self._siguiente, proceso))
+        self._siguiente += 1
+
+    def extend(self, procesos):
+        for proceso in procesos:
+            self.append(proceso)
+
+    def popleft(self):
+        return heapq.heappop(self.monticulo)[2]
+
+    def primero(self):
+        return self.monticulo[0][2]
+
+    def __iter__(self):
+        # Recorre en el orden en que se despacharían
+        for _, _, proceso in sorted(self.monticulo):
+            yield proceso
+
+    def __len__(self):
+        return len(self.monticulo)
+
+
+class PoliticaActual:
+    """
+    Comportamiento original del simulador: preeminentes primero, quantum de 5
+    unidades y 20% de probabilidad de que un proceso sin preeminencia expulsado
+    suelte sus recursos.
+    """
+    nombre = 'actual'
+    quantum = 5
+    probabilidad_liberar = 0.2
+
+    def crear_cola(self, motor):
+        return ColaListos()
+
+    def debe_expulsar(self, proceso, listo):
+        return proceso.unidades_ejecutadas >= self.quantum
+
+    def libera_recursos_al_expulsar(self, proceso, rng=random):
+        # Solo los procesos sin preeminencia tienen probabilidad de liberar recursos;
+        # los procesos con preeminencia retienen sus recursos
+        return not proceso.preeminencia and rng.random() < self.probabilidad_liberar
+
+
+class PoliticaFCFS:
+    """Primero en llegar, primero en ser atendido; sin expulsión."""
+    nombre = 'fcfs'
+
+    def crear_cola(self, motor):
+        return deque()
+
+    def debe_expulsar(self, proceso, listo):
+        return False
+
+    def libera_recursos_al_expulsar(self, proceso, rng=random):
+        return False
+
+
+class PoliticaRoundRobin(PoliticaFCFS):
+    """Cola FIFO con expulsión al agotar el quantum."""
+    nombre = 'rr'
+
+    def __init__(self, quantum=5):
+        self.quantum = quantum
+
+    def debe_expulsar(self, proceso, listo):
+        return proceso.unidades_ejecutadas >= self.quantum
+
+
+class PoliticaSJF(PoliticaFCFS):
+    """Trabajo más corto primero (según el tamaño restante); sin expulsión."""
+    nombre = 'sjf'
+
+    def crear_cola(self, motor):
+        return ColaPrioridad(self, motor)
+
+    def clave(self, proceso, motor):
+        return proceso.tamaño
+
+
+class PoliticaSRTF(PoliticaSJF):
+    """
+    Menor tiempo restante primero: el proceso en ejecución se expulsa en cuanto
+    hay uno listo con menos tamaño restante.
+    """
+    nombre = 'srtf'
+
+    def debe_expulsar(self, proceso, listo):
+        return bool(listo) and listo.primero().tamaño < proceso.tamaño
+
+
+class PoliticaPrioridad(PoliticaSJF):
+    """
+    Prioridad con envejecimiento. Los procesos preeminentes tienen prioridad 0
+    y los demás `prioridad_normal`; cada `envejecimiento` pasos de espera la
+    prioridad efectiva mejora en 1. Como todos envejecen al mismo ritmo, el
+    orden por `prioridad * envejecimiento + tick de llegada a la cola` es
+    equivalente y no cambia mientras el proceso espera, así que basta un
+    montículo.
+    """
+    nombre = 'prioridad'
+
+    def __init__(self, quantum=5, prioridad_normal=10, envejecimiento=2):
+        self.quantum = quantum
+        self.prioridad_normal = prioridad_normal
+        self.envejecimiento = envejecimiento
+
+    def clave(self, proceso, motor):
+        prioridad = 0 if proceso.preeminencia else self.prioridad_normal
+        return prioridad * self.envejecimiento + motor.tick
+
+    def debe_expulsar(self, proceso, listo):
+        return proceso.unidades_ejecutadas >= self.quantum
+
+
+POLITICAS = {
+    politica.nombre: politica
+    for politica in (PoliticaActual, PoliticaFCFS, PoliticaRoundRobin, PoliticaSJF, PoliticaSRTF, PoliticaPrioridad)
+}
+
+
+def crear_politica(nombre='actual', quantum=None):
+    """Crea la política `nombre`; `quantum` solo aplica a rr y prioridad."""
+    clase = POLITICAS.get(nombre)
+    if clase is None:
+        raise ValueError(f'Política desconocida: {nombre}')
+    if quantum is not None and clase in (PoliticaRoundRobin, PoliticaPrioridad):
+        return clase(quantum=quantum)
+    return clase()
@@ -0,0 +1,420 @@
+"""
+Paginación por demanda con reemplazo de páginas.
+
+Cada proceso tiene en RAM como máximo `max_ram_frames` páginas (3 por
+defecto); el resto está en ROM. Mientras se ejecuta, el proceso genera una
+cadena de referencias a sus páginas. Una referencia a una página que no está
+en RAM es un fallo de página: la página se sube a RAM y, si el proceso ya
+tiene todos sus marcos de RAM ocupados, la política de reemplazo elige qué
+página baja a ROM (FIFO, LRU, Clock o Óptimo).
+
+Además del Paginador, que se conecta al motor de simulación, el módulo
+incluye simular_traza, un camino rápido para reproducir trazas de millones
+de referencias con un número fijo de marcos, y marcos_para_tasa, que busca
+cuántos marcos hacen falta para no superar una tasa de fallos.
+"""
+import heapq
+import random
+from array import array
+from collections import OrderedDict, deque
+
+
+class EstadisticasPaginacion:
+    def __init__(self):
+        self.referencias = 0
+        self.fallos = 0
+        # Páginas subidas de ROM a RAM y bajadas de RAM a ROM
+        self.swap_in = 0
+        self.swap_out = 0
+
+    @property
+    def aciertos(self):
+        return self.referencias - self.fallos
+
+    @property
+    def tasa_fallos(self):
+        return self.fallos / self.referencias if self.referencias else 0.0
+
+    @property
+    def tasa_aciertos(self):
+        return self.aciertos / self.referencias if self.referencias else 0.0
+
+    def como_dict(self):
+        return {
+            'referencias': self.referencias,
+            'fallos': self.fallos,
+            'aciertos': self.aciertos,
+            'tasa_fallos': self.tasa_fallos,
+            'tasa_aciertos': self.tasa_aciertos,
+            'swap_in': self.swap_in,
+            'swap_out': self.swap_out,
+        }
+
+
+# Políticas de reemplazo para las páginas residentes de un proceso. Reciben la
+# traza del proceso y la posición de la referencia actual, que solo usa la
+# política óptima para mirar el futuro.
+
+class ReemplazoFIFO:
+    nombre = 'fifo'
+
+    def __init__(self):
+        self.orden = deque()
+
+    def __contains__(self, pagina):
+        return pagina in self.orden
+
+    def __len__(self):
+        return len(self.orden)
+
+    def __iter__(self):
+        return iter(self.orden)
+
+    def cargar(self, pagina, traza, posicion):
+        self.orden.append(pagina)
+
+    def acceder(self, pagina, traza, posicion):
+        pass
+
+    def quitar(self, pagina):
+        self.orden.remove(pagina)
+
+    def victima(self, traza, posicion):
+        return self.orden.popleft()
+
+
+class ReemplazoLRU:
+    nombre = 'lru'
+
+    def __init__(self):
+        # Del menos al más recientemente usado
+        self.orden = OrderedDict()
+
+    def __contains__(self, pagina):
+        return pagina in self.orden
+
+    def __len__(self):
+        return len(self.orden)
+
+    def __iter__(self):
+        return iter(self.orden)
+
+    def cargar(self, pagina, traza, posicion):
+        self.orden[pagina] = None
+
+    def acceder(self, pagina, traza, posicion):
+        self.orden.move_to_end(pagina)
+
+    def quitar(self, pagina):
+        del self.orden[pagina]
+
+    def victima(self, traza, posicion):
+        return self.orden.popitem(last=False)[0]
+
+
+class ReemplazoClock:
+    """Segunda oportunidad: se salta (y limpia) las páginas con el bit de uso."""
+    nombre = 'clock'
+
+    def __init__(self):
+        self.paginas = []
+        self.uso = {}
+        self.mano = 0
+
+    def __contains__(self, pagina):
+        return pagina in self.uso
+
+    def __len__(self):
+        return len(self.paginas)
+
+    def __iter__(self):
+        return iter(self.paginas)
+
+    def cargar(self, pagina, traza, posicion):
+        # La página entra detrás de la mano, como en un reloj circular
+        self.paginas.insert(self.mano, pagina)
+        self.mano = (self.mano + 1) % len(self.paginas)
+        self.uso[pagina] = True
+
+    def acceder(self, pagina, traza, posicion):
+        self.uso[pagina] = True
+
+    def quitar(self, pagina):
+        idx = self.paginas.index(pagina)
+        del self.paginas[idx]
+        del self.uso[pagina]
+        if idx < self.mano:
+            self.mano -= 1
+        if self.mano >= len(self.paginas):
+            self.mano = 0
+
+    def victima(self, traza, posicion):
+        while self.uso[self.paginas[self.mano]]:
+            self.uso[self.paginas[self.mano]] = False
+            self.mano = (self.mano + 1) % len(self.paginas)
+        pagina = self.paginas[self.mano]
+        self.quitar(pagina)
+        return pagina
+
+
+class ReemplazoOptimo:
+    """Baja la página que se vuelve a usar más tarde (o nunca)."""
+    nombre = 'optimo'
+
+    def __init__(self):
+        self.paginas = []
+
+    def __contains__(self, pagina):
+        return pagina in self.paginas
+
+    def __len__(self):
+        return len(self.paginas)
+
+    def __iter__(self):
+        return iter(self.paginas)
+
+    def cargar(self, pagina, traza, posicion):
+        self.paginas.append(pagina)
+
+    def acceder(self, pagina, traza, posicion):
+        pass
+
+    def quitar(self, pagina):
+        self.paginas.remove(pagina)
+
+    def victima(self, traza, posicion):
+        def proximo_uso(pagina):
+            try:
+                return traza.index(pagina, posicion + 1)
+            except ValueError:
+                return len(traza)
+        pagina = max(self.paginas, key=proximo_uso)
+        self.paginas.remove(pagina)
+        return pagina
+
+
+POLITICAS_REEMPLAZO = {
+    clase.nombre: clase
+    for clase in (ReemplazoFIFO, ReemplazoLRU, ReemplazoClock, ReemplazoOptimo)
+}
+
+
+def generar_referencias(n_paginas, n_referencias, rng=random, localidad=0.9, ventana=2):
+    """
+    Genera una cadena de referencias a las páginas 1..n_paginas con localidad:
+    con probabilidad `localidad` la referencia cae a menos de `ventana`
+    páginas de la anterior y si no salta a una página cualquiera.
+    """
+    traza = array('i')
+    actual = rng.randint(1, n_paginas)
+    for _ in range(n_referencias):
+        if rng.random() < localidad:
+            actual = min(n_paginas, max(1, actual + rng.randint(-ventana, ventana)))
+        else:
+            actual = rng.randint(1, n_paginas)
+        traza.append(actual)
+    return traza
+
+
+class Paginador:
+    """
+    Paginación por demanda de los procesos del motor de simulación.
+
+    En cada unidad que ejecuta un proceso se consumen `referencias_por_paso`
+    referencias de su traza, que se genera completa la primera vez que se
+    ejecuta (para que la política óptima pueda mirar el futuro). La memoria
+    debe ser una instancia de memory_manager.MemoryManager; la página que
+    falla se intercambia con la víctima en la tabla de marcos.
+    """
+
+    def __init__(self, politica='lru', referencias_por_paso=4, localidad=0.9, semilla=0):
+        self.politica = politica
+        self.clase = POLITICAS_REEMPLAZO[politica]
+        self.referencias_por_paso = referencias_por_paso
+        self.localidad = localidad
+        self.rng = random.Random(semilla)
+        self.estadisticas = EstadisticasPaginacion()
+        # Nombre del proceso -> [traza, posición, páginas residentes]
+        self.procesos = {}
+
+    def ejecutar(self, proceso, memoria):
+        """Ejecuta las referencias de una unidad de `proceso`."""
+        with memoria.lock:
+            proceso_memoria = memoria.processes.get(proceso.id)
+            if proceso_memoria is None:
+                return
+            estado = self.procesos.get(proceso.id)
+            if estado is None:
+                n_referencias = proceso.tamaño_inicial * self.referencias_por_paso
+                traza = generar_referencias(len(proceso_memoria.paginas), n_referencias, self.rng, self.localidad)
+                estado = self.procesos[proceso.id] = [traza, 0, self.clase()]
+            traza, inicio, residentes = estado
+
+            # Las páginas pueden haberse movido fuera del paginador (por
+            # ejemplo al reducir el tamaño del proceso)
+            en_ram = proceso_memoria.paginas_ram
+            for pagina in [p for p in residentes if p not in en_ram]:
+                residentes.quitar(pagina)
+            for pagina in en_ram:
+                if pagina not in residentes:
+                    residentes.cargar(pagina, traza, inicio)
+
+            fin = min(inicio + self.referencias_por_paso, len(traza))
+            estadisticas = self.estadisticas
+            for posicion in range(inicio, fin):
+                pagina = traza[posicion]
+                estadisticas.referencias += 1
+                if pagina in residentes:
+                    residentes.acceder(pagina, traza, posicion)
+                    continue
+                estadisticas.fallos += 1
+                if len(residentes) < memoria.max_ram_frames and memoria.subir_pagina(proceso.id, pagina):
+                    estadisticas.swap_in += 1
+                elif residentes:
+                    victima = residentes.victima(traza, posicion)
+                    memoria.intercambiar_paginas(proceso.id, pagina, victima)
+                    estadisticas.swap_in += 1
+                    estadisticas.swap_out += 1
+                else:
+                    # Sin marcos de RAM para el proceso no se puede subir la página
+                    continue
+                residentes.cargar(pagina, traza, posicion)
+            estado[1] = fin
+
+    def olvidar(self, nombre):
+        self.procesos.pop(nombre, None)
+
+
+# Camino rápido: reproduce una traza completa con `marcos` marcos y devuelve
+# las estadísticas. Cada política tiene su propio bucle sin llamadas a métodos.
+
+def _fallos_fifo(traza, marcos):
+    residentes = set()
+    orden = deque()
+    fallos = 0
+    for pagina in traza:
+        if pagina in residentes:
+            continue
+        fallos += 1
+        if len(orden) == marcos:
+            residentes.discard(orden.popleft())
+        orden.append(pagina)
+        residentes.add(pagina)
+    return fallos
+
+
+def _fallos_lru(traza, marcos):
+    residentes = OrderedDict()
+    mover = residentes.move_to_end
+    fallos = 0
+    for pagina in traza:
+        if pagina in residentes:
+            mover(pagina)
+            continue
+        fallos += 1
+        if len(residentes) == marcos:
+            residentes.popitem(last=False)
+        residentes[pagina] = None
+    return fallos
+
+
+def _fallos_clock(traza, marcos):
+    paginas = [None] * marcos
+    uso = bytearray(marcos)
+    posicion = {}
+    mano = 0
+    fallos = 0
+    for pagina in traza:
+        idx = posicion.get(pagina)
+        if idx is not None:
+            uso[idx] = 1
+            continue
+        fallos += 1
+        while uso[mano]:
+            uso[mano] = 0
+            mano = (mano + 1) % marcos
+        anterior = paginas[mano]
+        if anterior is not None:
+            del posicion[anterior]
+        paginas[mano] = pagina
+        posicion[pagina] = mano
+        uso[mano] = 1
+        mano = (mano + 1) % marcos
+    return fallos
+
+
+def _fallos_optimo(traza, marcos):
+    n = len(traza)
+    # siguiente[i]: próxima posición en que se referencia traza[i] (n si nunca)
+    siguiente = array('l', [n]) * n
+    ultima = {}
+    for i in range(n - 1, -1, -1):
+        pagina = traza[i]
+        siguiente[i] = ultima.get(pagina, n)
+        ultima[pagina] = i
+
+    # Montículo de (-próximo uso, página) con entradas viejas que se descartan
+    # al sacarlas; proximo[página] es el próximo uso vigente de cada residente
+    proximo = {}
+    monticulo = []
+    fallos = 0
+    for i in range(n):
+        pagina = traza[i]
+        if pagina not in proximo:
+            fallos += 1
+            if len(proximo) == marcos:
+                while True:
+                    uso, victima = heapq.heappop(monticulo)
+                    if proximo.get(victima) == -uso:
+                        del proximo[victima]
+                        break
+        proximo[pagina] = siguiente[i]
+        heapq.heappush(monticulo, (-siguiente[i], pagina))
+        # Evita que el montículo crezca sin límite con entradas viejas
+        if len(monticulo) > 8 * marcos + 64:
+            monticulo = [(-uso, p) for p, uso in proximo.items()]
+            heapq.heapify(monticulo)
+    return fallos
+
+
+_FALLOS = {
+    'fifo': _fallos_fifo,
+    'lru': _fallos_lru,
+    'clock': _fallos_clock,
+    'optimo': _fallos_optimo,
+}
+
+
+def simular_traza(traza, marcos, politica='lru'):
+    """Reproduce `traza` con `marcos` marcos de RAM; devuelve EstadisticasPaginacion."""
+    if marcos < 1:
+        raise ValueError('Se necesita al menos un marco')
+    fallos = _FALLOS[politica](traza, marcos)
+    estadisticas = EstadisticasPaginacion()
+    estadisticas.referencias = len(traza)
+    estadisticas.fallos = fallos
+    estadisticas.swap_in = fallos
+    # Los primeros fallos llenan marcos libres y no bajan ninguna página
+    estadisticas.swap_out = max(0, fallos - min(marcos, len(set(traza))))
+    return estadisticas
+
+
+def marcos_para_tasa(traza, tasa_objetivo, politica='lru', max_marcos=None):
+    """
+    Menor número de marcos con el que la tasa de fallos de `traza` no supera
+    `tasa_objetivo`, buscado por bisección (None si ni con max_marcos alcanza).
+    Con FIFO la tasa no siempre baja al agregar marcos (anomalía de Belady),
+    así que el resultado es aproximado.
+    """
+    if max_marcos is None:
+        max_marcos = max(1, len(set(traza)))
+    if simular_traza(traza, max_marcos, politica).tasa_fallos > tasa_objetivo:
+        return None
+    bajo, alto = 1, max_marcos
+    while bajo < alto:
+        medio = (bajo + alto) // 2
+        if simular_traza(traza, medio, politica).tasa_fallos <= tasa_objetivo:
+            alto = medio
+        else:
+            bajo = medio + 1
+    return bajo
@@ -0,0 +1,67 @@
+import os
+import pickle
+
+import archivo_terminados
+from archivo_terminados import REGISTROS_POR_BLOQUE, ArchivoTerminados
+from motor_simulacion import Proceso
+
+
+def procesos(desde, hasta):
+    return [Proceso(f'p{n}', n % 7 + 1, ['Recurso1'] if n % 2 else []) for n in range(desde, hasta)]
+
+
+def test_leer_por_paginas(tmp_path):
+    archivo = ArchivoTerminados(str(tmp_path / 'terminados.jsonl'))
+    total = 3 * REGISTROS_POR_BLOQUE + 17
+    for inicio in range(0, total, 100):
+        archivo.agregar(procesos(inicio, min(total, inicio + 100)))
+    assert len(archivo) == total
+
+    for desde in (0, 1, REGISTROS_POR_BLOQUE - 1, REGISTROS_POR_BLOQUE, 2 * REGISTROS_POR_BLOQUE + 5):
+        pagina = archivo.leer(desde, 50)
+        assert [r['id'] for r in pagina] == [f'p{n}' for n in range(desde, desde + 50)]
+    assert [r['id'] for r in archivo.leer(total - 3, 50)] == [f'p{n}' for n in range(total - 3, total)]
+    assert archivo.leer(total, 10) == []
+    assert [r['id'] for r in archivo] == [f'p{n}' for n in range(total)]
+    assert archivo.leer(5, 1)[0] == procesos(5, 6)[0].to_dict()
+
+
+def test_contiene(tmp_path):
+    archivo = ArchivoTerminados(str(tmp_path / 'terminados.jsonl'))
+    total = 5000
+    archivo.agregar(procesos(0, total))
+    # La tabla de ids creció para mantenerse a menos de la mitad
+    assert archivo.capacidad >= 2 * total
+    assert all(archivo.contiene(f'p{n}') for n in range(0, total, 7))
+    assert not any(archivo.contiene(f'q{n}') for n in range(1000))
+    assert not archivo.contiene(f'p{total}')
+
+    # El estado serializado sigue encontrando los ids
+    copia = pickle.loads(pickle.dumps(archivo))
+    assert copia.contiene('p123') and not copia.contiene('p-1')
+
+
+def test_descarta_lo_escrito_sin_guardar_el_estado(tmp_path):
+    archivo = ArchivoTerminados(str(tmp_path / 'terminados.jsonl'))
+    archivo.agregar(procesos(0, 10))
+    guardado = pickle.dumps(archivo)
+    # Se escribe más, pero el estado que queda es el anterior
+    archivo.agregar(procesos(10, 20))
+    archivo = pickle.loads(guardado)
+    assert not archivo.contiene('p15')
+
+    archivo.agregar(procesos(30, 35))
+    assert len(archivo) == 15
+    assert [r['id'] for r in archivo] == [f'p{n}' for n in [*range(10), *range(30, 35)]]
+    assert archivo.contiene('p32') and not archivo.contiene('p15')
+
+
+def test_eliminar(tmp_path):
+    ruta = str(tmp_path / 'terminados.jsonl')
+    archivo = ArchivoTerminados(ruta)
+    archivo.agregar(procesos(0, 3))
+    archivo.eliminar()
+    assert not os.path.exists(ruta)
+    assert not os.path.exists(archivo.ruta_indice)
+    # Borrar lo que ya no existe no es un error
+    archivo_terminados.eliminar_archivo(ruta)
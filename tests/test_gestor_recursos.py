@@ -0,0 +1,82 @@
+from gestor_recursos import GestorRecursos
+from motor_simulacion import Proceso
+
+
+def bloquear(gestor, *procesos):
+    for proceso in procesos:
+        assert not gestor.disponibles(proceso)
+        gestor.esperar(proceso)
+
+
+def test_despertar_preeminentes_primero_y_en_orden_de_bloqueo():
+    gestor = GestorRecursos(['A', 'B'])
+    dueno = Proceso('d', 1, ['A'])
+    gestor.asignar(dueno)
+    p1 = Proceso('p1', 1, ['A'])
+    p2 = Proceso('p2', 1, ['A', 'B'])
+    p3 = Proceso('p3', 1, ['A'], preeminencia=True)
+    p4 = Proceso('p4', 1, ['A'])
+    bloquear(gestor, p1, p2, p3, p4)
+
+    assert gestor.despertar() == []
+    gestor.liberar(dueno)
+    assert gestor.despertar() == [p3, p1, p2, p4]
+    # Solo una vez por liberación
+    assert gestor.despertar() == []
+
+
+def test_despertar_mezcla_varios_recursos_sin_repetidos():
+    gestor = GestorRecursos(['A', 'B', 'C'])
+    dueno_a = Proceso('da', 1, ['A'])
+    dueno_b = Proceso('db', 1, ['B'])
+    gestor.asignar(dueno_a)
+    gestor.asignar(dueno_b)
+    p1 = Proceso('p1', 1, ['B'])
+    p2 = Proceso('p2', 1, ['A', 'B'])
+    p3 = Proceso('p3', 1, ['A'])
+    p4 = Proceso('p4', 1, ['C', 'B'])
+    bloquear(gestor, p1, p2, p3, p4)
+
+    gestor.liberar(dueno_a)
+    gestor.liberar(dueno_b)
+    assert gestor.despertar() == [p1, p2, p3, p4]
+
+
+def test_despertar_incluye_otros_en_su_turno():
+    gestor = GestorRecursos(['A', 'B'])
+    dueno_a = Proceso('da', 1, ['A'])
+    dueno_b = Proceso('db', 1, ['B'])
+    gestor.asignar(dueno_a)
+    gestor.asignar(dueno_b)
+    p1 = Proceso('p1', 1, ['B'])
+    p2 = Proceso('p2', 1, ['A'])
+    p3 = Proceso('p3', 1, ['A'])
+    bloquear(gestor, p1, p2, p3)
+
+    gestor.liberar(dueno_a)
+    assert gestor.despertar([p1, p3]) == [p1, p2, p3]
+
+
+def test_dejar_de_esperar_quita_del_indice():
+    gestor = GestorRecursos(['A'])
+    dueno = Proceso('d', 1, ['A'])
+    gestor.asignar(dueno)
+    p1 = Proceso('p1', 1, ['A'])
+    p2 = Proceso('p2', 1, ['A'])
+    bloquear(gestor, p1, p2)
+
+    gestor.dejar_de_esperar(p1)
+    gestor.liberar(dueno)
+    assert gestor.despertar() == [p2]
+
+
+def test_faltantes_en_el_orden_en_que_se_pidieron():
+    gestor = GestorRecursos(['A', 'B', 'C'])
+    dueno = Proceso('d', 1, ['A', 'C'])
+    gestor.asignar(dueno)
+    proceso = Proceso('p', 1, ['C', 'B', 'A'])
+    assert gestor.faltantes(proceso) == ['C', 'A']
+    gestor.esperar(proceso)
+    gestor.liberar(dueno)
+    assert gestor.faltantes(proceso) == []
+
@@ -0,0 +1,73 @@
+import pytest
+
+import app as aplicacion
+
+
+@pytest.fixture
+def cliente(tmp_path, monkeypatch):
+    monkeypatch.setattr(aplicacion, 'DIRECTORIO_TERMINADOS', str(tmp_path))
+    monkeypatch.setattr(aplicacion, 'EXPIRACION_SIMULACIONES', 0)
+    aplicacion.app.config['TESTING'] = True
+    return aplicacion.app.test_client()
+
+
+def delta(cliente, version=-1, instancia=None):
+    parametros = {'since': version}
+    if instancia is not None:
+        parametros['instancia'] = instancia
+    return cliente.get('/memoria/delta', query_string=parametros).get_json()
+
+
+def memoria_de(cliente):
+    with cliente.session_transaction() as sesion:
+        simulacion_id = sesion['simulacion_id']
+    return aplicacion.almacen_estado.obtener(simulacion_id).memoria
+
+
+def test_sin_version_devuelve_la_memoria_completa(cliente):
+    for n in range(3):
+        cliente.post('/agregar_proceso', data={'id_proceso': f'p{n}', 'tamaño': '5'})
+    datos = delta(cliente)
+    assert datos['completo']
+    assert {p['name'] for p in datos['procesos']} >= {'p0', 'p1', 'p2'}
+    memoria = memoria_de(cliente)
+    assert len(datos['marcos']) == memoria.n_ram + memoria.n_rom
+
+
+def test_la_version_solo_sube_con_cambios(cliente):
+    cliente.post('/agregar_proceso', data={'id_proceso': 'p0', 'tamaño': '5'})
+    datos = delta(cliente)
+    version, instancia = datos['version'], datos['instancia']
+
+    # Sin cambios: misma versión y nada que enviar
+    datos = delta(cliente, version, instancia)
+    assert not datos['completo']
+    assert datos['version'] == version
+    assert datos['marcos'] == [] and datos['procesos'] == [] and datos['eliminados'] == []
+
+    # Operaciones que fallan no cambian la memoria
+    memoria = memoria_de(cliente)
+    assert not memoria.delete_process_memory('no_existe')
+    assert not memoria.reduce_process_size('no_existe', 1)[0]
+    assert memoria.version == version
+
+    # Agregar un proceso sí
+    cliente.post('/agregar_proceso', data={'id_proceso': 'p1', 'tamaño': '5'})
+    datos = delta(cliente, version, instancia)
+    assert not datos['completo']
+    assert datos['version'] > version
+    assert [p['name'] for p in datos['procesos']] == ['p1']
+    assert datos['marcos']
+    assert delta(cliente, datos['version'], instancia)['marcos'] == []
+
+
+def test_otra_instancia_devuelve_la_memoria_completa(cliente):
+    cliente.post('/agregar_proceso', data={'id_proceso': 'p0', 'tamaño': '5'})
+    datos = delta(cliente)
+    assert delta(cliente, datos['version'], 'otra')['completo']
+
+    # Después de reiniciar la memoria es otra aunque la versión coincida
+    cliente.get('/reiniciar_simulacion')
+    nuevos = delta(cliente, datos['version'], datos['instancia'])
+    assert nuevos['completo']
+    assert nuevos['instancia'] != datos['instancia']
@@ -0,0 +1,72 @@
+import random
+
+import pytest
+
+from reemplazo_paginas import POLITICAS_REEMPLAZO, marcos_para_tasa, simular_traza
+
+# Cadena de referencias del libro de Silberschatz (Operating System Concepts)
+SILBERSCHATZ = [7, 0, 1, 2, 0, 3, 0, 4, 2, 3, 0, 3, 2, 1, 2, 0, 1, 7, 0, 1]
+
+# Cadena con la que FIFO muestra la anomalía de Belady
+BELADY = [1, 2, 3, 4, 1, 2, 5, 1, 2, 3, 4, 5]
+
+
+def fallos_con_politica(traza, marcos, politica):
+    # El mismo recorrido que hace Paginador.ejecutar, sin la memoria
+    residentes = POLITICAS_REEMPLAZO[politica]()
+    fallos = 0
+    for posicion, pagina in enumerate(traza):
+        if pagina in residentes:
+            residentes.acceder(pagina, traza, posicion)
+            continue
+        fallos += 1
+        if len(residentes) == marcos:
+            residentes.victima(traza, posicion)
+        residentes.cargar(pagina, traza, posicion)
+    return fallos
+
+
+@pytest.mark.parametrize('politica, fallos', [('fifo', 15), ('lru', 12), ('clock', 14), ('optimo', 9)])
+def test_fallos_cadena_conocida(politica, fallos):
+    estadisticas = simular_traza(SILBERSCHATZ, 3, politica)
+    assert estadisticas.referencias == len(SILBERSCHATZ)
+    assert estadisticas.fallos == fallos
+    assert estadisticas.swap_in == fallos
+    assert estadisticas.swap_out == fallos - 3
+    assert fallos_con_politica(SILBERSCHATZ, 3, politica) == fallos
+
+
+def test_anomalia_de_belady():
+    assert simular_traza(BELADY, 3, 'fifo').fallos == 9
+    assert simular_traza(BELADY, 4, 'fifo').fallos == 10
+    assert simular_traza(BELADY, 4, 'lru').fallos == 8
+
+
+@pytest.mark.parametrize('politica', sorted(POLITICAS_REEMPLAZO))
+def test_camino_rapido_coincide_con_las_politicas(politica):
+    rng = random.Random(0)
+    for _ in range(50):
+        traza = [rng.randrange(10) for _ in range(200)]
+        marcos = rng.randint(1, 8)
+        assert simular_traza(traza, marcos, politica).fallos == fallos_con_politica(traza, marcos, politica)
+
+
+def test_optimo_no_supera_a_las_demas():
+    rng = random.Random(1)
+    traza = [rng.randrange(12) for _ in range(500)]
+    for marcos in range(1, 12):
+        optimo = simular_traza(traza, marcos, 'optimo').fallos
+        for politica in ('fifo', 'lru', 'clock'):
+            assert optimo <= simular_traza(traza, marcos, politica).fallos
+
+
+def test_marcos_para_tasa():
+    # Hay 6 páginas distintas: con 6 marcos solo falla la primera referencia
+    # a cada una (6 de 200) y con 5 LRU falla el 12,5%
+    assert marcos_para_tasa(SILBERSCHATZ * 10, 0.05, 'lru') == 6
+    assert marcos_para_tasa(SILBERSCHATZ, 0.0, 'lru') is None
+
+
+def test_simular_traza_requiere_marcos():
+    with pytest.raises(ValueError):
+        simular_traza(SILBERSCHATZ, 0)
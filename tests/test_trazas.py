@@ -0,0 +1,55 @@
+from memory_manager import MemoryManager
+from motor_simulacion import MotorSimulacion, generar_carga
+from politicas import crear_politica
+from trazas import escribir_traza, generar_traza, iterar_traza, leer_traza, linea_traza, reproducir
+
+
+def campos(proceso):
+    return proceso.id, proceso.tamaño_inicial, proceso.recursos_requeridos, proceso.preeminencia
+
+
+def test_escribir_y_leer_traza(tmp_path):
+    registros = list(generar_traza(200, semilla=4))
+    for nombre in ('traza.jsonl', 'traza.jsonl.gz'):
+        ruta = str(tmp_path / nombre)
+        assert escribir_traza(ruta, registros) == len(registros)
+        leidos = list(leer_traza(ruta))
+        assert [(llegada, campos(p)) for llegada, p in leidos] == [(llegada, campos(p)) for llegada, p in registros]
+
+
+def test_reproducir_igual_a_la_ejecucion_original():
+    # Ejecución original: todos los procesos entran en el paso 0
+    original = MotorSimulacion(con_memoria=False, politica=crear_politica('rr', 3), n_cpus=2, semilla=5)
+    procesos = generar_carga(60, semilla=5)
+    for proceso in procesos:
+        assert original.agregar_proceso(proceso)[0]
+    original.iniciar()
+    original.run(10**6)
+    fin_original = {p.id: (p.tick_fin, p.ticks_bloqueado) for p in procesos}
+
+    # La traza exportada de esa ejecución, reproducida en un motor nuevo
+    lineas = [linea_traza(p.tick_llegada, p) for p in procesos]
+    reproducidos = []
+
+    def registros():
+        for llegada, proceso in iterar_traza(lineas):
+            reproducidos.append(proceso)
+            yield llegada, proceso
+
+    motor = MotorSimulacion(con_memoria=False, politica=crear_politica('rr', 3), n_cpus=2, semilla=5)
+    resumen = reproducir(motor, registros())
+    assert resumen['admitidos'] == resumen['terminados'] == len(procesos)
+    assert resumen['ticks'] == original.tick
+    assert {p.id: (p.tick_fin, p.ticks_bloqueado) for p in reproducidos} == fin_original
+    assert motor.resumen() == original.resumen()
+
+
+def test_reproducir_con_memoria_es_determinista():
+    registros = list(generar_traza(300, semilla=2, llegadas_por_paso=0.5))
+    lineas = [linea_traza(llegada, proceso) for llegada, proceso in registros]
+    resultados = []
+    for _ in range(2):
+        motor = MotorSimulacion(memoria=MemoryManager(semilla=7), semilla=7)
+        resultados.append((reproducir(motor, iterar_traza(lineas)), motor.resumen()))
+    assert resultados[0] == resultados[1]
+    assert resultados[0][0]['admitidos'] + resultados[0][0]['rechazados'] == len(registros)
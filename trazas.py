@@ -0,0 +1,226 @@
+"""
+Trazas de carga de trabajo en formato JSON Lines.
+
+Cada línea es un proceso con el paso en que llega:
+
+    {"llegada":0,"id":"p0","tamaño":12,"recursos":["Recurso1"],"preeminencia":true}
+
+'recursos' y 'preeminencia' se omiten cuando están vacíos o en False. Las
+líneas van ordenadas por llegada. Los archivos terminados en .gz se leen y
+escriben comprimidos, y '-' es la entrada o la salida estándar.
+
+La lectura y la reproducción procesan una línea a la vez, de modo que una
+traza de millones de procesos se reproduce sin cargarla completa en memoria.
+
+Uso (desde la raíz del repositorio):
+    python trazas.py generar traza.jsonl.gz --procesos 1000000 --semilla 0
+    python trazas.py reproducir traza.jsonl.gz --semilla 0 [--cpus N] [--politica P]
+"""
+import argparse
+import contextlib
+import gzip
+import json
+import logging
+import random
+import sys
+import time
+
+import memory_manager
+from estadisticas import imprimir_resumen
+from motor_simulacion import RECURSOS_DISPONIBLES, MotorSimulacion, Proceso, iterar_carga
+from politicas import POLITICAS, crear_politica
+
+# Nivel de compresión de las trazas .gz (el de la herramienta gzip; el 9 de
+# gzip.open por defecto es mucho más lento y casi no reduce el tamaño)
+NIVEL_COMPRESION = 6
+
+# Codificador compacto reutilizado para todas las líneas
+_codificar = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+
+
+@contextlib.contextmanager
+def abrir_traza(ruta, modo='r'):
+    """Abre una traza para leer ('r') o escribir ('w') como texto."""
+    if ruta == '-':
+        yield sys.stdin if modo == 'r' else sys.stdout
+    elif str(ruta).endswith('.gz'):
+        with gzip.open(ruta, modo + 't', compresslevel=NIVEL_COMPRESION, encoding='utf-8') as archivo:
+            yield archivo
+    else:
+        with open(ruta, modo, encoding='utf-8') as archivo:
+            yield archivo
+
+
+def linea_traza(llegada, proceso):
+    """Línea JSON de un proceso (sin el salto de línea)."""
+    datos = {'llegada': llegada, 'id': proceso.id, 'tamaño': proceso.tamaño_inicial}
+    if proceso.recursos_requeridos:
+        datos['recursos'] = proceso.recursos_requeridos
+    if proceso.preeminencia:
+        datos['preeminencia'] = True
+    return _codificar(datos)
+
+
+def iterar_traza(lineas):
+    """
+    Genera (llegada, Proceso) a partir de las líneas de una traza (un archivo
+    abierto o cualquier iterable de cadenas). Las líneas vacías se ignoran.
+    """
+    for numero, linea in enumerate(lineas, start=1):
+        if not linea.strip():
+            continue
+        try:
+            d = json.loads(linea)
+            yield int(d['llegada']), Proceso(
+                str(d['id']).lower(), d['tamaño'], list(d.get('recursos', [])),
+                preeminencia=bool(d.get('preeminencia', False)),
+            )
+        except (ValueError, KeyError, TypeError) as error:
+            raise ValueError(f'Línea {numero} de la traza inválida: {error}') from None
+
+
+def leer_traza(ruta):
+    """Como iterar_traza, leyendo el archivo `ruta`."""
+    with abrir_traza(ruta) as archivo:
+        yield from iterar_traza(archivo)
+
+
+def escribir_traza(ruta, registros):
+    """Escribe los pares (llegada, proceso) de `registros`; devuelve cuántos escribió."""
+    n = 0
+    with abrir_traza(ruta, 'w') as archivo:
+        for llegada, proceso in registros:
+            archivo.write(linea_traza(llegada, proceso) + '\n')
+            n += 1
+    return n
+
+
+def generar_traza(n_procesos, semilla=0, llegadas_por_paso=0.05, recursos=RECURSOS_DISPONIBLES):
+    """
+    Genera (llegada, Proceso) para una carga aleatoria reproducible. Los
+    tiempos entre llegadas son exponenciales, con `llegadas_por_paso`
+    procesos por paso en promedio.
+    """
+    rng = random.Random(semilla)
+    tiempo = 0.0
+    for proceso in iterar_carga(n_procesos, rng, recursos=recursos):
+        yield int(tiempo), proceso
+        tiempo += rng.expovariate(llegadas_por_paso)
+
+
+def reproducir(motor, registros, max_ticks=None):
+    """
+    Reproduce una traza en el motor: cada proceso se agrega en su paso de
+    llegada, que queda en su tick_llegada. Si no hay memoria para él, la
+    traza espera (sin leer más) hasta que algún proceso termine; si no cabe
+    ni con el sistema vacío, se rechaza. Mientras no hay procesos, el reloj salta a la siguiente llegada.
+
+    Los procesos terminados se descartan después de cada paso, de modo que la
+    memoria usada depende de los procesos vivos y no del largo de la traza;
+    sus tiempos quedan en las estadísticas del motor (motor.resumen()).
+    Devuelve un dict con los totales de la reproducción.
+    """
+    registros = iter(registros)
+    siguiente = None
+    admitidos = rechazados = 0
+    pasos = 0
+
+    while max_ticks is None or pasos < max_ticks:
+        # Admitir los procesos que ya llegaron
+        while True:
+            if siguiente is None:
+                siguiente = next(registros, None)
+                if siguiente is None:
+                    break
+            llegada, proceso = siguiente
+            if llegada > motor.tick:
+                break
+            # El retorno y la respuesta se cuentan desde la llegada en la
+            # traza, incluido lo que el proceso espere por memoria
+            proceso.tick_llegada = llegada
+            success, _ = motor.agregar_proceso(proceso)
+            if success:
+                admitidos += 1
+            elif motor.simulacion_en_curso or motor.nuevo:
+                # Espera a que algún proceso termine y libere memoria
+                break
+            else:
+                rechazados += 1
+            siguiente = None
+        if motor.nuevo:
+            motor.iniciar()
+
+        if not motor.simulacion_en_curso:
+            if siguiente is None:
+                break
+            # Sistema vacío: avanzar el reloj hasta la siguiente llegada
+            motor.tick = max(motor.tick, siguiente[0])
+            continue
+
+        motor.paso()
+        pasos += 1
+        motor.descartar_terminados()
+
+    estadisticas = motor.estadisticas
+    return {
+        'ticks': motor.tick,
+        'pasos': pasos,
+        'admitidos': admitidos,
+        'rechazados': rechazados,
+        'terminados': estadisticas.terminados,
+        'retorno': estadisticas.retorno.promedio,
+        'espera': estadisticas.espera.promedio,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Genera y reproduce trazas de carga de trabajo (JSON Lines).')
+    subparsers = parser.add_subparsers(dest='comando', required=True)
+
+    generar = subparsers.add_parser('generar', help='generar una traza aleatoria')
+    generar.add_argument('salida', help="archivo de salida (.jsonl o .jsonl.gz; '-' para la salida estándar)")
+    generar.add_argument('--procesos', type=int, default=1000)
+    generar.add_argument('--semilla', type=int, default=0)
+    generar.add_argument('--llegadas', type=float, default=0.05, help='procesos que llegan por paso, en promedio')
+
+    reproducir_parser = subparsers.add_parser('reproducir', help='reproducir una traza sin interfaz web')
+    reproducir_parser.add_argument('traza', help="archivo de la traza ('-' para la entrada estándar)")
+    reproducir_parser.add_argument('--semilla', type=int, default=0, help='semilla de la simulación')
+    reproducir_parser.add_argument('--ticks', type=int, default=None, help='número máximo de pasos')
+    reproducir_parser.add_argument('--sin-memoria', action='store_true', help='no simular la asignación de memoria')
+    reproducir_parser.add_argument('--politica', choices=sorted(POLITICAS), default='actual', help='política de planificación')
+    reproducir_parser.add_argument('--quantum', type=int, default=None, help='quantum para las políticas rr y prioridad')
+    reproducir_parser.add_argument('--cpus', type=int, default=1, help='número de núcleos de CPU')
+    args = parser.parse_args(argv)
+
+    if args.comando == 'generar':
+        inicio = time.perf_counter()
+        n = escribir_traza(args.salida, generar_traza(args.procesos, args.semilla, args.llegadas))
+        print(f"{n} procesos escritos en {time.perf_counter() - inicio:.2f} s", file=sys.stderr)
+        return
+
+    memoria = None if args.sin_memoria else memory_manager.MemoryManager(semilla=args.semilla)
+    motor = MotorSimulacion(
+        memoria=memoria,
+        con_memoria=not args.sin_memoria,
+        politica=crear_politica(args.politica, args.quantum),
+        n_cpus=args.cpus,
+        semilla=args.semilla,
+    )
+
+    # Los avisos del motor por cada proceso no interesan aquí
+    logging.basicConfig(level=logging.ERROR)
+    inicio = time.perf_counter()
+    resumen = reproducir(motor, leer_traza(args.traza), args.ticks)
+    duracion = time.perf_counter() - inicio
+
+    print(f"Pasos ejecutados: {resumen['pasos']} (reloj final: {resumen['ticks']})")
+    print(f"Procesos admitidos: {resumen['admitidos']}, rechazados: {resumen['rechazados']}, "
+          f"terminados: {resumen['terminados']}")
+    print(f"Tiempo de retorno promedio: {resumen['retorno']:.2f}, espera promedio: {resumen['espera']:.2f}")
+    imprimir_resumen(motor.resumen())
+    print(f"Tiempo: {duracion:.3f} s ({resumen['pasos'] / duracion if duracion else 0:.0f} pasos/s)")
+
+
+if __name__ == '__main__':
+    main()